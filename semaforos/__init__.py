@@ -0,0 +1,4 @@
+"""
+Controle adaptativo de semáforos com Q-Learning: scripts compartilhados pelos cenários e a linha de comando
+`python -m semaforos`. O que muda entre os cenários fica no registro de cenarios.py.
+"""
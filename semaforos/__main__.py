@@ -0,0 +1,69 @@
+"""
+Linha de comando única dos cenários: roda um comando em qualquer subconjunto deles, num só processo.
+
+    python -m semaforos treinar                                  # todos os cenários, um após o outro
+    python -m semaforos treinar Prox_Samur BrumadoxRPacheco
+    python -m semaforos tempo_fixo --sem-interface
+    python -m semaforos avaliar Prox_Samur
+    python -m semaforos comparar
+    python -m semaforos relatorio                                # PDF geral, na raiz do projeto
+
+Cada comando chama a função principal do script do pacote, carregado para o cenário com load_scenario_module, de
+dentro da pasta do cenário (onde ficam as Q-tables e os resultados). Os imports (traci, numpy, pandas) e os caches
+carregados ficam aquecidos de um cenário para o outro. Aceita também o --profile do perfil_python.py.
+"""
+import argparse
+import os
+
+from .perfil_python import MODES, run_main
+from .cenarios import PROJECT_DIR, SCENARIOS, load_scenario_module, scenario_dir
+
+# Comando -> (script do pacote, função principal)
+COMMANDS = {
+    "treinar": ("treinamento_Qlearning", "train"),
+    "avaliar": ("simulacao_Qlearning", "run_simulation"),
+    "tempo_fixo": ("tempo_fixo", "run_fixed_time_simulation"),
+    "comparar": ("comparar_resultados", "main"),
+}
+REPORT_COMMAND = "relatorio"
+
+def run_scenario(command, scenario, headless=False):
+    """ Roda o comando em um cenário, de dentro da pasta dele; retorna o que a função principal retornar. """
+    module_name, function_name = COMMANDS[command]
+    os.chdir(scenario_dir(scenario))
+    module = load_scenario_module(scenario, module_name)
+    if headless and hasattr(module, "SUMO_BINARY"):
+        module.SUMO_BINARY = "sumo"
+    return getattr(module, function_name)()
+
+def run(command, scenarios, headless=False):
+    start_dir = os.getcwd()
+    try:
+        if command == REPORT_COMMAND:
+            from . import relatorio_geral
+            os.chdir(PROJECT_DIR)
+            relatorio_geral.main(scenarios)
+            return
+        for scenario in scenarios:
+            print(f"\n🚦 {scenario} — {command}")
+            run_scenario(command, scenario, headless)
+    finally:
+        os.chdir(start_dir)
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m semaforos", description="Roda um comando nos cenários escolhidos.")
+    parser.add_argument("comando", choices=list(COMMANDS) + [REPORT_COMMAND])
+    parser.add_argument("cenarios", nargs="*", default=list(SCENARIOS), help="Pastas dos cenários (padrão: todos)")
+    parser.add_argument("--sem-interface", action="store_true", help="Usa o sumo em vez do sumo-gui em avaliar e tempo_fixo")
+    # Lidas pelo run_main; declaradas aqui para aparecerem no --help
+    parser.add_argument("--profile", nargs="?", const=MODES[0], choices=MODES, help="Grava um perfil da execução")
+    parser.add_argument("--profile-top", type=int, help="Linhas do resumo do perfil")
+    args = parser.parse_args()
+
+    for scenario in args.cenarios:
+        if scenario not in SCENARIOS:
+            parser.error(f"Cenário desconhecido '{scenario}'. Opções: {', '.join(SCENARIOS)}")
+    run_main(lambda: run(args.comando, args.cenarios, args.sem_interface), name=f"semaforos_{args.comando}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Avaliação da política gulosa em segundo plano, para escolher o checkpoint do treino (BACKGROUND_EVALUATION = True
+no treinamento_Qlearning.py).
+
+A recompensa média do treino vem de episódios epsilon-greedy e engana como medida da política final. Aqui, a cada
+EVAL_INTERVAL episódios, o treino entrega uma cópia da Q-table a um processo separado, que roda a política gulosa
+sem interface, com as mesmas métricas do collect_metrics do simulacao_Qlearning.py, em sementes que o treino não
+usa. O processo guarda a tabela com a menor espera média, junto com as contagens de visitas da mesma cópia. O
+treino nunca espera por ele: se as cópias chegam mais rápido do que as avaliações terminam, só a mais recente é
+avaliada.
+"""
+import multiprocessing as mp
+import pickle
+import queue
+
+import numpy as np
+
+from .cenarios import load_scenario_module
+
+def evaluation_worker(scenario, sumo_cmd, seeds, max_steps, output_file, visits_file, snapshots, results):
+    """ Avalia as cópias recebidas até chegar None; grava em `output_file` (e `visits_file`) a de menor espera média. """
+    simulation = load_scenario_module(scenario, "simulacao_Qlearning")
+    best_waiting = float("inf")
+    finished = False
+    while not finished:
+        snapshot = snapshots.get()
+        if snapshot is None:
+            break
+        # Só a cópia mais recente interessa; se o fim (None) chegar, ela ainda é avaliada antes de sair
+        skipped = 0
+        while True:
+            try:
+                newer = snapshots.get_nowait()
+            except queue.Empty:
+                break
+            if newer is None:
+                finished = True
+                break
+            snapshot, skipped = newer, skipped + 1
+        episode, q_table, visits = snapshot
+        summaries = []
+        for seed in seeds:
+            lists, _ = simulation.simulate(sumo_cmd + ["--seed", str(seed)], simulation.greedy_choice(q_table), max_steps)
+            summaries.append(simulation.summarize_metrics(lists))
+        metrics = {name: float(np.mean([summary.get(name, 0.0) for summary in summaries])) for name in summaries[0]}
+        improved = metrics["tempo_espera"] < best_waiting
+        if improved:
+            best_waiting = metrics["tempo_espera"]
+            with open(output_file, "wb") as f: pickle.dump(q_table, f)
+            with open(visits_file, "wb") as f: pickle.dump(visits, f)
+        results.put((episode, metrics, improved, skipped))
+
+class BackgroundEvaluator:
+    def __init__(self, scenario, sumo_cmd, seeds, max_steps, output_file, visits_file):
+        self.snapshots, self.results = mp.Queue(), mp.Queue()
+        self.process = mp.Process(target=evaluation_worker, daemon=True, args=(
+            scenario, sumo_cmd, seeds, max_steps, output_file, visits_file, self.snapshots, self.results))
+        self.process.start()
+        self.best_episode = None
+
+    def submit(self, episode, q_table, visits):
+        """ Envia uma cópia da Q-table e das contagens de visitas sem esperar pela avaliação. """
+        # Cópias já materializadas: a fila serializa em outra thread, enquanto o treino segue alterando as tabelas
+        snapshot = {state: np.array(q_table[state]) for state in list(q_table.keys())}
+        counts = {state: np.array(visits[state]) for state in list(visits.keys())}
+        self.snapshots.put((episode, snapshot, counts))
+
+    def poll(self):
+        """ Mostra as avaliações concluídas desde a última chamada, sem bloquear. """
+        while True:
+            try:
+                episode, metrics, improved, skipped = self.results.get_nowait()
+            except queue.Empty:
+                return
+            if improved:
+                self.best_episode = episode
+            marker = "🏅" if improved else "🧪"
+            note = f" ({skipped} cópias anteriores puladas)" if skipped else ""
+            print(f"{marker} Avaliação gulosa do episódio {episode} — Tempo de espera: {metrics['tempo_espera']:.2f}s, "
+                  f"Parados: {metrics['carros_parados']:.2f}, Velocidade: {metrics['velocidade_media']:.2f} m/s{note}")
+
+    def close(self):
+        """ Termina a avaliação em andamento e retorna o episódio da melhor Q-table (ou None). """
+        self.snapshots.put(None)
+        # Esvazia a fila de resultados enquanto espera; um processo com itens ainda na fila não termina
+        while self.process.is_alive():
+            self.poll()
+            self.process.join(timeout=0.5)
+        self.poll()
+        return self.best_episode
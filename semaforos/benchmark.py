@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Benchmark de passos por segundo dos laços de simulação, com histórico para detectar regressões.
+
+Cada caso roda um episódio curto e fixo (BENCHMARK_STEPS passos, semente fixa, sem interface) de um cenário num
+dos três laços do projeto: o run_episode do treinamento_Qlearning.py ("treino"), o simulate do
+simulacao_Qlearning.py ("avaliacao", política gulosa sobre uma Q-table vazia) e o simulate do tempo_fixo.py
+("tempo_fixo"). Cada caso roda num processo próprio, para que o pico de memória de um não contamine o outro. Com
+várias repetições, vale a mais rápida.
+
+Por caso, são medidos:
+- tempo de parede do episódio e passos por segundo, estes contados só depois que o SUMO sobe e o TraCI conecta;
+- chamadas ao TraCI por passo;
+- pico de RSS do Python e do SUMO (este lido do /proc/<pid>/status do processo do SUMO antes do traci.close,
+  só no Linux);
+- estatísticas do próprio SUMO (--statistic-output): duração da execução, atualizações de veículos por segundo,
+  viagens concluídas, duração média e espera média.
+
+Cada rodada é acrescentada ao HISTORY_FILE (uma linha JSON, com o commit do git). O modo `comparar` confronta a
+última rodada com uma anterior e marca como regressão qualquer piora acima do limite. Nesse caso, sai com código
+1, para poder ser usado num CI.
+
+Uso:
+    python -m semaforos.benchmark rodar
+    python -m semaforos.benchmark rodar --cenarios Prox_Samur --lacos treino tempo_fixo --repeticoes 5
+    python -m semaforos.benchmark comparar --limite 0.15
+"""
+import argparse
+import functools
+import json
+import multiprocessing as mp
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter, defaultdict
+
+import numpy as np
+
+try:
+    import resource  # Só existe em sistemas Unix; no Windows o pico de memória não é medido
+except ImportError:
+    resource = None
+
+if 'SUMO_HOME' in os.environ:
+    tools = os.path.join(os.environ['SUMO_HOME'], 'tools')
+    sys.path.append(tools)
+else:
+    sys.exit("please declare environment variable 'SUMO_HOME'")
+
+import traci
+
+from .cenarios import PROJECT_DIR, SCENARIOS, load_scenario_module, scenario_cfg, scenario_file
+from .instrumentacao_traci import wrap_traci
+from .rotas_cache import cached_route_args, cached_route_file
+
+# --- Configurações ---
+BENCHMARK_STEPS = 900
+BENCHMARK_SEED = 42
+BENCHMARK_EPSILON = 0.5   # Exploração do caso "treino": metade das decisões aleatórias, como no meio do treino
+REPETITIONS = 3
+LOOPS = ("treino", "avaliacao", "tempo_fixo")
+HISTORY_FILE = os.path.join(PROJECT_DIR, "benchmark_historico.jsonl")
+REGRESSION_THRESHOLD = 0.10
+# Métrica -> sentido da melhora (+1: maior é melhor, -1: menor é melhor), usado na comparação
+COMPARED_METRICS = {
+    "passos_por_segundo": +1,
+    "chamadas_traci_por_passo": -1,
+    "rss_python_mb": -1,
+    "rss_sumo_mb": -1,
+}
+
+def count_traci_calls(counter):
+    """ Conta as chamadas a todos os métodos dos domínios do TraCI e ao simulationStep. """
+    def counted(function, method):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            counter["chamadas"] += 1
+            return function(*args, **kwargs)
+        return wrapper
+
+    wrap_traci(counted)
+
+def peak_rss_mb(who):
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss vem em KB no Linux e em bytes no macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def child_pids(pid):
+    """ PIDs dos filhos diretos de `pid`, pelo campo de processo pai do /proc/<pid>/stat. """
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # O nome do processo vem entre parênteses e pode ter espaços; o pai é o 2º campo depois dele
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+    return children
+
+def sumo_peak_rss_mb():
+    """ Pico de RSS do SUMO da conexão atual do TraCI, lido do /proc; None fora do Linux. """
+    # O RUSAGE_CHILDREN só conta filhos já encerrados e aguardados, e o maior deles pode ser o próprio Python
+    # (o multiprocessing também gera filhos); por isso a leitura é feita no processo do SUMO, ainda vivo
+    process = getattr(traci.getConnection(), "_process", None)
+    if process is None or not os.path.isdir("/proc"):
+        return None
+    # Quando o 'sumo' do PATH é um lançador (o do pacote eclipse-sumo do pip é um script Python), o simulador é
+    # um filho dele: desce até o último processo da cadeia
+    pid = process.pid
+    children = child_pids(pid)
+    while children:
+        pid = children[0]
+        children = child_pids(pid)
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                fields[name] = value.split()
+    except OSError:
+        return None
+    # VmHWM é o pico; alguns kernels não o expõem, e aí vale o RSS atual
+    value = fields.get("VmHWM") or fields.get("VmRSS")
+    return int(value[0]) / 1024 if value else None
+
+def read_sumo_statistics(statistics_file):
+    """ Resumo do --statistic-output do SUMO. """
+    root = ET.parse(statistics_file).getroot()
+    performance, trips = root.find("performance"), root.find("vehicleTripStatistics")
+    return {
+        "sumo_tempo_s": float(performance.get("clockDuration")),
+        "sumo_tempo_traci_s": float(performance.get("traciDuration")),
+        "sumo_atualizacoes_por_segundo": float(performance.get("vehicleUpdatesPerSecond")),
+        "viagens": int(trips.get("count")),
+        "duracao_media_viagem_s": float(trips.get("duration")),
+        "espera_media_s": float(trips.get("waitingTime")),
+        "perda_tempo_media_s": float(trips.get("timeLoss")),
+    }
+
+def run_case(scenario, loop, steps, seed, results):
+    """ Roda um caso no processo atual e publica as métricas em `results`. """
+    os.chdir(os.path.join(PROJECT_DIR, scenario))
+    cfg_file = scenario_cfg(scenario)
+    statistics_file = os.path.join(tempfile.gettempdir(), f"benchmark_{os.getpid()}.xml")
+    common = ["--seed", str(seed), "--statistic-output", statistics_file, "--no-step-log"]
+    random.seed(seed)
+    np.random.seed(seed)
+
+    if loop == "treino":
+        module = load_scenario_module(scenario, "treinamento_Qlearning")
+        module.SUMO_CFG_FILE = scenario_file(scenario, module.SUMO_CFG_FILE)
+        q_table = defaultdict(lambda: np.zeros(module.NUM_ACTIONS))
+        sumo_cmd = module.build_sumo_cmd() + ["--end", str(steps)] + common
+
+        def episode():
+            traci.start(sumo_cmd)
+            total_steps, _ = module.run_episode(q_table, BENCHMARK_EPSILON, steps)
+            traci.close()
+            return total_steps
+    else:
+        module = load_scenario_module(scenario, "simulacao_Qlearning" if loop == "avaliacao" else "tempo_fixo")
+        # As estatísticas de viagem exigem --duration-log.statistics, que o comando do treino já traz
+        sumo_cmd = ["sumo", "-c", cfg_file, "--step-length", "1.0", "--duration-log.statistics"] + cached_route_args(cfg_file) + common
+        if loop == "avaliacao":
+            episode = lambda: module.simulate(sumo_cmd, module.greedy_choice({}), steps)[1]
+        else:
+            episode = lambda: module.simulate(sumo_cmd, steps)[1]
+
+    counter = Counter()
+    count_traci_calls(counter)
+    # Os passos por segundo contam a partir do SUMO pronto: a subida do processo (e a espera do TraCI para conectar)
+    # entra só no tempo total
+    launch = traci.start
+    ready = []
+    # A saída do SUMO vai para o /dev/null, para não embaralhar a tabela
+    traci.start = lambda *args, **kwargs: (launch(*args, stdout=subprocess.DEVNULL, **kwargs),
+                                           ready.append(time.perf_counter()))[0]
+    # O pico de memória do SUMO é lido antes do fechamento, enquanto o processo ainda existe
+    close = traci.close
+    sumo_rss = []
+    traci.close = lambda *args, **kwargs: (sumo_rss.append(sumo_peak_rss_mb()), close(*args, **kwargs))[1]
+    start = time.perf_counter()
+    total_steps = episode()
+    end = time.perf_counter()
+    metrics = {
+        "tempo_s": end - start,
+        "tempo_inicio_s": ready[0] - start,
+        "passos": total_steps,
+        "passos_por_segundo": total_steps / (end - ready[0]),
+        "chamadas_traci_por_passo": counter["chamadas"] / max(total_steps, 1),
+        "rss_python_mb": peak_rss_mb(resource.RUSAGE_SELF) if resource else None,
+        "rss_sumo_mb": sumo_rss[0] if sumo_rss else None,
+    }
+    metrics.update(read_sumo_statistics(statistics_file))
+    os.remove(statistics_file)
+    results.put(metrics)
+
+def run_isolated(scenario, loop, steps, seed):
+    results = mp.Queue()
+    process = mp.Process(target=run_case, args=(scenario, loop, steps, seed, results))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        raise SystemExit(f"ERRO: O caso {scenario}/{loop} terminou com código {process.exitcode}.")
+    return results.get()
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def format_mb(value):
+    return f"{value:.0f}" if value is not None else "-"
+
+def run_benchmark(scenarios, loops, steps, seed, repetitions):
+    # Gera o cache de rotas antes, para o duarouter não entrar na medição
+    for scenario in scenarios:
+        cached_route_file(scenario_cfg(scenario))
+    print(f"⏱️ Benchmark: {len(scenarios)} cenários x {len(loops)} laços, {steps} passos, semente {seed}, "
+          f"{repetitions} repetições (vale a mais rápida).")
+    print(f"{'caso':<32} {'passos/s':>9} {'tempo (s)':>9} {'TraCI/passo':>11} {'RSS py (MB)':>11} "
+          f"{'RSS sumo (MB)':>13} {'viagens':>7} {'espera (s)':>10}")
+    cases = {}
+    for scenario in scenarios:
+        for loop in loops:
+            runs = [run_isolated(scenario, loop, steps, seed) for _ in range(repetitions)]
+            best = max(runs, key=lambda metrics: metrics["passos_por_segundo"])
+            cases[f"{scenario}/{loop}"] = best
+            print(f"{scenario + '/' + loop:<32} {best['passos_por_segundo']:>9.0f} {best['tempo_s']:>9.2f} "
+                  f"{best['chamadas_traci_por_passo']:>11.1f} {format_mb(best['rss_python_mb']):>11} "
+                  f"{format_mb(best['rss_sumo_mb']):>13} {best['viagens']:>7} {best['espera_media_s']:>10.2f}")
+
+    record = {"timestamp": time.time(), "commit": git_commit(), "passos": steps, "semente": seed,
+              "repeticoes": repetitions, "casos": cases}
+    with open(HISTORY_FILE, "a") as f:
+        f.write(json.dumps(record) + "\n")
+    print(f"📁 Rodada acrescentada a '{HISTORY_FILE}'.")
+    return record
+
+def load_history():
+    if not os.path.exists(HISTORY_FILE):
+        sys.exit(f"Histórico '{HISTORY_FILE}' não encontrado. Rode 'python -m semaforos.benchmark rodar' primeiro.")
+    with open(HISTORY_FILE) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def compare(base_index, threshold):
+    """ Compara a última rodada com a de índice `base_index` (negativo conta do fim); retorna as regressões. """
+    history = load_history()
+    if len(history) < 2:
+        sys.exit("São necessárias pelo menos duas rodadas no histórico para comparar.")
+    base, current = history[base_index], history[-1]
+    print(f"🔍 Rodada atual ({current.get('commit')}) x base ({base.get('commit')}), limite de {threshold:.0%}")
+    print(f"{'caso':<32} {'métrica':<26} {'base':>10} {'atual':>10} {'variação':>9}")
+    regressions = []
+    for case in sorted(set(base["casos"]) & set(current["casos"])):
+        for metric, direction in COMPARED_METRICS.items():
+            before, after = base["casos"][case].get(metric), current["casos"][case].get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            regressed = direction * change < -threshold
+            if regressed:
+                regressions.append((case, metric, change))
+            marker = "  ⚠️ regressão" if regressed else ""
+            print(f"{case:<32} {metric:<26} {before:>10.1f} {after:>10.1f} {change:>+9.1%}{marker}")
+    if base["passos"] != current["passos"] or base["semente"] != current["semente"]:
+        print("ℹ️ As rodadas usaram passos ou sementes diferentes; a comparação pode não ser justa.")
+    if regressions:
+        print(f"\n❌ {len(regressions)} regressões acima de {threshold:.0%}.")
+    else:
+        print("\n✅ Nenhuma regressão acima do limite.")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de passos por segundo dos laços de simulação.")
+    sub = parser.add_subparsers(dest="modo", required=True)
+    rodar = sub.add_parser("rodar", help="Roda os casos e acrescenta a rodada ao histórico")
+    rodar.add_argument("--cenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    rodar.add_argument("--lacos", nargs="+", choices=LOOPS, default=list(LOOPS))
+    rodar.add_argument("--passos", type=int, default=BENCHMARK_STEPS)
+    rodar.add_argument("--semente", type=int, default=BENCHMARK_SEED)
+    rodar.add_argument("--repeticoes", type=int, default=REPETITIONS)
+    comparar = sub.add_parser("comparar", help="Compara a última rodada do histórico com uma anterior")
+    comparar.add_argument("--base", type=int, default=-2, help="Índice da rodada base no histórico (padrão: a penúltima)")
+    comparar.add_argument("--limite", type=float, default=REGRESSION_THRESHOLD, help="Piora relativa tolerada (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    if args.modo == "rodar":
+        run_benchmark(args.cenarios, args.lacos, args.passos, args.semente, args.repeticoes)
+    elif compare(args.base, args.limite):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Registro dos cenários do projeto e leitura das suas configurações do SUMO.
+
+Os scripts do pacote (treinamento_Qlearning, simulacao_Qlearning, tempo_fixo, comparar_resultados) são os mesmos para
+todos os cenários: cada um é carregado por load_scenario_module para um cenário e lê daqui o que muda entre eles. A
+pasta de cada cenário guarda só a rede, a demanda e os resultados. Para cadastrar um cruzamento novo, crie a pasta com
+o .sumocfg de mesmo nome e acrescente uma entrada em SCENARIOS. As ações do agente, as transições e as faixas de cada
+fase saem do programa do semáforo na rede (semaforos/fases.py).
+"""
+import importlib.util
+import os
+import xml.etree.ElementTree as ET
+
+# Pasta do cenário -> configuração:
+#   nome      nome de exibição nos relatórios
+#   semaforo  semáforo controlado
+#   sufixo    sufixo dos arquivos do treino e da simulação (q_table_<sufixo>.pkl, curriculo_<sufixo>.csv, ...)
+#   resumo    sufixo do resumo_metricas_<resumo>.csv lido pelo relatorio_geral
+SCENARIOS = {
+    "Prox_Samur": {
+        "nome": "Prox. Samur",
+        "semaforo": "2322403950",
+        "sufixo": "prox_samur",
+        "resumo": "samur",
+    },
+    "Prox_EstadioLomanto": {
+        "nome": "Prox. Estádio",
+        "semaforo": "2713368224",
+        "sufixo": "prox_estadio",
+        "resumo": "lomanto",
+    },
+    "Prox_BatalhaoPolicia": {
+        "nome": "Prox. Batalhão",
+        "semaforo": "2078102664",
+        "sufixo": "prox_batalhao",
+        "resumo": "batalhao",
+    },
+    "BrumadoxRPacheco": {
+        "nome": "Brumado x R. Pacheco",
+        "semaforo": "2078773993",
+        "sufixo": "brumado",
+        "resumo": "brumado",
+    },
+}
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(PACKAGE_DIR)
+
+# Cenários dos scripts em carregamento por load_scenario_module (o último é o atual)
+_loading = []
+
+def scenario_dir(scenario):
+    return os.path.join(PROJECT_DIR, scenario)
+
+def scenario_cfg(scenario):
+    """ Caminho do .sumocfg original do cenário. """
+    return os.path.join(scenario_dir(scenario), f"{scenario}.sumocfg")
+
+def read_sumocfg(cfg_path):
+    """ Retorna os caminhos absolutos (rede, rotas) declarados no .sumocfg. """
+    base_dir = os.path.dirname(os.path.abspath(cfg_path))
+    root = ET.parse(cfg_path).getroot()
+    net_file = root.find("./input/net-file").get("value")
+    route_file = root.find("./input/route-files").get("value")
+    return os.path.join(base_dir, net_file), os.path.join(base_dir, route_file)
+
+def scenario_file(scenario, filename):
+    """ Caminho de um arquivo do cenário a partir do nome usado nos scripts, que pode vir prefixado com a pasta. """
+    return os.path.join(scenario_dir(scenario), os.path.basename(filename.replace("\\", "/")))
+
+def scenario_being_loaded():
+    """ Cenário para o qual load_scenario_module está executando um script do pacote. """
+    if not _loading:
+        raise SystemExit("ERRO: Os scripts do pacote semaforos são carregados por cenário. "
+                         "Use 'python -m semaforos' ou load_scenario_module(cenário, script).")
+    return _loading[-1]
+
+def load_scenario_module(scenario, module_name):
+    """ Importa um script do pacote (ex.: 'treinamento_Qlearning') configurado para o cenário; cada chamada cria um módulo novo. """
+    if scenario not in SCENARIOS:
+        raise SystemExit(f"ERRO: Cenário desconhecido '{scenario}'. Opções: {', '.join(SCENARIOS)}")
+    path = os.path.join(PACKAGE_DIR, f"{module_name}.py")
+    # Nome dentro do pacote: os imports relativos do script (from .cenarios import ...) resolvem para semaforos
+    spec = importlib.util.spec_from_file_location(f"{__package__}.{scenario}_{module_name}", path)
+    module = importlib.util.module_from_spec(spec)
+    _loading.append(scenario)
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        _loading.pop()
+    return module
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Compara quantos episódios cada variante do treinamento precisa para convergir no mesmo cenário.
+
+Cada variante é o train() do treinamento_Qlearning.py do cenário com algumas configurações trocadas (por
+exemplo DYNA_Q = True). As variantes rodam em processos separados, ao mesmo tempo e com a mesma semente, e
+gravam as Q-tables numa pasta temporária, sem tocar nos .pkl do cenário. A meta de convergência é a melhor
+média móvel (REWARD_WINDOW episódios, como no train()) da primeira variante, a referência, com tolerância de
+CONVERGENCE_TOLERANCE. A aceleração é a razão entre os episódios que a referência e a variante levam para
+atingi-la.
+
+Uso:
+    python -m semaforos.comparar_convergencia Prox_Samur --episodios 200
+    python -m semaforos.comparar_convergencia Prox_Samur --variantes q_learning dyna_q --episodios 300
+"""
+import argparse
+import contextlib
+import os
+import random
+import tempfile
+import time
+import multiprocessing as mp
+import queue
+
+import numpy as np
+
+from .cenarios import PROJECT_DIR, SCENARIOS, load_scenario_module, scenario_cfg, scenario_file
+from .rotas_cache import cached_route_file
+
+# --- Configurações ---
+# Nome da variante -> configurações do treinamento_Qlearning.py que ela altera
+VARIANTS = {
+    "q_learning": {},
+    "dyna_q": {"DYNA_Q": True},
+    "q_lambda": {"Q_LAMBDA": True},
+    "contagem": {"EXPLORATION": "contagem"},
+    "ucb": {"EXPLORATION": "ucb"},
+    "imitacao": {"IMITATION_WARM_START": True},
+    "imitacao_atuado": {"IMITATION_WARM_START": True, "DEMONSTRATOR": "atuado"},
+    "contrafactual": {"COUNTERFACTUAL": True},
+}
+REWARD_WINDOW = 20
+CONVERGENCE_TOLERANCE = 0.05
+DEFAULT_SEED = 42
+
+def moving_average(rewards, window=REWARD_WINDOW):
+    """ Média das últimas `window` recompensas em cada episódio, como a usada pelo train(). """
+    return [float(np.mean(rewards[max(0, i + 1 - window):i + 1])) for i in range(len(rewards))]
+
+def episodes_to_reach(rewards, target):
+    for episode, average in enumerate(moving_average(rewards), start=1):
+        if average >= target:
+            return episode
+    return None
+
+def run_variant(scenario, name, overrides, episodes, seed, output_dir, results):
+    os.chdir(os.path.join(PROJECT_DIR, scenario))
+    module = load_scenario_module(scenario, "treinamento_Qlearning")
+    module.SUMO_CFG_FILE = scenario_file(scenario, module.SUMO_CFG_FILE)
+    module.EPOCHS = episodes
+    for setting, value in overrides.items():
+        setattr(module, setting, value)
+    # Saídas do treino vão para a pasta temporária, sem sobrescrever as do cenário
+    for setting in ("Q_TABLE_FILE", "VISITS_FILE", "MICRO_REFERENCE_Q_TABLE", "CURRICULUM_LOG",
+                    "EVALUATED_Q_TABLE", "EVALUATED_VISITS_FILE"):
+        setattr(module, setting, os.path.join(output_dir, f"{name}_{os.path.basename(getattr(module, setting))}"))
+
+    random.seed(seed)
+    np.random.seed(seed)
+    start = time.perf_counter()
+    with open(os.path.join(output_dir, f"{name}.log"), "w") as log, contextlib.redirect_stdout(log):
+        rewards = module.train()
+    results.put((name, rewards, time.perf_counter() - start))
+
+def compare(scenario, variant_names, episodes, seed):
+    # Gera o cache de rotas antes de as variantes subirem
+    cached_route_file(scenario_cfg(scenario))
+    output_dir = tempfile.mkdtemp(prefix="convergencia_")
+    results = mp.Queue()
+    processes = [
+        mp.Process(target=run_variant, args=(scenario, name, VARIANTS[name], episodes, seed, output_dir, results))
+        for name in variant_names
+    ]
+    print(f"⏱️ {scenario}: {len(processes)} variantes com até {episodes} episódios cada. Logs em '{output_dir}'.")
+    for process in processes:
+        process.start()
+    runs = {}
+    while len(runs) < len(processes):
+        try:
+            name, rewards, elapsed = results.get(timeout=1.0)
+            runs[name] = (rewards, elapsed)
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes) and results.empty():
+                raise SystemExit(f"ERRO: Variante interrompida antes de terminar; veja os logs em '{output_dir}'.")
+    for process in processes:
+        process.join()
+
+    reference = variant_names[0]
+    best = max(moving_average(runs[reference][0]))
+    target = best - CONVERGENCE_TOLERANCE * abs(best)
+    reference_episodes = episodes_to_reach(runs[reference][0], target)
+    print(f"\n🎯 Meta: média móvel >= {target:.2f} (melhor média de '{reference}' com {CONVERGENCE_TOLERANCE:.0%} de tolerância)")
+    print(f"{'variante':>15} | {'episódios':>9} | {'melhor média':>12} | {'até a meta':>10} | {'aceleração':>10} | {'tempo':>8}")
+    for name in variant_names:
+        rewards, elapsed = runs[name]
+        reached = episodes_to_reach(rewards, target)
+        speedup = f"{reference_episodes / reached:.2f}x" if reached else "-"
+        print(f"{name:>15} | {len(rewards):>9} | {max(moving_average(rewards)):>12.2f} | "
+              f"{reached if reached else 'não':>10} | {speedup:>10} | {elapsed:>7.1f}s")
+    return runs
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara os episódios até a convergência das variantes do treino.")
+    parser.add_argument("cenario", choices=list(SCENARIOS))
+    parser.add_argument("--variantes", nargs="+", choices=list(VARIANTS), default=list(VARIANTS),
+                        help="Variantes a comparar; a primeira é a referência")
+    parser.add_argument("--episodios", type=int, default=200, help="Máximo de episódios por variante")
+    parser.add_argument("--semente", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+    compare(args.cenario, args.variantes, args.episodios, args.semente)
+
+if __name__ == "__main__":
+    main()
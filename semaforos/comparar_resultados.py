@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 import pandas as pd
-import matplotlib.pyplot as plt
 import os
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import Image, SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
@@ -8,10 +7,20 @@ from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 
+from .cenarios import SCENARIOS, scenario_being_loaded
+from .graficos import plot_time_series, render
+
+# --- Cenário: o script é carregado uma vez por cenário (cenarios.load_scenario_module), que define o que muda entre eles ---
+SCENARIO = scenario_being_loaded()
+
 # --- Configurações de Pastas ---
 QL_FOLDER = 'resultados_qlearning'
 FT_FOLDER = 'resultados_tempo_fixo'
 REPORT_FOLDER = 'relatorios'
+# Resumo lido pelo relatorio_geral.py
+SUMMARY_FILE = f"resumo_metricas_{SCENARIOS[SCENARIO]['resumo']}.csv"
+# Processos que desenham os gráficos (None: um por núcleo; 1: no próprio processo)
+PLOT_WORKERS = None
 
 # --- Dicionários de Arquivos e Labels ---
 METRIC_KEYS = [
@@ -90,32 +99,17 @@ def load_all_data(ft_folder, rl_folder, ft_files, rl_files):
 
 def generate_plots(dfs_fixed, dfs_rl, output_dir):
     print("📊 Gerando gráficos comparativos...")
+    tasks = []
     for metric, label in METRIC_LABELS.items():
-        plt.figure(figsize=(12, 6))
-        
-        df_ft, df_rl = dfs_fixed.get(metric), dfs_rl.get(metric)
         column = get_column_name(metric)
-
-        if df_ft is not None and not df_ft.empty and column in df_ft.columns:
-            if 'espera' in metric and 'media' not in column:
-                plt.plot(df_ft['tempo'], df_ft[column].cumsum(), label='Tempo Fixo', color='blue', alpha=0.8)
-            else:
-                plt.plot(df_ft['tempo'], df_ft[column], label='Tempo Fixo', color='blue', alpha=0.8)
-        
-        if df_rl is not None and not df_rl.empty and column in df_rl.columns:
-            if 'espera' in metric and 'media' not in column:
-                plt.plot(df_rl['tempo'], df_rl[column].cumsum(), label='Q-Learning', color='red', alpha=0.8)
-            else:
-                plt.plot(df_rl['tempo'], df_rl[column], label='Q-Learning', color='red', alpha=0.8)
-
-        plt.title(f'Comparação: {label}', fontsize=16)
-        plt.xlabel('Tempo de Simulação (s)', fontsize=12)
-        plt.ylabel(label.split('(')[0].strip(), fontsize=12)
-        plt.legend()
-        plt.grid(True, linestyle='--', alpha=0.6)
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, f'comparacao_{metric}.png'))
-        plt.close()
+        series = []
+        for name, color, df in (('Tempo Fixo', 'blue', dfs_fixed.get(metric)), ('Q-Learning', 'red', dfs_rl.get(metric))):
+            if df is not None and not df.empty and column in df.columns:
+                values = df[column].cumsum() if 'espera' in metric and 'media' not in column else df[column]
+                series.append((name, color, df['tempo'].to_numpy(), values.to_numpy()))
+        tasks.append((plot_time_series, (series, f'Comparação: {label}', label.split('(')[0].strip(),
+                                         os.path.join(output_dir, f'comparacao_{metric}.png'))))
+    render(tasks, PLOT_WORKERS)
     print("✅ Gráficos gerados com sucesso.")
 
 def generate_pdf_report(dfs_fixed, dfs_rl, output_dir):
@@ -203,7 +197,7 @@ def generate_summary_csv(dfs_fixed, dfs_rl, ql_folder_path):
     if summary_data:
         df_summary = pd.DataFrame(summary_data)
         # Salva o resumo dentro da pasta do q-learning, onde o script geral espera
-        csv_path = os.path.join(ql_folder_path, "resumo_metricas_samur.csv") 
+        csv_path = os.path.join(ql_folder_path, SUMMARY_FILE)
         
         # Usa sep=';' e encoding 'utf-8-sig' para compatibilidade
         df_summary.to_csv(csv_path, sep=';', index=False, encoding='utf-8-sig')
@@ -221,6 +215,3 @@ def main():
     generate_plots(dfs_fixed, dfs_rl, REPORT_FOLDER)
     generate_pdf_report(dfs_fixed, dfs_rl, REPORT_FOLDER)
     generate_summary_csv(dfs_fixed, dfs_rl, REPORT_FOLDER)
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""
+Dyna-Q com varredura priorizada para o treinamento dos cenários (DYNA_Q = True no treinamento_Qlearning.py).
+
+Cada decisão real alimenta um modelo tabular: quantas vezes cada par estado-ação levou a cada próximo estado e
+a soma das recompensas obtidas. Depois, `plan` faz até `planning_steps` atualizações simuladas com esse modelo,
+em lotes vetorizados sobre a tabela densa, sempre nos pares de maior variação pendente. Após cada lote, os
+predecessores dos estados atualizados têm a prioridade recalculada, propagando a recompensa para trás sem
+gastar passos do SUMO.
+"""
+import numpy as np
+
+from .politica_compilada import STATE_LEVELS, encode_state
+
+class DynaPlanner:
+    def __init__(self, num_actions, update_rule, gamma, planning_steps, batch_size, threshold):
+        num_states = STATE_LEVELS ** num_actions
+        self.num_actions = num_actions
+        self.update_rule = update_rule
+        self.gamma = gamma
+        self.planning_steps = planning_steps
+        self.batch_size = batch_size
+        self.threshold = threshold
+        self.transitions = np.zeros((num_states, num_actions, num_states), dtype=np.float32)
+        self.reward_sum = np.zeros((num_states, num_actions))
+        self.counts = np.zeros((num_states, num_actions))
+        self.priority = np.zeros((num_states, num_actions))
+        self.real_updates = 0
+        self.planning_updates = 0
+
+    def _targets(self, values, states, actions):
+        """ Alvo esperado pelo modelo para cada par: recompensa média + gamma * E[max Q(próximo estado)]. """
+        counts = self.counts[states, actions]
+        expected_next = self.transitions[states, actions] @ values.max(axis=1) / counts
+        return self.reward_sum[states, actions] / counts + self.gamma * expected_next
+
+    def _refresh_priority(self, values, states, actions):
+        change = np.abs(self.update_rule(values[states, actions], self._targets(values, states, actions))
+                        - values[states, actions])
+        self.priority[states, actions] = np.maximum(self.priority[states, actions], change)
+
+    def observe(self, q_table, state, action, reward, next_state):
+        """ Registra a transição real no modelo e coloca o par na fila de prioridade. """
+        index, next_index = encode_state(state), encode_state(next_state)
+        self.transitions[index, action, next_index] += 1
+        self.reward_sum[index, action] += reward
+        self.counts[index, action] += 1
+        self.real_updates += 1
+        self._refresh_priority(q_table.values, np.array([index]), np.array([action]))
+
+    def plan(self, q_table):
+        """ Até `planning_steps` atualizações simuladas, em lotes, nos pares de maior prioridade. """
+        values = q_table.values
+        flat_priority = self.priority.reshape(-1)
+        remaining = self.planning_steps
+        while remaining > 0:
+            size = min(self.batch_size, remaining)
+            batch = np.argpartition(flat_priority, -size)[-size:]
+            batch = batch[flat_priority[batch] > self.threshold]
+            if batch.size == 0:
+                break
+            states, actions = np.divmod(batch, self.num_actions)
+            values[states, actions] = self.update_rule(values[states, actions], self._targets(values, states, actions))
+            flat_priority[batch] = 0.0
+            self.planning_updates += batch.size
+            remaining -= batch.size
+
+            # Os pares que levam aos estados alterados precisam ser revistos
+            predecessors = self.transitions[:, :, np.unique(states)].sum(axis=2) > 0
+            pred_states, pred_actions = np.nonzero(predecessors)
+            self._refresh_priority(values, pred_states, pred_actions)
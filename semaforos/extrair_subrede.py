@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Gera uma variante enxuta de cada cenário, recortada em volta do semáforo controlado.
+
+O controlador só observa uma interseção, mas o SUMO carrega e simula toda a área importada do OSM.
+Este script mantém apenas as arestas dentro de um raio (em metros) ou de um número de saltos em volta
+do semáforo, recorta as viagens do .rou.xml para a sub-rede e mede o ganho de carregamento e de passo.
+
+Uso:
+    python -m semaforos.extrair_subrede                      # todos os cenários, 2 saltos
+    python -m semaforos.extrair_subrede Prox_Samur --raio 250
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+if 'SUMO_HOME' in os.environ:
+    tools = os.path.join(os.environ['SUMO_HOME'], 'tools')
+    sys.path.append(tools)
+else:
+    sys.exit("please declare environment variable 'SUMO_HOME'")
+
+import sumolib
+import traci
+
+from .cenarios import SCENARIOS, read_sumocfg, scenario_cfg
+
+# --- Configurações ---
+LEAN_SUFFIX = "_enxuto"
+DEFAULT_HOPS = 2
+BENCHMARK_STEPS = 5400
+BENCHMARK_REPEATS = 3
+
+# --- Leitura do cenário ---
+def get_tls_nodes(net, tl_id):
+    """ Nós (junções) comandados pelo semáforo; mais de um quando o semáforo é um cluster. """
+    nodes = set()
+    for in_lane, out_lane, _ in net.getTLS(tl_id).getConnections():
+        nodes.add(in_lane.getEdge().getToNode())
+        nodes.add(out_lane.getEdge().getFromNode())
+    return nodes
+
+# --- Seleção da sub-rede ---
+def select_edges_by_hops(net, tl_id, hops):
+    """ Arestas a até `hops` saltos (em qualquer sentido) das arestas que chegam/saem do semáforo. """
+    frontier = set()
+    for node in get_tls_nodes(net, tl_id):
+        frontier.update(node.getIncoming())
+        frontier.update(node.getOutgoing())
+    selected = set(frontier)
+    for _ in range(hops):
+        next_frontier = set()
+        for edge in frontier:
+            next_frontier.update(edge.getFromNode().getIncoming())
+            next_frontier.update(edge.getToNode().getOutgoing())
+        frontier = next_frontier - selected
+        selected |= frontier
+    return {edge.getID() for edge in selected if edge.getFunction() != "internal"}
+
+def select_edges_by_radius(net, tl_id, radius):
+    """ Arestas cuja geometria passa a até `radius` metros do centro do semáforo. """
+    coords = [node.getCoord() for node in get_tls_nodes(net, tl_id)]
+    center_x = sum(x for x, _ in coords) / len(coords)
+    center_y = sum(y for _, y in coords) / len(coords)
+    return {edge.getID() for edge, _ in net.getNeighboringEdges(center_x, center_y, radius)
+            if edge.getFunction() != "internal"}
+
+def write_lean_net(net_file, kept_edges, output_net):
+    keep_file = output_net + ".edges.txt"
+    with open(keep_file, "w") as f:
+        f.write("\n".join(sorted(kept_edges)))
+    cmd = [sumolib.checkBinary("netconvert"), "-s", net_file, "--keep-edges.input-file", keep_file,
+           "-o", output_net, "--no-warnings"]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    os.remove(keep_file)
+    if result.returncode != 0:
+        sys.exit(f"ERRO no netconvert:\n{result.stderr}")
+
+# --- Recorte das viagens ---
+def route_trip(net, trip, v_class):
+    """ Rota completa da viagem na rede original, passando pelas arestas de 'via'. """
+    waypoints = [trip.get("from")] + trip.get("via", "").split() + [trip.get("to")]
+    route = []
+    for origin, destination in zip(waypoints, waypoints[1:]):
+        edges, _ = net.getShortestPath(net.getEdge(origin), net.getEdge(destination), vClass=v_class)
+        if edges is None:
+            return None
+        route.extend(edges if not route else edges[1:])
+    return route
+
+def cut_route(route, kept_edges, tls_edges):
+    """ Trecho contíguo da rota dentro da sub-rede, preferindo o que passa pelo semáforo. """
+    segments, current = [], []
+    for index, edge in enumerate(route):
+        if edge.getID() in kept_edges:
+            current.append((index, edge))
+        elif current:
+            segments.append(current)
+            current = []
+    if current:
+        segments.append(current)
+    if not segments:
+        return None, None
+    segments.sort(key=lambda seg: (any(e.getID() in tls_edges for _, e in seg), len(seg)), reverse=True)
+    best = segments[0]
+    return best[0][0], [edge for _, edge in best]
+
+def write_lean_routes(net, route_file, kept_edges, tls_edges, output_routes):
+    """ Converte as <trip> em <vehicle> com rotas recortadas; a partida é adiantada pelo tempo de percurso livre. """
+    root = ET.parse(route_file).getroot()
+    v_classes = {vtype.get("id"): vtype.get("vClass", "passenger") for vtype in root.iter("vType")}
+    vehicles, dropped = [], 0
+    for trip in root.iter("trip"):
+        route = route_trip(net, trip, v_classes.get(trip.get("type"), "passenger"))
+        start, segment = cut_route(route, kept_edges, tls_edges) if route else (None, None)
+        if not segment:
+            dropped += 1
+            continue
+        free_flow_time = sum(edge.getLength() / edge.getSpeed() for edge in route[:start])
+        depart = float(trip.get("depart", 0)) + free_flow_time
+        vehicles.append((depart, trip, segment))
+
+    vehicles.sort(key=lambda item: item[0])
+    out = ET.Element("routes")
+    for vtype in root.iter("vType"):
+        out.append(vtype)
+    for depart, trip, segment in vehicles:
+        vehicle = ET.SubElement(out, "vehicle", id=trip.get("id"), depart=f"{depart:.2f}")
+        if trip.get("type"):
+            vehicle.set("type", trip.get("type"))
+        ET.SubElement(vehicle, "route", edges=" ".join(edge.getID() for edge in segment))
+    ET.indent(out)
+    ET.ElementTree(out).write(output_routes, encoding="UTF-8", xml_declaration=True)
+    return len(vehicles), dropped
+
+def write_lean_sumocfg(output_cfg, net_file, route_file):
+    root = ET.Element("sumoConfiguration")
+    inputs = ET.SubElement(root, "input")
+    ET.SubElement(inputs, "net-file", value=os.path.basename(net_file))
+    ET.SubElement(inputs, "route-files", value=os.path.basename(route_file))
+    ET.indent(root)
+    ET.ElementTree(root).write(output_cfg, encoding="UTF-8", xml_declaration=True)
+
+# --- Medição ---
+def measure(cfg_path, label):
+    """ Retorna (tempo de carregamento, tempo médio por passo) em segundos, o melhor de BENCHMARK_REPEATS execuções. """
+    load_times, step_times = [], []
+    for _ in range(BENCHMARK_REPEATS):
+        # O carregamento é medido fora do TraCI, cuja conexão espera o servidor subir em intervalos de 1 s
+        start = time.perf_counter()
+        subprocess.run(["sumo", "-c", cfg_path, "--end", "0", "--no-step-log", "--no-warnings"],
+                       check=True, stdout=subprocess.DEVNULL)
+        load_times.append(time.perf_counter() - start)
+
+        traci.start(["sumo", "-c", cfg_path, "--step-length", "1.0", "--no-step-log", "--no-warnings"], label=label)
+        conn = traci.getConnection(label)
+        steps = 0
+        start = time.perf_counter()
+        while conn.simulation.getMinExpectedNumber() > 0 and steps < BENCHMARK_STEPS:
+            conn.simulationStep()
+            steps += 1
+        step_times.append((time.perf_counter() - start) / max(steps, 1))
+        conn.close()
+    return min(load_times), min(step_times)
+
+def extract_scenario(scenario, tl_id, hops=None, radius=None):
+    cfg_path = scenario_cfg(scenario)
+    net_file, route_file = read_sumocfg(cfg_path)
+    scenario_dir = os.path.dirname(cfg_path)
+    net = sumolib.net.readNet(net_file)
+
+    if radius is not None:
+        kept_edges = select_edges_by_radius(net, tl_id, radius)
+        criterion = f"raio de {radius:.0f} m"
+    else:
+        kept_edges = select_edges_by_hops(net, tl_id, hops)
+        criterion = f"{hops} saltos"
+    tls_edges = {in_lane.getEdge().getID() for in_lane, _, _ in net.getTLS(tl_id).getConnections()}
+
+    lean_net = os.path.join(scenario_dir, f"{scenario}{LEAN_SUFFIX}.net.xml")
+    lean_routes = os.path.join(scenario_dir, f"{scenario}{LEAN_SUFFIX}.rou.xml")
+    lean_cfg = os.path.join(scenario_dir, f"{scenario}{LEAN_SUFFIX}.sumocfg")
+
+    write_lean_net(net_file, kept_edges, lean_net)
+    kept_vehicles, dropped = write_lean_routes(net, route_file, kept_edges, tls_edges, lean_routes)
+    write_lean_sumocfg(lean_cfg, lean_net, lean_routes)
+    print(f"✂️ {scenario}: {len(kept_edges)}/{len(net.getEdges())} arestas ({criterion}), "
+          f"{kept_vehicles} viagens mantidas, {dropped} descartadas.")
+
+    full_load, full_step = measure(cfg_path, f"{scenario}_completo")
+    lean_load, lean_step = measure(lean_cfg, f"{scenario}_enxuto")
+    print(f"   Rede: {os.path.getsize(net_file) / 1024:.0f} KB -> {os.path.getsize(lean_net) / 1024:.0f} KB")
+    print(f"   Carregamento: {full_load * 1000:.0f} ms -> {lean_load * 1000:.0f} ms ({full_load / lean_load:.2f}x)")
+    print(f"   Passo médio: {full_step * 1e6:.0f} µs -> {lean_step * 1e6:.0f} µs ({full_step / lean_step:.2f}x)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Recorta cada cenário em volta do semáforo controlado.")
+    parser.add_argument("cenarios", nargs="*", default=list(SCENARIOS), help="Pastas dos cenários (padrão: todos)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--saltos", type=int, default=DEFAULT_HOPS, help="Número de saltos em volta do semáforo")
+    group.add_argument("--raio", type=float, help="Raio em metros em volta do semáforo")
+    args = parser.parse_args()
+
+    for scenario in args.cenarios:
+        if scenario not in SCENARIOS:
+            print(f"ERRO: Cenário desconhecido '{scenario}'. Opções: {', '.join(SCENARIOS)}")
+            continue
+        extract_scenario(scenario, SCENARIOS[scenario]["semaforo"], hops=args.saltos, radius=args.raio)
+    print("✅ Cenários enxutos gerados. Use LEAN_TRAINING = True no treinamento para usá-los.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Plano de fases do semáforo de cada cenário, lido do <tlLogic> da rede em vez de configurado à mão.
+
+Fases verdes são as que têm algum 'G'/'g' e nenhum amarelo; cada uma vira uma ação do agente, na ordem do programa.
+As fases entre um verde e o próximo são a sua transição: a primeira com amarelo e, se houver, a de vermelho geral
+(só 'r'). As faixas de cada ação são as que recebem verde nela, na ordem das ligações do semáforo.
+
+O plano é montado uma vez e guardado em cache_fases/ na pasta do cenário, com o nome derivado do hash da rede; qualquer
+alteração na rede gera um novo arquivo. Para conferir o plano de um cruzamento (ou pré-gerar todos):
+    python -m semaforos.fases
+    python -m semaforos.fases BrumadoxRPacheco
+"""
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+from .rotas_cache import file_hash
+from .cenarios import SCENARIOS, read_sumocfg, scenario_cfg, scenario_dir
+
+CACHE_FOLDER = "cache_fases"
+
+# Planos já carregados neste processo, por cenário
+_plans = {}
+
+def is_green(state):
+    return any(c in "Gg" for c in state) and not any(c in "yY" for c in state)
+
+def build_phase_plan(net_file, tl_id):
+    """ Lê o primeiro programa do semáforo `tl_id` na rede e retorna o plano de fases (um dicionário serializável). """
+    root = ET.parse(net_file).getroot()
+    logic = next((l for l in root.iter("tlLogic") if l.get("id") == tl_id), None)
+    if logic is None:
+        raise SystemExit(f"ERRO: Semáforo '{tl_id}' não encontrado em '{net_file}'.")
+    phases = logic.findall("phase")
+    states = [phase.get("state") for phase in phases]
+    greens = [i for i, state in enumerate(states) if is_green(state)]
+    if len(greens) < 2:
+        raise SystemExit(f"ERRO: O semáforo '{tl_id}' tem {len(greens)} fase(s) verde(s); o agente precisa de pelo menos duas.")
+
+    # Faixa de entrada de cada ligação do semáforo, como em traci.trafficlight.getControlledLanes
+    link_lanes = {}
+    for connection in root.iter("connection"):
+        if connection.get("tl") == tl_id:
+            link_lanes[int(connection.get("linkIndex"))] = f"{connection.get('from')}_{connection.get('fromLane')}"
+
+    yellows, all_reds, lanes, edges = [], [], [], []
+    for position, green in enumerate(greens):
+        next_green = greens[(position + 1) % len(greens)]
+        yellow = all_red = None
+        index = (green + 1) % len(states)
+        while index != next_green:
+            if yellow is None and any(c in "yY" for c in states[index]):
+                yellow = index
+            elif all_red is None and set(states[index]) == {"r"}:
+                all_red = index
+            index = (index + 1) % len(states)
+        yellows.append(yellow)
+        all_reds.append(all_red)
+
+        green_lanes = []
+        for link, c in enumerate(states[green]):
+            if c in "Gg" and link in link_lanes and link_lanes[link] not in green_lanes:
+                green_lanes.append(link_lanes[link])
+        lanes.append(green_lanes)
+        # A faixa é '<aresta>_<índice>'; no modelo mesoscópico as filas só existem por aresta
+        green_edges = []
+        for lane in green_lanes:
+            edge = lane.rsplit("_", 1)[0]
+            if edge not in green_edges:
+                green_edges.append(edge)
+        edges.append(green_edges)
+
+    return {
+        "semaforo": tl_id,
+        "programa": logic.get("programID"),
+        "estados": states,
+        "duracoes": [float(phase.get("duration")) for phase in phases],
+        "verdes": greens,
+        "amarelas": yellows,
+        "vermelho_geral": all_reds,
+        "faixas": lanes,
+        "arestas": edges,
+        "faixas_controladas": [link_lanes[link] for link in sorted(link_lanes)],
+    }
+
+def phase_plan(scenario):
+    """ Plano de fases do semáforo do cenário; lê de cache_fases/ ou monta a partir da rede na primeira vez. """
+    if scenario in _plans:
+        return _plans[scenario]
+    tl_id = SCENARIOS[scenario]["semaforo"]
+    net_file, _ = read_sumocfg(scenario_cfg(scenario))
+    cache_dir = os.path.join(scenario_dir(scenario), CACHE_FOLDER)
+    cached = os.path.join(cache_dir, f"fases_{tl_id}_{file_hash(net_file)}.json")
+    if os.path.exists(cached):
+        with open(cached, encoding="utf-8") as f:
+            plan = json.load(f)
+    else:
+        print(f"🔎 Lendo as fases do semáforo {tl_id} em '{os.path.basename(net_file)}'...")
+        plan = build_phase_plan(net_file, tl_id)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Arquivo temporário por processo: treinos paralelos podem gerar o mesmo cache ao mesmo tempo
+        partial = f"{cached}.{os.getpid()}.tmp"
+        with open(partial, "w", encoding="utf-8") as f:
+            json.dump(plan, f, indent=2)
+        os.replace(partial, cached)
+        print(f"✅ Plano de fases salvo em '{cached}'.")
+    _plans[scenario] = plan
+    return plan
+
+def transition_phases(plan, yellow_duration):
+    """ Ação -> [(fase, segundos)] da transição ao sair do seu verde: o amarelo e, se a rede tiver, o vermelho geral. """
+    transitions = {}
+    for action, (yellow, all_red) in enumerate(zip(plan["amarelas"], plan["vermelho_geral"])):
+        steps = []
+        if yellow is not None:
+            steps.append((yellow, yellow_duration))
+        if all_red is not None:
+            # O vermelho geral mantém a duração do programa da rede
+            steps.append((all_red, int(plan["duracoes"][all_red])))
+        transitions[action] = steps
+    return transitions
+
+def main():
+    scenarios = sys.argv[1:] or list(SCENARIOS)
+    for scenario in scenarios:
+        if scenario not in SCENARIOS:
+            print(f"ERRO: Cenário desconhecido '{scenario}'. Opções: {', '.join(SCENARIOS)}")
+            continue
+        plan = phase_plan(scenario)
+        print(f"\n🚦 {scenario} — semáforo {plan['semaforo']}, {len(plan['faixas_controladas'])} ligações")
+        for action, green in enumerate(plan["verdes"]):
+            yellow, all_red = plan["amarelas"][action], plan["vermelho_geral"][action]
+            print(f"   ação {action}: verde {green} ({plan['estados'][green]}), amarelo {yellow}, vermelho geral {all_red}, "
+                  f"{len(plan['faixas'][action])} faixas: {', '.join(plan['faixas'][action])}")
+
+if __name__ == "__main__":
+    main()
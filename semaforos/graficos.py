@@ -0,0 +1,105 @@
+"""
+Desenho dos gráficos do comparar_resultados e do relatorio_geral em um pool de processos.
+
+Cada gráfico é uma tarefa independente: uma função deste módulo que recebe só dados (arrays, listas, textos) e o caminho
+do PNG. Os processos usam o backend Agg, sem interface, e carregam as fontes uma vez, ao iniciar. Os nomes dos arquivos
+vêm de quem chama, então o resultado não depende da ordem em que os gráficos terminam.
+"""
+import multiprocessing as mp
+import os
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib import font_manager
+
+BAR_COLORS = ['#003f5c', '#58508d', '#bc5090', '#ff6361']
+
+def init_worker():
+    """ Carrega as fontes usadas nos gráficos (normal e negrito) uma vez por processo. """
+    for weight in ("normal", "bold"):
+        path = font_manager.findfont(font_manager.FontProperties(family=plt.rcParams["font.family"], weight=weight))
+        font_manager.get_font(path)
+
+def _run(function, args):
+    return function(*args)
+
+def render(tasks, workers=None):
+    """ Desenha as tarefas (função, argumentos) em paralelo; retorna os caminhos gerados, na ordem das tarefas. """
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        init_worker()
+        return [function(*args) for function, args in tasks]
+    with mp.Pool(workers, initializer=init_worker) as pool:
+        return pool.starmap(_run, tasks)
+
+def plot_time_series(series, title, ylabel, path, xlabel='Tempo de Simulação (s)'):
+    """ Uma métrica ao longo da simulação; `series` é uma lista de (rótulo, cor, tempos, valores). """
+    fig = plt.figure(figsize=(12, 6))
+    for label, color, times, values in series:
+        plt.plot(times, values, label=label, color=color, alpha=0.8)
+    plt.title(title, fontsize=16)
+    plt.xlabel(xlabel, fontsize=12)
+    plt.ylabel(ylabel, fontsize=12)
+    plt.legend()
+    plt.grid(True, linestyle='--', alpha=0.6)
+    plt.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+def plot_improvement_bars(names, values, title, path):
+    """ Barras com a melhoria percentual de cada mapa, com o valor escrito sobre cada barra. """
+    fig = plt.figure(figsize=(10, 5))
+    bars = plt.bar(names, values, color=BAR_COLORS[:len(names)])
+
+    plt.title(title, fontsize=16)
+    plt.ylabel('Melhoria Percentual (%)', fontsize=12)
+    plt.xlabel('Cenário (Mapa)', fontsize=12)
+    plt.xticks(rotation=10, ha='right')
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+
+    for bar in bars:
+        yval = bar.get_height()
+        offset = max(yval * 0.01, 0.5)
+        plt.text(bar.get_x() + bar.get_width()/2.0, yval + offset, f'{yval:.2f}%', ha='center', va='bottom')
+
+    plt.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+def plot_summary_table(cell_text, row_labels, col_labels, col_widths, path, last_row_label='MÉDIA GERAL'):
+    """ Tabela de resumo como imagem de 300 dpi; a linha `last_row_label` sai em negrito e com fundo cinza. """
+    fig, ax = plt.subplots(figsize=(20, 4))
+    ax.axis('off') # Esconde os eixos do gráfico
+
+    table = ax.table(cellText=cell_text,
+                     rowLabels=row_labels,
+                     colLabels=col_labels,
+                     loc='center',
+                     cellLoc='center',
+                     colWidths=col_widths)
+
+    table.auto_set_font_size(False)
+    table.set_fontsize(10)
+    table.scale(1, 3.0)
+
+    for (row, col), cell in table.get_celld().items():
+        cell.set_text_props(color='black')
+        if (row == 0):
+            cell.set_facecolor('#003f5c')
+            cell.set_text_props(color='white', weight='bold')
+        if (col == -1):
+            cell.set_text_props(color='black', weight='bold', ha='right')
+        if (row > 0 and row_labels[row-1] == last_row_label):
+            cell.set_text_props(color='black', weight='bold')
+            if (col == -1):
+               cell.set_text_props(color='black', weight='bold', ha='right')
+            if (col != -1):
+                cell.set_facecolor('#f0f0f0')
+
+    fig.tight_layout()
+    fig.savefig(path, dpi=300) # Salva com alta resolução
+    plt.close(fig)
+    return path
@@ -0,0 +1,43 @@
+"""
+Troca dos métodos do TraCI por versões envolvidas, compartilhada pela telemetria do treino, pelo profiler do TraCI e
+pelo benchmark. `wrap_traci` envolve as funções pedidas do módulo traci (simulationStep, start, ...) e todos os
+métodos públicos dos domínios (traci.lane, traci.vehicle, ...); `restore_traci` desfaz as trocas, na ordem inversa.
+Um envoltório já instalado por outra ferramenta é mantido por dentro do novo, então as medições se somam.
+"""
+import inspect
+
+import traci
+from traci.domain import Domain
+
+def traci_domains():
+    """ (nome, domínio) de cada domínio do TraCI (traci.lane, traci.vehicle, ...). """
+    return [(name, getattr(traci, name)) for name in dir(traci) if isinstance(getattr(traci, name), Domain)]
+
+def wrap_traci(wrap, functions=("simulationStep",)):
+    """ Troca as `functions` do traci e os métodos dos domínios por wrap(função, "simulationStep" ou "lane.getIDList").
+
+    Retorna as trocas como (dicionário, nome, valor anterior), para o restore_traci.
+    """
+    replaced = []
+    for name in functions:
+        replaced.append((vars(traci), name, getattr(traci, name)))
+        setattr(traci, name, wrap(getattr(traci, name), name))
+    for domain_name, domain in traci_domains():
+        for attribute in dir(type(domain)):
+            method = getattr(domain, attribute)
+            # Só métodos; as classes expostas pelos domínios (ex.: trafficlight.Phase) ficam como estão
+            if not attribute.startswith("_") and inspect.ismethod(inspect.unwrap(method)):
+                # Valor anterior None: o método vinha da classe do domínio, sem cópia no objeto
+                replaced.append((vars(domain), attribute, vars(domain).get(attribute)))
+                setattr(domain, attribute, wrap(method, f"{domain_name}.{attribute}"))
+    return replaced
+
+def restore_traci(replaced):
+    """ Desfaz as trocas registradas como (dicionário, nome, valor anterior), da última para a primeira. """
+    for target, name, previous in reversed(replaced):
+        if previous is None:
+            # Sem a cópia no objeto, volta a valer o método da classe do domínio
+            target.pop(name, None)
+        else:
+            target[name] = previous
+    replaced.clear()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Mescla Q-tables de treinos independentes (sementes ou máquinas diferentes) do mesmo cenário.
+
+Cada valor Q vira a média dos valores dos treinos, ponderada pelo número de atualizações do par estado-ação
+em cada um (o q_table_*_visitas.pkl que o treinamento salva junto da Q-table). Um par que um treino nunca
+atualizou não pesa nada nele; se nenhum treino o atualizou, fica a média simples. Treinos sem arquivo de
+visitas entram com peso 1 em cada estado que conhecem.
+
+Uso:
+    python -m semaforos.mesclar_qtables semente1/q_table_prox_samur.pkl semente2/q_table_prox_samur.pkl -o Prox_Samur/q_table_prox_samur.pkl
+"""
+import argparse
+import os
+import pickle
+
+import numpy as np
+
+def visits_file_for(q_table_file):
+    """ Arquivo de visitas salvo junto da Q-table (q_table_x.pkl -> q_table_x_visitas.pkl). """
+    root, ext = os.path.splitext(q_table_file)
+    return f"{root}_visitas{ext}"
+
+def load_run(q_table_file):
+    """ Retorna (Q-table, visitas) de um treino; visitas é None se o arquivo não existir. """
+    with open(q_table_file, "rb") as f: q_table = pickle.load(f)
+    visits_file = visits_file_for(q_table_file)
+    if not os.path.exists(visits_file):
+        print(f"⚠️ '{visits_file}' não encontrado; '{q_table_file}' entra com peso 1 por estado.")
+        return q_table, None
+    with open(visits_file, "rb") as f: visits = pickle.load(f)
+    return q_table, visits
+
+def merge_q_tables(runs):
+    """ Mescla [(Q-table, visitas ou None), ...] e retorna (Q-table, visitas) mescladas, no formato dos .pkl. """
+    states = set().union(*(q_table for q_table, _ in runs))
+    merged_q, merged_visits = {}, {}
+    for state in states:
+        values, weights = [], []
+        for q_table, visits in runs:
+            if state not in q_table:
+                continue
+            row = np.asarray(q_table[state], dtype=np.float64)
+            values.append(row)
+            if visits is None:
+                weights.append(np.ones_like(row))
+            else:
+                weights.append(np.asarray(visits.get(state, np.zeros_like(row)), dtype=np.float64))
+        values, weights = np.array(values), np.array(weights)
+        total = weights.sum(axis=0)
+        weighted = (values * weights).sum(axis=0) / np.where(total > 0, total, 1)
+        merged_q[state] = np.where(total > 0, weighted, values.mean(axis=0))
+        merged_visits[state] = total.astype(np.int64)
+    return merged_q, merged_visits
+
+def agreement(q_table, merged_q):
+    """ Fração dos estados do treino em que a ação gulosa coincide com a da tabela mesclada. """
+    same = sum(1 for state, values in q_table.items() if np.argmax(values) == np.argmax(merged_q[state]))
+    return same / max(len(q_table), 1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Mescla Q-tables com média ponderada pelas visitas.")
+    parser.add_argument("qtables", nargs="+", help="Q-tables (.pkl) dos treinos a mesclar")
+    parser.add_argument("-o", "--saida", required=True, help="Q-table mesclada (as visitas vão para *_visitas.pkl)")
+    args = parser.parse_args()
+
+    runs = [load_run(path) for path in args.qtables]
+    merged_q, merged_visits = merge_q_tables(runs)
+    for path, (q_table, visits) in zip(args.qtables, runs):
+        total_visits = sum(int(np.sum(v)) for v in visits.values()) if visits is not None else None
+        print(f"📥 {path}: {len(q_table)} estados, "
+              f"{total_visits if total_visits is not None else '?'} atualizações, "
+              f"ação gulosa igual à mesclada em {agreement(q_table, merged_q):.1%} dos estados")
+
+    with open(args.saida, "wb") as f: pickle.dump(merged_q, f)
+    with open(visits_file_for(args.saida), "wb") as f: pickle.dump(merged_visits, f)
+    print(f"✅ {len(runs)} Q-tables mescladas em '{args.saida}' ({len(merged_q)} estados).")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Opção --profile comum aos pontos de entrada do projeto: roda o main() sob um profiler e grava o resultado em
+PROFILE_FOLDER (perfis/, na raiz do projeto), qualquer que seja a pasta de onde o comando foi chamado.
+
+    python -m semaforos treinar Prox_Samur --profile                  # amostragem (padrão)
+    python -m semaforos tempo_fixo --profile=cprofile --profile-top 40
+
+No modo "amostragem", uma thread lê a pilha do processo principal a cada SAMPLE_INTERVAL segundos. O custo é baixo e
+o tempo parado esperando o SUMO (dentro do TraCI) também aparece. Grava:
+    perfis/<nome>_perfil.folded         pilhas no formato "collapsed" (speedscope, flamegraph.pl, inferno)
+    perfis/<nome>_perfil_resumo.txt     funções com mais tempo próprio e mais tempo total (também mostrado no terminal)
+No modo "cprofile", cada chamada de função é medida (mais preciso nas contagens, porém mais lento). Grava:
+    perfis/<nome>_perfil.prof           estatísticas do pstats (snakeviz, gprof2dot)
+    perfis/<nome>_perfil_resumo.txt     funções com mais tempo total e mais tempo próprio
+
+Só o processo principal é medido; os processos filhos (treinos paralelos, avaliação em segundo plano) não entram.
+"""
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+from .cenarios import PROJECT_DIR
+
+MODES = ("amostragem", "cprofile")
+SAMPLE_INTERVAL = 0.005
+DEFAULT_TOP = 25
+PROFILE_FOLDER = os.path.join(PROJECT_DIR, "perfis")
+
+class SamplingProfiler:
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.elapsed = 0.0
+        self.thread_id = threading.get_ident()
+        self.this_file = os.path.abspath(__file__)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            # Sobe até o run_main deste arquivo: o que vem antes dele não é do script
+            while frame is not None and os.path.abspath(frame.f_code.co_filename) != self.this_file:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def runcall(self, function):
+        start = time.perf_counter()
+        self._thread.start()
+        try:
+            return function()
+        finally:
+            self._stop.set()
+            self._thread.join()
+            self.elapsed = time.perf_counter() - start
+
+    def report(self, top=DEFAULT_TOP):
+        total = sum(self.stacks.values())
+        lines = [f"📊 Perfil por amostragem — {total} amostras em {self.elapsed:.2f}s"]
+        if not total:
+            return "\n".join(lines)
+        # Cada amostra vale a fração correspondente do tempo de parede, já que a thread nem sempre acorda no intervalo
+        seconds_per_sample = self.elapsed / total
+        own, inclusive = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for frame in set(frames):
+                inclusive[frame] += count
+        for title, counter in (("tempo próprio", own), ("tempo total, com as chamadas internas", inclusive)):
+            lines += ["", f"{'função — ' + title:<90} {'seg.':>8} {'%':>6}"]
+            for frame, count in counter.most_common(top):
+                lines.append(f"{frame:<90} {count * seconds_per_sample:>8.2f} {count / total:>6.1%}")
+        return "\n".join(lines)
+
+    def save(self, output_prefix, top=DEFAULT_TOP):
+        with open(f"{output_prefix}.folded", "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+        return f"{output_prefix}.folded", self.report(top)
+
+class DeterministicProfiler:
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def runcall(self, function):
+        self.profile.enable()
+        try:
+            return function()
+        finally:
+            self.profile.disable()
+
+    def save(self, output_prefix, top=DEFAULT_TOP):
+        self.profile.dump_stats(f"{output_prefix}.prof")
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=stream)
+        for order in ("cumulative", "tottime"):
+            stats.sort_stats(order).print_stats(top)
+        return f"{output_prefix}.prof", "📊 Perfil determinístico (cProfile)\n" + stream.getvalue()
+
+def run_main(main, name=None, folder=PROFILE_FOLDER):
+    """ Chama main(); com --profile, sob o profiler escolhido. Os arquivos vão para `folder`, prefixados por `name`. """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--profile", nargs="?", const=MODES[0], choices=MODES)
+    parser.add_argument("--profile-top", type=int, default=DEFAULT_TOP)
+    args, remaining = parser.parse_known_args()
+    # Os demais argumentos continuam disponíveis para o script
+    sys.argv = sys.argv[:1] + remaining
+    if args.profile is None:
+        return main()
+
+    profiler = SamplingProfiler() if args.profile == "amostragem" else DeterministicProfiler()
+    # Caminho absoluto: os comandos trocam de pasta (a de cada cenário) durante a execução
+    os.makedirs(folder, exist_ok=True)
+    output_prefix = os.path.join(folder, (name or os.path.splitext(os.path.basename(sys.argv[0]))[0]) + "_perfil")
+    try:
+        return profiler.runcall(main)
+    finally:
+        # O perfil sai mesmo se o script terminar com sys.exit ou Ctrl+C
+        profile_file, report = profiler.save(output_prefix, args.profile_top)
+        with open(f"{output_prefix}_resumo.txt", "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+        print("\n" + report)
+        print(f"📁 Perfil salvo em '{profile_file}' e '{output_prefix}_resumo.txt'.")
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Profiler das chamadas ao TraCI, para achar consultas repetidas ou desnecessárias nos scripts.
+
+Roda qualquer módulo ou script do projeto com todos os domínios do TraCI (traci.lane, traci.vehicle, ...) e o
+traci.simulationStep trocados por versões que medem cada chamada. Por método, registra o número de chamadas, a
+latência total e o histograma de latências. Também agrupa as chamadas por passo da simulação e pelo local do
+código que as fez (arquivo:linha). No fim da execução, grava:
+    <saida>_relatorio.txt  resumo por método, por passo e por local de chamada (também mostrado no terminal)
+    <saida>.folded         pilhas no formato "collapsed" (flamegraph.pl, speedscope, inferno), pesadas pelo
+                           tempo em microssegundos dentro do TraCI
+
+Só o processo principal é medido; os processos filhos dos treinos paralelos não entram.
+
+Uso (da raiz do projeto; um nome de módulo roda como em 'python -m', um caminho .py como em 'python script.py'):
+    python -m semaforos.perfil_traci semaforos avaliar Prox_Samur --sem-interface
+    python -m semaforos.perfil_traci --saida perfil_tempo_fixo --top 30 semaforos tempo_fixo Prox_Samur --sem-interface
+"""
+import argparse
+import atexit
+import functools
+import os
+import runpy
+import sys
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+if 'SUMO_HOME' in os.environ:
+    tools = os.path.join(os.environ['SUMO_HOME'], 'tools')
+    sys.path.append(tools)
+else:
+    sys.exit("please declare environment variable 'SUMO_HOME'")
+
+from .instrumentacao_traci import wrap_traci
+
+# Limites superiores das faixas do histograma de latência, em microssegundos (a última faixa é aberta)
+HISTOGRAM_BOUNDS_US = [10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 50000]
+DEFAULT_TOP = 15
+
+class TraciProfiler:
+    def __init__(self):
+        self.calls = Counter()
+        self.seconds = defaultdict(float)
+        self.histograms = defaultdict(lambda: np.zeros(len(HISTOGRAM_BOUNDS_US) + 1, dtype=np.int64))
+        self.step = 0
+        self.step_calls = Counter()
+        self.step_seconds = defaultdict(float)
+        self.site_calls = Counter()
+        self.site_seconds = defaultdict(float)
+        self.folded = defaultdict(float)
+        self.this_file = os.path.abspath(__file__)
+
+    def _stack(self, frame):
+        """ Pilha do código do usuário (da mais externa para a mais interna), sem o runpy e este arquivo. """
+        frames = []
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if os.path.abspath(filename) == self.this_file or filename.startswith("<frozen"):
+                break
+            frames.append(f"{os.path.basename(filename)}:{frame.f_code.co_name}")
+            frame = frame.f_back
+        return frames[::-1]
+
+    def _wrap(self, function, method):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.calls[method] += 1
+                self.seconds[method] += elapsed
+                self.histograms[method][np.searchsorted(HISTOGRAM_BOUNDS_US, elapsed * 1e6)] += 1
+                self.step_calls[self.step] += 1
+                self.step_seconds[self.step] += elapsed
+                caller = sys._getframe(1)
+                site = f"{os.path.basename(caller.f_code.co_filename)}:{caller.f_lineno} ({caller.f_code.co_name}) -> {method}"
+                self.site_calls[site] += 1
+                self.site_seconds[site] += elapsed
+                self.folded[";".join(self._stack(caller) + [f"traci.{method}"])] += elapsed * 1e6
+                if method == "simulationStep":
+                    self.step += 1
+        return wrapper
+
+    def install(self):
+        wrap_traci(self._wrap)
+
+    def report(self, top=DEFAULT_TOP):
+        total_calls = sum(self.calls.values())
+        total_seconds = sum(self.seconds.values())
+        lines = [f"📊 Perfil do TraCI — {total_calls} chamadas, {total_seconds:.3f}s dentro do TraCI, {self.step} passos"]
+
+        lines += ["", f"{'método':<40} {'chamadas':>9} {'total (s)':>10} {'média (µs)':>11} {'p50 (µs)':>9} {'p99 (µs)':>9}"]
+        for method in sorted(self.seconds, key=self.seconds.get, reverse=True)[:top]:
+            calls = self.calls[method]
+            lines.append(f"{method:<40} {calls:>9} {self.seconds[method]:>10.3f} {self.seconds[method] / calls * 1e6:>11.1f} "
+                         f"{self._percentile(method, 0.50):>9} {self._percentile(method, 0.99):>9}")
+
+        lines += ["", "Histograma de latência (µs, faixas até o limite):"]
+        labels = [f"≤{bound}" for bound in HISTOGRAM_BOUNDS_US] + [f">{HISTOGRAM_BOUNDS_US[-1]}"]
+        for method in sorted(self.seconds, key=self.seconds.get, reverse=True)[:top]:
+            buckets = " ".join(f"{label}:{count}" for label, count in zip(labels, self.histograms[method]) if count)
+            lines.append(f"  {method:<38} {buckets}")
+
+        if self.step:
+            calls_per_step = np.array([self.step_calls[step] for step in range(self.step)])
+            seconds_per_step = np.array([self.step_seconds[step] for step in range(self.step)]) * 1e3
+            lines += ["", f"Por passo — chamadas: média {calls_per_step.mean():.1f}, máx. {calls_per_step.max()} | "
+                          f"tempo no TraCI: média {seconds_per_step.mean():.2f}ms, máx. {seconds_per_step.max():.2f}ms"]
+            slowest = sorted(range(self.step), key=lambda step: self.step_seconds[step], reverse=True)[:5]
+            lines.append("Passos mais lentos: " + ", ".join(
+                f"{step} ({self.step_calls[step]} chamadas, {self.step_seconds[step] * 1e3:.2f}ms)" for step in slowest))
+
+        lines += ["", f"{'local da chamada':<80} {'chamadas':>9} {'total (s)':>10}"]
+        for site in sorted(self.site_seconds, key=self.site_seconds.get, reverse=True)[:top]:
+            lines.append(f"{site:<80} {self.site_calls[site]:>9} {self.site_seconds[site]:>10.3f}")
+        return "\n".join(lines)
+
+    def _percentile(self, method, quantile):
+        """ Limite superior da faixa do histograma onde cai o quantil. """
+        histogram = self.histograms[method]
+        index = int(np.searchsorted(np.cumsum(histogram), quantile * histogram.sum()))
+        return HISTOGRAM_BOUNDS_US[index] if index < len(HISTOGRAM_BOUNDS_US) else f">{HISTOGRAM_BOUNDS_US[-1]}"
+
+    def save(self, output_prefix, top=DEFAULT_TOP):
+        report = self.report(top)
+        print("\n" + report)
+        with open(f"{output_prefix}_relatorio.txt", "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+        with open(f"{output_prefix}.folded", "w", encoding="utf-8") as f:
+            for stack, microseconds in sorted(self.folded.items()):
+                f.write(f"{stack} {max(1, round(microseconds))}\n")
+        print(f"📁 Perfil salvo em '{output_prefix}_relatorio.txt' e '{output_prefix}.folded'.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa um script medindo todas as chamadas ao TraCI.")
+    parser.add_argument("--saida", default="perfil_traci", help="Prefixo dos arquivos do relatório")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Linhas por tabela do relatório")
+    parser.add_argument("script", help="Módulo a executar, como em 'python -m modulo', ou caminho de um script .py")
+    parser.add_argument("argumentos", nargs=argparse.REMAINDER, help="Argumentos repassados ao script")
+    args = parser.parse_args()
+
+    profiler = TraciProfiler()
+    profiler.install()
+    # O relatório sai mesmo se o script terminar com sys.exit ou Ctrl+C
+    atexit.register(profiler.save, args.saida, args.top)
+    sys.argv = [args.script] + args.argumentos
+    if args.script.endswith(".py"):
+        sys.path.insert(0, os.path.dirname(os.path.abspath(args.script)))
+        runpy.run_path(args.script, run_name="__main__")
+    else:
+        # Pacotes rodam pelo __main__.py, com os imports relativos resolvidos, como em 'python -m'
+        runpy.run_module(args.script, run_name="__main__", alter_sys=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Política gulosa compilada a partir de uma Q-table treinada.
+
+O estado do Q-learning é uma tupla com o nível de fila (0 a 5) de cada grupo de fases, então o espaço
+de estados é pequeno: 6 ** NUM_ACTIONS estados. A exportação grava, para cada estado codificado, a ação
+de maior valor Q em um vetor de bytes, junto com os metadados do cenário (mapa de fases, durações,
+semáforo e hashes). O carregamento não depende de NumPy nem de pickle e a consulta é um acesso por índice,
+o que serve tanto para a simulação quanto para um controlador de campo.
+
+Uso:
+    python -m semaforos.politica_compilada                  # exporta a Q-table de todos os cenários
+    python -m semaforos.politica_compilada Prox_Samur --qtable caminho/q_table.pkl
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import time
+
+MAGIC = b"QPOL"
+FORMAT_VERSION = 1
+# Níveis de fila por grupo de fases, como em get_state: min(parados // 3, 5)
+STATE_LEVELS = 6
+QUEUE_STEP = 3
+DEFAULT_ACTION = 0  # np.argmax(np.zeros(NUM_ACTIONS)) para estados nunca visitados
+# Nível de interrupção de cada classe de veículo, como em get_priority_action
+PRIORITY_LEVELS = {"emergency": 2, "authority": 1}
+
+def queue_levels(halting):
+    """ Estado a partir dos veículos parados de cada grupo de fases, com a discretização de get_state. """
+    levels = []
+    for stopped in halting:
+        # Um valor negativo ou fracionário geraria o índice de outro estado em encode_state
+        if isinstance(stopped, bool) or not isinstance(stopped, int) or stopped < 0:
+            raise ValueError(f"número de veículos parados inválido: {stopped!r}")
+        levels.append(min(stopped // QUEUE_STEP, STATE_LEVELS - 1))
+    return tuple(levels)
+
+def encode_state(state, levels=STATE_LEVELS):
+    """ Índice do estado no vetor de ações (base `levels`, primeiro grupo como dígito mais significativo). """
+    index = 0
+    for level in state:
+        index = index * levels + level
+    return index
+
+def decode_state(index, num_actions, levels=STATE_LEVELS):
+    state = []
+    for _ in range(num_actions):
+        index, level = divmod(index, levels)
+        state.append(level)
+    return tuple(reversed(state))
+
+class CompiledPolicy:
+    """ Política gulosa congelada: um byte de ação por estado codificado. """
+    __slots__ = ("actions", "metadata", "num_actions", "action_to_phase", "action_to_yellow", "transitions")
+
+    def __init__(self, actions, metadata):
+        self.actions = actions
+        self.metadata = metadata
+        self.num_actions = metadata["num_actions"]
+        self.action_to_phase = {int(a): p for a, p in metadata["action_to_phase"].items()}
+        # Políticas exportadas antes do plano de fases (semaforos/fases.py) supunham o amarelo logo após o verde
+        yellows = metadata.get("action_to_yellow") or {a: p + 1 for a, p in self.action_to_phase.items()}
+        self.action_to_yellow = {int(a): p for a, p in yellows.items()}
+        # Ação -> [(fase, segundos)] de fases.transition_phases; sem ela (exportações antigas), só o amarelo
+        transitions = metadata.get("transitions") or {
+            a: [] if p is None else [(p, metadata.get("yellow_duration", 4))] for a, p in self.action_to_yellow.items()}
+        self.transitions = {int(a): [(phase, int(seconds)) for phase, seconds in steps] for a, steps in transitions.items()}
+
+    def action(self, state):
+        return self.actions[encode_state(state)]
+
+    def phase(self, state):
+        return self.action_to_phase[self.action(state)]
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:4] != MAGIC:
+            raise ValueError(f"'{path}' não é uma política compilada.")
+        (header_size,) = struct.unpack_from("<I", data, 4)
+        metadata = json.loads(data[8:8 + header_size])
+        actions = data[8 + header_size:]
+        if hashlib.sha256(actions).hexdigest() != metadata["policy_sha256"]:
+            raise ValueError(f"Política '{path}' corrompida: hash das ações não confere.")
+        return cls(actions, metadata)
+
+    def save(self, path):
+        header = json.dumps(self.metadata, sort_keys=True).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(MAGIC + struct.pack("<I", len(header)) + header + bytes(self.actions))
+
+def compile_q_table(q_table, action_to_phase, metadata=None):
+    """ Converte uma Q-table {estado: valores por ação} em uma CompiledPolicy. """
+    num_actions = len(action_to_phase)
+    actions = bytearray([DEFAULT_ACTION]) * (STATE_LEVELS ** num_actions)
+    for state, values in q_table.items():
+        values = list(values)
+        actions[encode_state(state)] = values.index(max(values))
+    actions = bytes(actions)
+    full_metadata = dict(metadata or {})
+    full_metadata.update({
+        "format_version": FORMAT_VERSION,
+        "num_actions": num_actions,
+        "state_levels": STATE_LEVELS,
+        "action_to_phase": {str(a): p for a, p in action_to_phase.items()},
+        "visited_states": len(q_table),
+        "policy_sha256": hashlib.sha256(actions).hexdigest(),
+    })
+    return CompiledPolicy(actions, full_metadata)
+
+def policy_file_for(q_table_file):
+    """ Nome da política compilada correspondente a uma Q-table (q_table_x.pkl -> politica_x.pol). """
+    folder, name = os.path.split(q_table_file)
+    return os.path.join(folder, name.replace("q_table_", "politica_").replace(".pkl", ".pol"))
+
+def export_scenario(scenario, q_table_file=None):
+    # Importações pesadas só na exportação; carregar a política não precisa delas
+    import pickle
+    from .cenarios import load_scenario_module, scenario_file
+
+    module = load_scenario_module(scenario, "simulacao_Qlearning")
+    q_table_file = q_table_file or scenario_file(scenario, module.Q_TABLE_FILE)
+    if not os.path.exists(q_table_file):
+        print(f"⚠️ Q-table '{q_table_file}' não encontrada. Treine o cenário antes de exportar.")
+        return None
+    with open(q_table_file, "rb") as f:
+        raw = f.read()
+    q_table = pickle.loads(raw)
+
+    policy = compile_q_table(q_table, module.ACTION_TO_PHASE, {
+        "scenario": scenario,
+        "traffic_light_id": module.TRAFFIC_LIGHT_ID,
+        "green_duration": module.GREEN_DURATION,
+        "yellow_duration": module.YELLOW_DURATION,
+        "action_to_yellow": {str(a): p for a, p in enumerate(module.PHASE_PLAN["amarelas"])},
+        "transitions": {str(a): steps for a, steps in module.TRANSITIONS.items()},
+        "q_table_sha256": hashlib.sha256(raw).hexdigest(),
+    })
+    policy_file = policy_file_for(q_table_file)
+    policy.save(policy_file)
+
+    start = time.perf_counter()
+    loaded = CompiledPolicy.load(policy_file)
+    load_time = time.perf_counter() - start
+    states = [decode_state(i, loaded.num_actions) for i in range(len(loaded.actions))]
+    start = time.perf_counter()
+    for state in states:
+        loaded.action(state)
+    lookup_time = (time.perf_counter() - start) / len(states)
+    print(f"📦 {scenario}: {policy.metadata['visited_states']} estados visitados -> '{policy_file}' "
+          f"({os.path.getsize(policy_file)} bytes). Carga: {load_time * 1e6:.0f} µs, consulta: {lookup_time * 1e9:.0f} ns")
+    return policy_file
+
+def main():
+    from .cenarios import SCENARIOS
+    parser = argparse.ArgumentParser(description="Compila Q-tables treinadas em políticas gulosas congeladas.")
+    parser.add_argument("cenarios", nargs="*", default=list(SCENARIOS), help="Pastas dos cenários (padrão: todos)")
+    parser.add_argument("--qtable", help="Q-table a exportar no lugar da Q_TABLE_FILE do cenário")
+    args = parser.parse_args()
+    for scenario in args.cenarios:
+        if scenario not in SCENARIOS:
+            print(f"ERRO: Cenário desconhecido '{scenario}'. Opções: {', '.join(SCENARIOS)}")
+            continue
+        export_scenario(scenario, args.qtable)
+
+if __name__ == "__main__":
+    main()
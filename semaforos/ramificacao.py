@@ -0,0 +1,55 @@
+"""
+Avaliação contrafactual das ações por ramificação da simulação (COUNTERFACTUAL = True no treinamento_Qlearning.py).
+
+Na decisão, a simulação principal grava o próprio estado com saveState. Cada ramo é um SUMO separado, numa
+conexão TraCI com rótulo, que carrega esse estado e simula uma ação alternativa por um horizonte curto. Os ramos
+rodam em threads, uma por conexão: enquanto uma thread espera a resposta do seu SUMO, as outras seguem, então os
+SUMOs dos ramos avançam em paralelo. Como cada ramificação carrega o estado inteiro da principal, os SUMOs dos ramos
+ficam abertos de um episódio para o outro e só sobem de novo se o comando mudar.
+"""
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import traci
+
+class SnapshotBrancher:
+    def __init__(self, num_branches):
+        self.labels = [f"ramo_{i}" for i in range(num_branches)]
+        # Estado binário (.sbx): gravar e carregar a cada decisão custa bem menos que o XML
+        self.state_file = os.path.join(tempfile.gettempdir(), f"ramificacao_{os.getpid()}.sbx")
+        self.executor = ThreadPoolExecutor(num_branches)
+        self.branches = []
+        self.sumo_cmd = None
+        self.rollouts = 0
+
+    def start(self, sumo_cmd):
+        """ Sobe um SUMO por ramo com `sumo_cmd`, se ainda não estiverem abertos com ele; a principal segue como atual. """
+        if self.branches and sumo_cmd == self.sumo_cmd:
+            return
+        self.close()
+        self.sumo_cmd = sumo_cmd
+        main_label = traci.getLabel()
+        for label in self.labels:
+            traci.start(sumo_cmd, label=label)
+            self.branches.append(traci.getConnection(label))
+        traci.switch(main_label)
+
+    def branch(self, rollout, branch_args):
+        """ Grava o estado da simulação atual e roda rollout(conexão, *args) em um ramo para cada item de branch_args. """
+        traci.simulation.saveState(self.state_file)
+
+        def run(connection, args):
+            connection.simulation.loadState(self.state_file)
+            return rollout(connection, *args)
+
+        results = list(self.executor.map(run, self.branches, branch_args))
+        self.rollouts += len(results)
+        return results
+
+    def close(self):
+        for connection in self.branches:
+            connection.close()
+        self.branches = []
+        if os.path.exists(self.state_file):
+            os.remove(self.state_file)
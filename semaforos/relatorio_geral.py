@@ -1,29 +1,45 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 import os
 from fpdf import FPDF
 from fpdf.enums import XPos, YPos # Importação para a nova sintaxe
 from datetime import datetime
+from .cenarios import SCENARIOS
+from .graficos import plot_improvement_bars, plot_summary_table, render
 
 # --- Configurações ---
-# Define os nomes de exibição e os nomes das pastas de cada mapa
-MAP_DIRS = {
-    "Prox. Samur": "Prox_Samur",
-    "Prox. Estádio": "Prox_EstadioLomanto",
-    "Prox. Batalhão": "Prox_BatalhaoPolicia",
-    "Brumado x R. Pacheco": "BrumadoxRPacheco"
-}
+# Nomes de exibição e pastas de cada mapa, na ordem do registro em cenarios.py
+MAP_DIRS = {config["nome"]: scenario for scenario, config in SCENARIOS.items()}
 
-# Mapeia pastas para seus arquivos de resumo
-SUMMARY_FILES = {
-    "Prox_Samur": "resumo_metricas_samur.csv",
-    "Prox_EstadioLomanto": "resumo_metricas_lomanto.csv",
-    "Prox_BatalhaoPolicia": "resumo_metricas_batalhao.csv",
-    "BrumadoxRPacheco": "resumo_metricas_brumado.csv"
-}
+# Mapeia pastas para seus arquivos de resumo (gerados pelo comparar_resultados.py)
+SUMMARY_FILES = {scenario: f"resumo_metricas_{config['resumo']}.csv" for scenario, config in SCENARIOS.items()}
 
 OUTPUT_FILENAME = "relatorio_comparativo_geral.pdf"
 FONT_PATH = "DejaVuSans.ttf"
+TABLE_IMAGE = "tabela_resumo_geral.png"
+# Processos que desenham a tabela e os gráficos (None: um por núcleo; 1: no próprio processo)
+PLOT_WORKERS = None
+
+# Colunas da tabela de resumo: (coluna do resumo, rótulo, largura)
+TABLE_COLUMNS = [
+    ('Melhora Espera Global', 'Redução Tempo\n de Espera Global', 0.14),
+    ('Melhora Paradas Globais', 'Redução Total\n de Paradas Globais', 0.14),
+    ('Melhora Espera Prioritarios', 'Redução Tempo de Espera\n Veículos Prioritários', 0.17),
+    ('Melhora Paradas Prioritarios', 'Redução Total de\n Paradas Veículos Prioritários', 0.17),
+    ('Melhora Espera Emergency', 'Redução Tempo\n de Espera Emergência', 0.13),
+    ('Melhora Espera Authority', 'Redução Tempo\n de Espera Autoridade', 0.13),
+    ('Melhora Velocidade Global', 'Aumento Velocidade\n Média Global', 0.12),
+]
+
+# Gráficos de barras, uma lista por página: (coluna do resumo, título, nome do arquivo temporário)
+COMPARISON_PAGES = [
+    [('Melhora Espera Global', 'Comparativo: Redução Tempo de Espera (Global)', 'melhora_espera_global'),
+     ('Melhora Paradas Globais', 'Comparativo: Redução Total de Paradas (Global)', 'melhora_paradas_global')],
+    [('Melhora Espera Prioritarios', 'Comparativo: Redução Tempo de Espera (Veículos Prioritários)', 'melhora_espera_prioritarios'),
+     ('Melhora Paradas Prioritarios', 'Comparativo: Redução Total de Paradas (Veículos Prioritários)', 'melhora_paradas_prioritarios')],
+    [('Melhora Espera Emergency', 'Comparativo: Redução Tempo de Espera (Emergência)', 'melhora_sem_espera_emergency'),
+     ('Melhora Espera Authority', 'Comparativo: Redução Tempo de Espera (Autoridade)', 'melhora_espera_authority')],
+    [('Melhora Velocidade Global', 'Comparativo: Aumento Velocidade Média (Global)', 'melhora_velocidade_global')],
+]
 
 # --- Classe PDF ---
 class PDF(FPDF):
@@ -51,7 +67,7 @@ class PDF(FPDF):
             self.cell(0, 10, f'Página {self.page_no()}', 
                       border=0, new_x=XPos.RIGHT, new_y=YPos.TOP, align='C')
 
-    def add_title_page(self):
+    def add_title_page(self, map_names):
         """ Cria a Página de Rosto """
         self.add_page()
         self.set_font('DejaVu', 'B', 24)
@@ -69,86 +85,21 @@ class PDF(FPDF):
         self.cell(0, 10, 'Mapas Analisados:', 
                   border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L')
         self.set_font('DejaVu', '', 12)
-        for map_name in MAP_DIRS.keys():
+        for map_name in map_names:
             self.cell(0, 8, f'- {map_name}', 
                       border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L')
         self.ln(10)
         self.set_font('DejaVu', '', 10)
         self.multi_cell(0, 5, 
-            "Este relatório agrega os resultados das simulações de quatro cenários de tráfego. "
+            f"Este relatório agrega os resultados das simulações de {len(map_names)} cenários de tráfego. "
             "Ele compara o desempenho de um controlador de semáforo baseado em Q-Learning contra um "
             "controlador de tempo fixo, focando nas melhorias percentuais em métricas chave.")
         # Adiciona a primeira página de conteúdo
         self.add_page()
 
-    def add_table_as_image(self, df_agg):
-        """ Cria a tabela de resumo como uma imagem e a insere no PDF. """
-        print("Gerando tabela de resumo como imagem...")
-        
-        # 1. Preparar o DataFrame para a tabela
-        df_for_table = df_agg.set_index('Mapa').copy()
-        
-        cols_to_show = ['Melhora Espera Global', 'Melhora Paradas Globais', 
-                        'Melhora Espera Prioritarios', 'Melhora Paradas Prioritarios', 
-                        'Melhora Espera Emergency', 'Melhora Espera Authority', 
-                        'Melhora Velocidade Global']
-        
-        df_for_table = df_for_table[cols_to_show]
-        
-        # Adiciona a linha de Média Geral
-        df_for_table.loc['MÉDIA GERAL'] = df_for_table.mean()
-        
-        # Formata todos os valores como string com '%'
-        df_for_table = df_for_table.applymap(lambda x: f'{x:.2f}%')
-        
-        # --- Rótulos das colunas ---
-        col_labels = ['Redução Tempo\n de Espera Global', 'Redução Total\n de Paradas Globais', 'Redução Tempo de Espera\n Veículos Prioritários', 'Redução Total de\n Paradas Veículos Prioritários',
-                      'Redução Tempo\n de Espera Emergência', 'Redução Tempo\n de Espera Autoridade', 'Aumento Velocidade\n Média Global']
-
-        row_labels = df_for_table.index.tolist()
-        
-        # 2. Criar a Figura e Tabela Matplotlib
-
-        # --- Tamanho da figura ---
-        fig, ax = plt.subplots(figsize=(20, 4)) # Era (14, 3)
-        ax.axis('off') # Esconde os eixos do gráfico
-
-        # --- Largura das colunas ---
-        table = ax.table(cellText=df_for_table.values, 
-                         rowLabels=row_labels, 
-                         colLabels=col_labels, 
-                         loc='center', 
-                         cellLoc='center',
-                         colWidths=[0.14, 0.14, 0.17, 0.17, 0.13, 0.13, 0.12]) 
-        
-        table.auto_set_font_size(False)
-        table.set_fontsize(10)
-
-        # --- Altura da célula ---
-        table.scale(1, 3.0) # Era 2.5
-
-
-        # Lógica de cor (já estava correta)
-        for (row, col), cell in table.get_celld().items():
-            cell.set_text_props(color='black')
-            if (row == 0): 
-                cell.set_facecolor('#003f5c')
-                cell.set_text_props(color='white', weight='bold')
-            if (col == -1): 
-                cell.set_text_props(color='black', weight='bold', ha='right')
-            if (row > 0 and row_labels[row-1] == 'MÉDIA GERAL'):
-                cell.set_text_props(color='black', weight='bold')
-                if (col == -1):
-                   cell.set_text_props(color='black', weight='bold', ha='right')
-                if (col != -1):
-                    cell.set_facecolor('#f0f0f0')
-        
-        img_path = "tabela_resumo_geral.png"
-        fig.tight_layout()
-        fig.savefig(img_path, dpi=300) # Salva com alta resolução
-        plt.close(fig)
-        
-        # 3. Adicionar Título e Imagem da Tabela ao PDF (com verificação de página)
+    def add_table_as_image(self, img_path):
+        """ Insere a imagem da tabela de resumo (gerada por plot_summary_table) com o título. """
+        # Título e imagem da tabela (com verificação de página)
         title_text = 'Resumo Comparativo das Métricas (Melhoria % do Q-Learning)'
         title_height = 10
         padding = 5
@@ -170,35 +121,11 @@ class PDF(FPDF):
         
         x_pos = (self.w - img_w) / 2
         self.image(img_path, x=x_pos, w=img_w)
-        
-        
         self.ln(10)
         
-    def add_comparison_chart(self, df_agg, metric_col, title, filename):
-        """ Cria e insere um gráfico de barras comparativo (CORRIGIDO PARA TÍTULOS ÓRFÃOS) """
-        
-        # 1. Gera o gráfico e salva em disco PRIMEIRO
-        plt.figure(figsize=(10, 5))
-        colors = ['#003f5c', '#58508d', '#bc5090', '#ff6361']
-        bars = plt.bar(df_agg['Mapa'], df_agg[metric_col], color=colors[:len(df_agg)])
-        
-        plt.title(title, fontsize=16)
-        plt.ylabel('Melhoria Percentual (%)', fontsize=12)
-        plt.xlabel('Cenário (Mapa)', fontsize=12)
-        plt.xticks(rotation=10, ha='right')
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-        
-        for bar in bars:
-            yval = bar.get_height()
-            offset = max(yval * 0.01, 0.5)
-            plt.text(bar.get_x() + bar.get_width()/2.0, yval + offset, f'{yval:.2f}%', ha='center', va='bottom')
-
-        plt.tight_layout()
-        img_path = f"temp_{filename}.png"
-        plt.savefig(img_path)
-        plt.close()
-        
-        # 2. Define as alturas e faz a verificação de página
+    def add_comparison_chart(self, title, img_path):
+        """ Insere um gráfico de barras já desenhado, sem deixar o título órfão no fim da página. """
+        # 1. Define as alturas e faz a verificação de página
         title_height = 10
         padding = 5
         img_w = 180
@@ -209,7 +136,7 @@ class PDF(FPDF):
         if self.get_y() + total_height > self.h - self.b_margin: 
             self.add_page()
         
-        # 3. Agora desenha o Título e o Gráfico, sabendo que cabem
+        # 2. Agora desenha o Título e o Gráfico, sabendo que cabem
         self.set_font('DejaVu', 'B', 16)
         self.cell(0, title_height, title, 
                   border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
@@ -221,6 +148,13 @@ class PDF(FPDF):
         self.ln(5)
 
 # --- Funções de Processamento de Dados ---
+def summary_table(df_agg):
+    """ Retorna (células formatadas com '%', rótulos das linhas) da tabela de resumo, com a linha de média geral. """
+    df_for_table = df_agg.set_index('Mapa')[[column for column, _, _ in TABLE_COLUMNS]].copy()
+    df_for_table.loc['MÉDIA GERAL'] = df_for_table.mean()
+    df_for_table = df_for_table.map(lambda x: f'{x:.2f}%')
+    return df_for_table.values.tolist(), df_for_table.index.tolist()
+
 def processar_dados_mapa(mapa_nome, mapa_path):
     """ Carrega dados de um mapa e calcula métricas resumidas. """
     path_q = os.path.join(mapa_path, "relatorios") 
@@ -295,12 +229,18 @@ def processar_dados_mapa(mapa_nome, mapa_path):
         return None
 
 # --- Função Principal ---
-def main():
+def main(scenarios=None):
+    """ Gera o PDF com os cenários escolhidos (padrão: todos); roda na raiz do projeto. """
+    if not os.path.exists(FONT_PATH):
+        print(f"ERRO: Arquivo de fonte '{FONT_PATH}' não encontrado.")
+        print("Por favor, copie o arquivo 'DejaVuSans.ttf' para a raiz do projeto.")
+        return
     print("Iniciando geração do relatório comparativo geral...")
+    mapas = {nome: pasta for nome, pasta in MAP_DIRS.items() if scenarios is None or pasta in scenarios}
     
     # 1. Coletar dados de todos os mapas
     todos_resultados = []
-    for mapa_nome, mapa_path in MAP_DIRS.items():
+    for mapa_nome, mapa_path in mapas.items():
         print(f"Processando dados de: {mapa_nome} (Pasta: {mapa_path})")
         metricas = processar_dados_mapa(mapa_nome, mapa_path)
         if metricas:
@@ -314,64 +254,31 @@ def main():
     
     # 2. Gerar PDF em modo Paisagem (Landscape)
     pdf = PDF(orientation='L', unit='mm', format='A4')
-    pdf.add_title_page()
-    
-    # 3. Adicionar Tabela Resumo (AGORA COMO IMAGEM)
-    pdf.add_table_as_image(df_agregado)
-    
-    # 4. Adicionar Gráficos Comparativos (Dois por página)
-    pdf.add_page()
-    pdf.add_comparison_chart(df_agregado, 
-                             'Melhora Espera Global', 
-                             'Comparativo: Redução Tempo de Espera (Global)', 
-                             'melhora_espera_global')
+    pdf.add_title_page(mapas)
     
-    pdf.add_comparison_chart(df_agregado, 
-                             'Melhora Paradas Globais', 
-                             'Comparativo: Redução Total de Paradas (Global)', 
-                             'melhora_paradas_global')
-    
-    pdf.add_page()
-    pdf.add_comparison_chart(df_agregado, 
-                             'Melhora Espera Prioritarios', 
-                             'Comparativo: Redução Tempo de Espera (Veículos Prioritários)', 
-                             'melhora_espera_prioritarios')
-
-    pdf.add_comparison_chart(df_agregado, 
-                             'Melhora Paradas Prioritarios', 
-                             'Comparativo: Redução Total de Paradas (Veículos Prioritários)', 
-                             'melhora_paradas_prioritarios')
-                             
-    pdf.add_page()
-    pdf.add_comparison_chart(df_agregado, 
-                             'Melhora Espera Emergency', 
-                             'Comparativo: Redução Tempo de Espera (Emergência)', 
-                             'melhora_sem_espera_emergency') # Nome de arquivo único
-                             
-    pdf.add_comparison_chart(df_agregado, 
-                             'Melhora Espera Authority', 
-                             'Comparativo: Redução Tempo de Espera (Autoridade)', 
-                             'melhora_espera_authority')
+    # 3. Desenhar a tabela e os gráficos em paralelo, cada um com o seu nome de arquivo
+    print("📊 Gerando tabela de resumo e gráficos comparativos...")
+    cell_text, row_labels = summary_table(df_agregado)
+    tasks = [(plot_summary_table, (cell_text, row_labels, [label for _, label, _ in TABLE_COLUMNS],
+                                   [width for _, _, width in TABLE_COLUMNS], TABLE_IMAGE))]
+    for page in COMPARISON_PAGES:
+        for column, title, filename in page:
+            tasks.append((plot_improvement_bars, (df_agregado['Mapa'].tolist(), df_agregado[column].tolist(),
+                                                  title, f"temp_{filename}.png")))
+    render(tasks, PLOT_WORKERS)
 
-    pdf.add_page()
-    pdf.add_comparison_chart(df_agregado, 
-                             'Melhora Velocidade Global', 
-                             'Comparativo: Aumento Velocidade Média (Global)', 
-                             'melhora_velocidade_global')
+    # 4. Adicionar Tabela Resumo e Gráficos Comparativos (Dois por página)
+    pdf.add_table_as_image(TABLE_IMAGE)
+    for page in COMPARISON_PAGES:
+        pdf.add_page()
+        for column, title, filename in page:
+            pdf.add_comparison_chart(title, f"temp_{filename}.png")
 
     # 5. Salvar PDF
     try:
         pdf.output(OUTPUT_FILENAME)
         print(f"✅ Relatório comparativo geral salvo como '{OUTPUT_FILENAME}'")
-        print(f"✅ Tabela de resumo salva como 'tabela_resumo_geral.png'")
+        print(f"✅ Tabela de resumo salva como '{TABLE_IMAGE}'")
     except Exception as e:
         print(f"ERRO AO SALVAR O PDF: {e}")
         print("Verifique se o arquivo PDF não está aberto em outro programa.")
-
-
-if __name__ == "__main__":
-    if not os.path.exists(FONT_PATH):
-        print(f"ERRO: Arquivo de fonte '{FONT_PATH}' não encontrado.")
-        print("Por favor, copie o arquivo 'DejaVuSans.ttf' para o mesmo diretório deste script.")
-    else:
-        main()
\ No newline at end of file
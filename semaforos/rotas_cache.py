@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Pré-roteamento das viagens de cada cenário com o duarouter.
+
+Os .rou.xml definem <trip> com from/to/via, e o SUMO calcula a rota de cada veículo na inserção,
+em todo episódio. Aqui as viagens são roteadas uma única vez e guardadas em cache_rotas/, com o nome
+derivado do hash da rede e das viagens; qualquer alteração em um dos dois gera um novo arquivo.
+
+Os scripts de treinamento e avaliação usam `cached_route_args` ao montar o comando do SUMO, então o
+cache é criado automaticamente na primeira execução. Para pré-gerar todos os cenários:
+    python -m semaforos.rotas_cache
+"""
+import hashlib
+import os
+import subprocess
+import sys
+
+from .cenarios import SCENARIOS, read_sumocfg, scenario_cfg
+
+CACHE_FOLDER = "cache_rotas"
+
+def file_hash(*paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+def cached_route_file(cfg_path):
+    """ Caminho do arquivo de rotas pré-calculadas; gera com o duarouter se ainda não existir. """
+    net_file, route_file = read_sumocfg(cfg_path)
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(cfg_path)), CACHE_FOLDER)
+    stem = os.path.basename(route_file).replace(".rou.xml", "")
+    cached = os.path.join(cache_dir, f"{stem}_{file_hash(net_file, route_file)}.rou.xml")
+    if os.path.exists(cached):
+        return cached
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # Arquivos temporários por processo: treinos paralelos podem gerar o mesmo cache ao mesmo tempo
+    alternatives = cached.replace(".rou.xml", f".{os.getpid()}.rou.alt.xml")
+    partial = f"{cached}.{os.getpid()}.tmp"
+    cmd = ["duarouter", "-n", net_file, "-r", route_file, "-o", partial,
+           "--alternatives-output", alternatives, "--ignore-errors", "--no-step-log", "--no-warnings"]
+    print(f"🧭 Pré-calculando rotas de '{os.path.basename(route_file)}' com o duarouter...")
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if os.path.exists(alternatives):
+        os.remove(alternatives)
+    if result.returncode != 0:
+        sys.exit(f"ERRO no duarouter:\n{result.stderr}")
+    # Renomeia só no fim para que um processo concorrente nunca leia um arquivo pela metade
+    os.replace(partial, cached)
+    print(f"✅ Rotas salvas em '{cached}'.")
+    return cached
+
+def cached_route_args(cfg_path):
+    """ Opções do SUMO que substituem as <trip> do .sumocfg pelas rotas pré-calculadas. """
+    return ["--route-files", cached_route_file(cfg_path)]
+
+def main():
+    scenarios = sys.argv[1:] or list(SCENARIOS)
+    for scenario in scenarios:
+        if scenario not in SCENARIOS:
+            print(f"ERRO: Cenário desconhecido '{scenario}'. Opções: {', '.join(SCENARIOS)}")
+            continue
+        cached_route_file(scenario_cfg(scenario))
+
+if __name__ == "__main__":
+    main()
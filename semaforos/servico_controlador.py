@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Serviço asyncio que decide as fases de vários semáforos ao mesmo tempo.
+
+Cada cruzamento envia, a cada segundo, um retrato dos detectores (veículos parados e classes dos
+veículos em cada grupo de fases) por um socket local, uma linha JSON por mensagem. O serviço aplica
+a mesma lógica de simulacao_Qlearning.run_simulation — interrupção por veículo prioritário, decisão
+gulosa a cada GREEN_DURATION e transição com amarelo e, se a rede tiver, vermelho geral — usando a política
+compilada de cada cruzamento (politica_compilada.py), e responde com o comando de fase. Retratos com
+contagens negativas, fracionárias ou com o número errado de grupos são recusados com uma mensagem de erro.
+
+Mensagens (uma por linha):
+    -> {"tipo": "listar"}
+    <- {"cruzamentos": {"<id>": <número de grupos>, ...}}
+    -> {"tipo": "retrato", "cruzamento": "<id>", "parados": [3, 7], "classes": [["passenger"], ["emergency"]]}
+    <- {"cruzamento": "<id>", "fase": 1, "acao": 0, "amarelo": true, "motivo": "prioridade", "latencia_us": 42.0}
+       ("amarelo" vale true durante toda a transição, inclusive no vermelho geral)
+    -> {"tipo": "metricas"}
+    <- {"requisicoes": ..., "media_us": ..., "p50_us": ..., "p95_us": ..., "p99_us": ..., "max_us": ...}
+
+Uso:
+    python -m semaforos.servico_controlador servir --politica Prox_Samur/politica_prox_samur.pol --replicas 50
+    python -m semaforos.servico_controlador alimentar --segundos 300
+    python -m semaforos.servico_controlador demo --politica Prox_Samur/politica_prox_samur.pol --replicas 50
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from .politica_compilada import PRIORITY_LEVELS, CompiledPolicy, queue_levels
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_LATENCY_SAMPLES = 100_000
+
+# --- Regras de decisão (as mesmas dos scripts de simulação) ---
+def check_snapshot(halting, classes, num_groups):
+    """ Mensagem de erro de um retrato malformado, ou None se ele puder ser usado. """
+    if not isinstance(halting, list) or len(halting) != num_groups:
+        return f"esperados {num_groups} grupos em 'parados'"
+    if any(isinstance(h, bool) or not isinstance(h, int) or h < 0 for h in halting):
+        return f"'parados' deve ter só inteiros não negativos: {halting}"
+    if (not isinstance(classes, list) or len(classes) != num_groups
+            or not all(isinstance(group, list) and all(isinstance(c, str) for c in group) for group in classes)):
+        return f"esperadas {num_groups} listas de classes em 'classes'"
+    return None
+
+def priority_action(halting, classes):
+    """ Equivalente a get_priority_action, com os níveis de PRIORITY_LEVELS, só em grupos com fila. """
+    best_action, best_level = None, 0
+    for action, (stopped, vehicle_classes) in enumerate(zip(halting, classes)):
+        if stopped <= 0:
+            continue
+        level = max((PRIORITY_LEVELS.get(v_class, 0) for v_class in vehicle_classes), default=0)
+        if level > best_level:
+            best_action, best_level = action, level
+    return best_action
+
+class IntersectionController:
+    """ Máquina de estados de um cruzamento: fase verde atual, tempo de verde e transição da política. """
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.green_duration = policy.metadata.get("green_duration", 15)
+        self.current_action = 0
+        self.phase_timer = 0
+        # Fase de cada segundo que falta da transição em andamento (amarelo e vermelho geral)
+        self.transition = []
+        self.next_action = None
+
+    def _command(self, reason, phase=None):
+        yellow = phase is not None
+        if phase is None:
+            phase = self.policy.action_to_phase[self.current_action]
+        return {"fase": phase, "acao": self.current_action, "amarelo": yellow, "motivo": reason}
+
+    def _start_transition(self, action, reason):
+        self.next_action = action
+        # Mesmo plano de simulacao_Qlearning: cada fase de TRANSITIONS pela sua duração
+        self.transition = [phase for phase, seconds in self.policy.transitions.get(self.current_action, [])
+                           for _ in range(seconds)]
+        if not self.transition:
+            return self._switch(reason)
+        return self._command(reason, self.transition.pop(0))
+
+    def _switch(self, reason):
+        self.current_action, self.next_action = self.next_action, None
+        self.phase_timer = 1
+        return self._command(reason)
+
+    def step(self, halting, classes):
+        """ Processa um retrato de 1 s e retorna o comando de fase para o próximo segundo. """
+        if self.next_action is not None:
+            if self.transition:
+                phase = self.transition.pop(0)
+                return self._command("amarelo" if phase in self.policy.action_to_yellow.values() else "vermelho_geral", phase)
+            return self._switch("troca")
+
+        priority = priority_action(halting, classes)
+        if priority is not None and priority != self.current_action:
+            return self._start_transition(priority, "prioridade")
+
+        if self.phase_timer >= self.green_duration:
+            action = self.policy.action(queue_levels(halting))
+            if action != self.current_action:
+                return self._start_transition(action, "q-learning")
+            self.phase_timer = 0
+            return self._command("q-learning")
+
+        self.phase_timer += 1
+        return self._command("verde")
+
+class LatencyStats:
+    def __init__(self):
+        self.samples = []
+        self.count = 0
+
+    def add(self, seconds):
+        self.count += 1
+        if len(self.samples) < MAX_LATENCY_SAMPLES:
+            self.samples.append(seconds * 1e6)
+        else:
+            # Amostragem de reservatório: mantém a distribuição com memória limitada
+            index = random.randrange(self.count)
+            if index < MAX_LATENCY_SAMPLES:
+                self.samples[index] = seconds * 1e6
+
+    def summary(self):
+        if not self.samples:
+            return {"requisicoes": 0}
+        ordered = sorted(self.samples)
+        def percentile(p):
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+        return {
+            "requisicoes": self.count,
+            "media_us": sum(ordered) / len(ordered),
+            "p50_us": percentile(0.50),
+            "p95_us": percentile(0.95),
+            "p99_us": percentile(0.99),
+            "max_us": ordered[-1],
+        }
+
+def format_stats(title, stats):
+    if not stats.get("requisicoes"):
+        return f"{title}: nenhuma requisição."
+    return (f"{title}: {stats['requisicoes']} requisições — média {stats['media_us']:.1f} µs, "
+            f"p50 {stats['p50_us']:.1f} µs, p95 {stats['p95_us']:.1f} µs, p99 {stats['p99_us']:.1f} µs, "
+            f"máx {stats['max_us']:.1f} µs")
+
+# --- Servidor ---
+class ControllerService:
+    def __init__(self, policy_files, replicas=1):
+        self.controllers = {}
+        for path in policy_files:
+            policy = CompiledPolicy.load(path)
+            base_id = policy.metadata.get("traffic_light_id", path)
+            for replica in range(replicas):
+                intersection_id = base_id if replicas == 1 else f"{base_id}#{replica}"
+                self.controllers[intersection_id] = IntersectionController(policy)
+        self.latency = LatencyStats()
+        self.active_clients = set()
+
+    def handle_message(self, message):
+        # json.loads aceita qualquer valor JSON; só objetos são mensagens (o erro vira resposta em handle_client)
+        if not isinstance(message, dict):
+            raise ValueError(f"esperado um objeto JSON, recebido {type(message).__name__}")
+        kind = message.get("tipo")
+        if kind == "retrato":
+            intersection_id = message.get("cruzamento")
+            controller = self.controllers.get(intersection_id)
+            if controller is None:
+                return {"erro": f"cruzamento desconhecido: {intersection_id}"}
+            halting = message["parados"]
+            classes = message.get("classes") or [[] for _ in range(controller.policy.num_actions)]
+            error = check_snapshot(halting, classes, controller.policy.num_actions)
+            if error is not None:
+                return {"erro": error}
+            response = controller.step(halting, classes)
+            response["cruzamento"] = intersection_id
+            return response
+        if kind == "listar":
+            return {"cruzamentos": {cid: c.policy.num_actions for cid, c in self.controllers.items()}}
+        if kind == "metricas":
+            return self.latency.summary()
+        return {"erro": f"tipo de mensagem desconhecido: {kind}"}
+
+    async def handle_client(self, reader, writer):
+        self.active_clients.add(asyncio.current_task())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                start = time.perf_counter()
+                try:
+                    response = self.handle_message(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    response = {"erro": f"mensagem inválida: {e}"}
+                elapsed = time.perf_counter() - start
+                if "fase" in response:
+                    self.latency.add(elapsed)
+                    response["latencia_us"] = elapsed * 1e6
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionResetError:
+            pass
+        finally:
+            self.active_clients.discard(asyncio.current_task())
+            writer.close()
+
+    async def serve(self, host, port, socket_path=None):
+        if socket_path:
+            server = await asyncio.start_unix_server(self.handle_client, path=socket_path)
+            where = socket_path
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+            where = f"{host}:{port}"
+        print(f"🚦 Serviço controlando {len(self.controllers)} cruzamentos em {where}")
+        return server
+
+# --- Alimentador simulado (cliente de teste) ---
+async def open_connection(host, port, socket_path=None):
+    if socket_path:
+        return await asyncio.open_unix_connection(socket_path)
+    return await asyncio.open_connection(host, port)
+
+async def request(reader, writer, message):
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+async def feed_intersection(intersection_id, num_groups, seconds, tick, host, port, socket_path, round_trip, seed):
+    """ Detectores sintéticos: filas em passeio aleatório e veículos prioritários ocasionais. """
+    rng = random.Random(seed)
+    reader, writer = await open_connection(host, port, socket_path)
+    halting = [rng.randint(0, 6) for _ in range(num_groups)]
+    green_action = 0
+    for _ in range(seconds):
+        for group in range(num_groups):
+            # Grupo com verde escoa a fila; os demais acumulam chegadas
+            delta = rng.choice((-3, -2, -1, 0)) if group == green_action else rng.choice((0, 0, 1, 1, 2))
+            halting[group] = max(0, min(30, halting[group] + delta))
+        classes = [["passenger"] * min(h, 3) for h in halting]
+        if rng.random() < 0.02:
+            group = rng.randrange(num_groups)
+            halting[group] = max(halting[group], 1)
+            classes[group].append(rng.choice(("emergency", "authority")))
+        start = time.perf_counter()
+        response = await request(reader, writer, {"tipo": "retrato", "cruzamento": intersection_id,
+                                                  "parados": halting, "classes": classes})
+        round_trip.add(time.perf_counter() - start)
+        if not response.get("amarelo", True):
+            green_action = response["acao"]
+        if tick:
+            await asyncio.sleep(tick)
+    writer.close()
+    await writer.wait_closed()
+
+async def run_feed(host, port, socket_path, seconds, tick, seed):
+    reader, writer = await open_connection(host, port, socket_path)
+    intersections = (await request(reader, writer, {"tipo": "listar"}))["cruzamentos"]
+    print(f"📡 Alimentando {len(intersections)} cruzamentos por {seconds} s simulados...")
+    round_trip = LatencyStats()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        feed_intersection(cid, groups, seconds, tick, host, port, socket_path, round_trip, seed + i)
+        for i, (cid, groups) in enumerate(intersections.items())
+    ))
+    elapsed = time.perf_counter() - start
+    server_stats = await request(reader, writer, {"tipo": "metricas"})
+    writer.close()
+    await writer.wait_closed()
+    print(format_stats("⏱️ Processamento no serviço", server_stats))
+    print(format_stats("⏱️ Ida e volta no cliente", round_trip.summary()))
+    print(f"   Vazão: {round_trip.count / elapsed:.0f} decisões/s em {elapsed:.2f} s")
+
+async def run_demo(args):
+    service = ControllerService(args.politica, args.replicas)
+    server = await service.serve(args.host, args.porta, args.socket)
+    async with server:
+        await run_feed(args.host, args.porta, args.socket, args.segundos, args.intervalo, args.semente)
+        # Espera as conexões do alimentador terminarem antes de desligar o servidor
+        if service.active_clients:
+            await asyncio.wait(service.active_clients)
+
+async def run_server(args):
+    service = ControllerService(args.politica, args.replicas)
+    server = await service.serve(args.host, args.porta, args.socket)
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço asyncio de controle de vários semáforos.")
+    parser.add_argument("modo", choices=("servir", "alimentar", "demo"))
+    parser.add_argument("--politica", action="append", default=[], help="Política compilada (.pol); repita para vários cruzamentos")
+    parser.add_argument("--replicas", type=int, default=1, help="Cópias de cada política, para testes de carga")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--porta", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", help="Usa um socket Unix neste caminho no lugar de TCP")
+    parser.add_argument("--segundos", type=int, default=300, help="Segundos simulados por cruzamento no alimentador")
+    parser.add_argument("--intervalo", type=float, default=0.0, help="Pausa real entre retratos (0 = o mais rápido possível)")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.modo in ("servir", "demo") and not args.politica:
+        parser.error("informe ao menos uma --politica (gere com 'python -m semaforos.politica_compilada')")
+    try:
+        if args.modo == "servir":
+            asyncio.run(run_server(args))
+        elif args.modo == "alimentar":
+            asyncio.run(run_feed(args.host, args.porta, args.socket, args.segundos, args.intervalo, args.semente))
+        else:
+            asyncio.run(run_demo(args))
+    except KeyboardInterrupt:
+        print("\n🛑 Serviço encerrado.")
+
+if __name__ == "__main__":
+    main()
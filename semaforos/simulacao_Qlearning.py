@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import traci
+import hashlib
 import pickle
 import os
 import sys
@@ -13,30 +14,35 @@ if 'SUMO_HOME' in os.environ:
 else:
     sys.exit("please declare environment variable 'SUMO_HOME'")
 
+from .rotas_cache import cached_route_args
+from .politica_compilada import CompiledPolicy, policy_file_for
+from .cenarios import SCENARIOS, scenario_being_loaded, scenario_cfg
+from .fases import phase_plan, transition_phases
+
+# --- Cenário: o script é carregado uma vez por cenário (cenarios.load_scenario_module), que define o que muda entre eles ---
+SCENARIO = scenario_being_loaded()
+
 # --- Configurações ---
-SUMO_CFG_FILE = "Prox_BatalhaoPolicia.sumocfg"
-TRAFFIC_LIGHT_ID = "2078102664"
-Q_TABLE_FILE = "q_table_prox_batalhao.pkl"
+SUMO_CFG_FILE = scenario_cfg(SCENARIO)
+TRAFFIC_LIGHT_ID = SCENARIOS[SCENARIO]["semaforo"]
+Q_TABLE_FILE = f"q_table_{SCENARIOS[SCENARIO]['sufixo']}.pkl"
+# Política gerada por 'python -m semaforos.politica_compilada'; tem prioridade sobre a Q-table quando está atualizada
+POLICY_FILE = policy_file_for(Q_TABLE_FILE)
 OUTPUT_FOLDER = "resultados_qlearning"
+SUMO_BINARY = "sumo-gui"  # "sumo" roda sem interface (python -m semaforos avaliar --sem-interface)
 
 GREEN_DURATION = 15
 YELLOW_DURATION = 4
 
-ACTION_TO_PHASE = {0: 0, 1: 2}
+# Fases do semáforo, lidas do <tlLogic> da rede (semaforos/fases.py)
+PHASE_PLAN = phase_plan(SCENARIO)
+ACTION_TO_PHASE = dict(enumerate(PHASE_PLAN["verdes"]))
 NUM_ACTIONS = len(ACTION_TO_PHASE)
+TRANSITIONS = transition_phases(PHASE_PLAN, YELLOW_DURATION)
+PHASE_LANES = dict(enumerate(PHASE_PLAN["faixas"]))
+CONTROLLED_LANES = PHASE_PLAN["faixas_controladas"]
 
 # --- Funções Auxiliares ---
-def get_controlled_lanes_by_phase(tl_id):
-    logic = traci.trafficlight.getAllProgramLogics(tl_id)[0]
-    lanes = traci.trafficlight.getControlledLanes(tl_id)
-    phase_lanes = defaultdict(list)
-    for i, phase in enumerate(logic.phases):
-        if 'G' in phase.state or 'g' in phase.state:
-            for j, state_char in enumerate(phase.state):
-                if state_char in ('G', 'g'):
-                    lane = lanes[j]
-                    if lane not in phase_lanes[i]: phase_lanes[i].append(lane)
-    return {action: phase_lanes.get(phase_idx, []) for action, phase_idx in ACTION_TO_PHASE.items()}
 
 def get_state(phase_controlled_lanes):
     state = []
@@ -67,7 +73,7 @@ def collect_metrics(sim_time, lists):
      total_paradas_prioritarios_por_tempo, tempo_espera_prioritarios_por_tempo, 
      velocidade_media_prioritarios_por_tempo) = lists
 
-    carros_parados_tls = sum(traci.lane.getLastStepHaltingNumber(l) for l in traci.trafficlight.getControlledLanes(TRAFFIC_LIGHT_ID))
+    carros_parados_tls = sum(traci.lane.getLastStepHaltingNumber(l) for l in CONTROLLED_LANES)
     carros_parados_por_tempo.append({'tempo': sim_time, 'carros_parados': carros_parados_tls})
     
     vehicle_ids = traci.vehicle.getIDList()
@@ -75,7 +81,7 @@ def collect_metrics(sim_time, lists):
     total_tempo_espera = sum(traci.vehicle.getWaitingTime(vid) for vid in vehicle_ids)
     velocidades = [traci.vehicle.getSpeed(vid) for vid in vehicle_ids if traci.vehicle.getSpeed(vid) > 0]
     velocidade_media = sum(velocidades) / len(velocidades) if velocidades else 0
-    densidades = [(traci.lane.getLastStepVehicleNumber(l) / traci.lane.getLength(l)) * 1000 for l in traci.trafficlight.getControlledLanes(TRAFFIC_LIGHT_ID) if traci.lane.getLength(l) > 0]
+    densidades = [(traci.lane.getLastStepVehicleNumber(l) / traci.lane.getLength(l)) * 1000 for l in CONTROLLED_LANES if traci.lane.getLength(l) > 0]
     densidade_media = sum(densidades) / len(densidades) if densidades else 0
 
     emergency_ids = [v for v in vehicle_ids if traci.vehicle.getVehicleClass(v) == "emergency"]
@@ -105,21 +111,36 @@ def collect_metrics(sim_time, lists):
     tempo_espera_prioritarios_por_tempo.append({'tempo': sim_time, 'tempo_espera_prioritarios': tempo_espera_prioritarios})
     velocidade_media_prioritarios_por_tempo.append({'tempo': sim_time, 'velocidade_media_prioritarios': velocidade_media_prioritarios})
 
-def run_simulation(max_steps=5400):
-    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-    print(f"📁 Pasta '{OUTPUT_FOLDER}' pronta.")
-    print("Iniciando simulação com controle Q-learning (modo avaliação).")
-    
-    try:
-        with open(Q_TABLE_FILE, "rb") as f: q_table = pickle.load(f)
-        print("✅ Q-table carregada com sucesso.")
-    except FileNotFoundError:
-        print(f"⚠️ Arquivo '{Q_TABLE_FILE}' não encontrado. Usando estratégia aleatória.")
-        q_table = defaultdict(lambda: np.zeros(NUM_ACTIONS))
-
-    traci.start(["sumo-gui", "-c", SUMO_CFG_FILE, "--step-length", "1.0"])
+def load_policy():
+    """ Carrega a política compilada se ela corresponder à Q-table atual; senão retorna None. """
+    if not os.path.exists(POLICY_FILE):
+        return None
+    policy = CompiledPolicy.load(POLICY_FILE)
+    if os.path.exists(Q_TABLE_FILE):
+        with open(Q_TABLE_FILE, "rb") as f:
+            if hashlib.sha256(f.read()).hexdigest() != policy.metadata.get("q_table_sha256"):
+                print(f"⚠️ Política '{POLICY_FILE}' desatualizada em relação à Q-table; usando a Q-table.")
+                return None
+    return policy
+
+def greedy_choice(q_table):
+    """ Escolha gulosa (argmax) sobre a Q-table, no formato usado por simulate(). """
+    return lambda state: np.argmax(q_table.get(state, np.zeros(NUM_ACTIONS)))
+
+def summarize_metrics(lists):
+    """ Média no tempo de cada métrica do collect_metrics; um número por métrica para comparar políticas. """
+    summary = {}
+    for rows in lists:
+        if rows:
+            frame = pd.DataFrame(rows)
+            summary.update(frame.drop(columns='tempo').mean().to_dict())
+    return summary
+
+def simulate(sumo_cmd, choose, max_steps=5400):
+    """ Roda a política `choose(estado) -> ação` numa simulação nova; retorna (listas de métricas, passos). """
+    traci.start(sumo_cmd)
     total_sim_steps = 0
-    phase_lanes = get_controlled_lanes_by_phase(TRAFFIC_LIGHT_ID)
+    phase_lanes = PHASE_LANES
     lists = [[] for _ in range(11)]
     current_action = 0
     current_phase = ACTION_TO_PHASE[current_action]
@@ -137,10 +158,9 @@ def run_simulation(max_steps=5400):
             state = get_state(phase_lanes)
             previous_action = current_action # GUARDA A AÇÃO ATUAL
             # No modo avaliação, sempre pega a melhor ação (argmax)
-            action_to_take = np.argmax(q_table.get(state, np.zeros(NUM_ACTIONS)))
+            action_to_take = choose(state)
             action_chosen_this_step = True
 
-            # --- INÍCIO DA ALTERAÇÃO ---
             if action_to_take == previous_action:
                 # A ação escolhida é a mesma que a atual, reinicia o timer e pula a transição
                 phase_timer = 0
@@ -148,7 +168,6 @@ def run_simulation(max_steps=5400):
                 total_sim_steps += 1
                 collect_metrics(total_sim_steps, lists) # Coleta métricas para este passo
                 continue # Pula o resto do loop e vai para a próxima iteração
-            # --- FIM DA ALTERAÇÃO ---
 
         else: # Se não há prioridade e phase_timer < GREEN_DURATION
             traci.simulationStep()
@@ -158,16 +177,16 @@ def run_simulation(max_steps=5400):
             continue # Pula o resto do loop e vai para a próxima iteração
 
         # ----- Se chegou aqui, uma AÇÃO DIFERENTE foi escolhida (ou por prioridade ou por Q-learning) -----
-        # Executa a transição com amarelo
-        yellow_phase = current_phase + 1
-        traci.trafficlight.setPhase(TRAFFIC_LIGHT_ID, yellow_phase)
-        for _ in range(YELLOW_DURATION):
-            # Verifica se a simulação deve continuar dentro do loop amarelo
-            if not (traci.simulation.getMinExpectedNumber() > 0 and total_sim_steps < max_steps):
-                break
-            traci.simulationStep()
-            total_sim_steps += 1
-            collect_metrics(total_sim_steps, lists)
+        # Executa a transição com amarelo (e vermelho geral, se a rede tiver)
+        for phase, duration in TRANSITIONS[current_action]:
+            traci.trafficlight.setPhase(TRAFFIC_LIGHT_ID, phase)
+            for _ in range(duration):
+                # Verifica se a simulação deve continuar dentro do loop amarelo
+                if not (traci.simulation.getMinExpectedNumber() > 0 and total_sim_steps < max_steps):
+                    break
+                traci.simulationStep()
+                total_sim_steps += 1
+                collect_metrics(total_sim_steps, lists)
         # Verifica novamente após o loop amarelo
         if not (traci.simulation.getMinExpectedNumber() > 0 and total_sim_steps < max_steps):
             break
@@ -185,10 +204,10 @@ def run_simulation(max_steps=5400):
             collect_metrics(total_sim_steps, lists)
             continue
 
-        yellow_phase = current_phase + 1
-        traci.trafficlight.setPhase(TRAFFIC_LIGHT_ID, yellow_phase)
-        for _ in range(YELLOW_DURATION):
-            traci.simulationStep(); total_sim_steps += 1; collect_metrics(total_sim_steps, lists)
+        for phase, duration in TRANSITIONS[current_action]:
+            traci.trafficlight.setPhase(TRAFFIC_LIGHT_ID, phase)
+            for _ in range(duration):
+                traci.simulationStep(); total_sim_steps += 1; collect_metrics(total_sim_steps, lists)
         
         current_action = action_to_take
         current_phase = ACTION_TO_PHASE[current_action]
@@ -196,6 +215,27 @@ def run_simulation(max_steps=5400):
         phase_timer = 0
         
     traci.close()
+    return lists, total_sim_steps
+
+def run_simulation(max_steps=5400):
+    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+    print(f"📁 Pasta '{OUTPUT_FOLDER}' pronta.")
+    print("Iniciando simulação com controle Q-learning (modo avaliação).")
+    
+    policy = load_policy()
+    if policy is not None:
+        print("✅ Política compilada carregada com sucesso.")
+    else:
+        try:
+            with open(Q_TABLE_FILE, "rb") as f: q_table = pickle.load(f)
+            print("✅ Q-table carregada com sucesso.")
+        except FileNotFoundError:
+            print(f"⚠️ Arquivo '{Q_TABLE_FILE}' não encontrado. Usando estratégia aleatória.")
+            q_table = defaultdict(lambda: np.zeros(NUM_ACTIONS))
+
+    choose = policy.action if policy is not None else greedy_choice(q_table)
+    sumo_cmd = [SUMO_BINARY, "-c", SUMO_CFG_FILE, "--step-length", "1.0"] + cached_route_args(SUMO_CFG_FILE)
+    lists, total_sim_steps = simulate(sumo_cmd, choose, max_steps)
     print(f"✅ Simulação finalizada com {total_sim_steps} passos.")
 
     # Salva os dados
@@ -218,6 +258,3 @@ def run_simulation(max_steps=5400):
         pd.DataFrame(dados).to_csv(caminho_arquivo, index=False)
 
     print(f"📁 Resultados salvos na pasta '{OUTPUT_FOLDER}'.")
-
-if __name__ == "__main__":
-    run_simulation()
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Q-table densa: uma linha por estado codificado (6 ** NUM_ACTIONS linhas, como em politica_compilada.py) e uma
+coluna por ação, com a mesma interface de dicionário que o run_episode dos scripts de treinamento usa.
+
+Compartilhada pelos treinos paralelo, distribuído e generalizado e pelo planejamento do Dyna-Q.
+"""
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .politica_compilada import STATE_LEVELS, decode_state, encode_state
+
+class DenseQTable:
+    """ Q-table densa (uma linha por estado codificado) com a interface de dicionário usada por run_episode. """
+
+    def __init__(self, num_actions, buffer=None, dtype=np.float64):
+        self.num_actions = num_actions
+        self.dtype = np.dtype(dtype)
+        num_states = STATE_LEVELS ** num_actions
+        values_size = num_states * num_actions * self.dtype.itemsize
+        if buffer is None:
+            buffer = bytearray(self.buffer_size(num_actions, dtype))
+        self.values = np.ndarray((num_states, num_actions), dtype=self.dtype, buffer=buffer)
+        self.visited = np.ndarray(num_states, dtype=np.bool_, buffer=buffer, offset=values_size)
+
+    @staticmethod
+    def buffer_size(num_actions, dtype=np.float64):
+        """ Bytes ocupados pelos valores (float64 na Q-table, int64 nas contagens) e pelas marcas de estado visitado. """
+        num_states = STATE_LEVELS ** num_actions
+        return num_states * num_actions * np.dtype(dtype).itemsize + num_states
+
+    def __getitem__(self, state):
+        # Devolve uma visão da linha: `q_table[state][acao] = valor` escreve direto no buffer
+        index = encode_state(state)
+        self.visited[index] = True
+        return self.values[index]
+
+    def get(self, state, default=None):
+        index = encode_state(state)
+        return self.values[index] if self.visited[index] else default
+
+    def __len__(self):
+        return int(self.visited.sum())
+
+    def keys(self):
+        # Com keys() e __getitem__, dict(q_table) funciona como no defaultdict do treino serial
+        return [decode_state(int(index), self.num_actions) for index in np.flatnonzero(self.visited)]
+
+    def snapshot(self):
+        """ Cópia da tabela no formato dos .pkl ({estado: valores}), feita sem parar os trabalhadores. """
+        visited = np.flatnonzero(self.visited)
+        values = self.values[visited].copy()
+        return {decode_state(int(index), self.num_actions): row for index, row in zip(visited, values)}
+
+    def to_bytes(self):
+        return self.values.tobytes() + self.visited.tobytes()
+
+    def load_bytes(self, data):
+        other = DenseQTable(self.num_actions, bytearray(data), self.dtype)
+        self.values[:] = other.values
+        self.visited[:] = other.visited
+
+class SharedQTable(DenseQTable):
+    """ DenseQTable guardada em multiprocessing.shared_memory, visível por todos os processos. """
+
+    def __init__(self, num_actions, name=None, dtype=np.float64):
+        if name is None:
+            # Memória nova já vem zerada, o mesmo valor inicial do defaultdict do treino serial
+            self.shm = shared_memory.SharedMemory(create=True, size=self.buffer_size(num_actions, dtype))
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        super().__init__(num_actions, self.shm.buf, dtype)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        # As visões NumPy precisam ser liberadas antes de fechar o buffer
+        del self.values, self.visited
+        self.shm.close()
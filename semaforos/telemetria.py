@@ -0,0 +1,126 @@
+"""
+Telemetria do treino (TELEMETRY = True no treinamento_Qlearning.py): para onde vai o tempo de cada episódio.
+
+`instrument` troca as funções do script de treino e os métodos do TraCI por versões cronometradas. Cada chamada soma
+o seu tempo exclusivo na fase correspondente, sem o tempo das chamadas internas. Assim, as consultas ao TraCI feitas
+dentro de get_priority_action contam como consultas_traci, e não como prioridade. O tempo que nenhuma fase cobre
+fica em "outros". Ao fim de cada episódio, uma linha vai para o arquivo JSONL com a recompensa, o epsilon, os
+estados visitados, os passos por segundo, os tempos por fase e as chamadas ao TraCI por método. Opcionalmente, o
+mesmo resumo é gravado num arquivo de texto do Prometheus, lido pelo textfile collector do node_exporter. `restore`
+devolve as funções originais; o treino o chama ao terminar, para que o restante do processo (outro treino, a avaliação,
+o benchmark) não continue cronometrado.
+"""
+import functools
+import inspect
+import json
+import os
+import time
+from collections import Counter, defaultdict
+
+from .instrumentacao_traci import restore_traci, wrap_traci
+
+STEP_PHASE = "passo_sumo"
+QUERY_PHASE = "consultas_traci"
+# Subir e encerrar o SUMO a cada episódio costuma pesar mais que a própria simulação nos cenários pequenos
+LAUNCH_PHASE = "abrir_fechar_sumo"
+# Funções do módulo traci cronometradas fora das consultas aos domínios
+TRACI_FUNCTION_PHASES = {"simulationStep": STEP_PHASE, "start": LAUNCH_PHASE, "close": LAUNCH_PHASE}
+
+class Telemetry:
+    def __init__(self, jsonl_file, prometheus_file=None, labels=None):
+        self.jsonl_file = jsonl_file
+        self.prometheus_file = prometheus_file
+        self.labels = ",".join(f'{name}="{value}"' for name, value in (labels or {}).items())
+        self.phase_seconds = defaultdict(float)
+        self.traci_calls = Counter()
+        self.total_traci_calls = Counter()
+        # Tempo já gasto pelas chamadas internas de cada chamada cronometrada em andamento
+        self.children_seconds = []
+        self.episode_start = None
+        # (dicionário, nome, valor anterior) de cada função trocada, no formato do restore_traci
+        self.replaced = []
+        if os.path.exists(jsonl_file):
+            os.remove(jsonl_file)
+
+    def _timed(self, function, phase, traci_method=None):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            self.children_seconds.append(0.0)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.phase_seconds[phase] += elapsed - self.children_seconds.pop()
+                if self.children_seconds:
+                    self.children_seconds[-1] += elapsed
+                if traci_method is not None:
+                    self.traci_calls[traci_method] += 1
+        return wrapper
+
+    def instrument(self, namespace, phases):
+        """ Cronometra as funções `phases` (nome -> fase) de `namespace` (os globals() do script) e o TraCI. """
+        # unwrap: um treino anterior no mesmo processo já pode ter instrumentado as funções
+        for name, phase in phases.items():
+            self.replaced.append((namespace, name, namespace[name]))
+            namespace[name] = self._timed(inspect.unwrap(namespace[name]), phase)
+        self.replaced += wrap_traci(self._timed_traci, TRACI_FUNCTION_PHASES)
+
+    def _timed_traci(self, function, method):
+        # start e close entram só no tempo; o simulationStep e as consultas também na contagem de chamadas
+        phase = TRACI_FUNCTION_PHASES.get(method, QUERY_PHASE)
+        return self._timed(function, phase, method if phase != LAUNCH_PHASE else None)
+
+    def restore(self):
+        """ Desfaz o `instrument`: devolve as funções do script e os métodos do TraCI que estavam antes. """
+        restore_traci(self.replaced)
+
+    def start_episode(self):
+        self.phase_seconds.clear()
+        self.traci_calls.clear()
+        self.episode_start = time.perf_counter()
+
+    def end_episode(self, episode, reward, epsilon, steps, states_visited):
+        """ Fecha o episódio, grava a linha do JSONL (e o arquivo do Prometheus) e retorna o registro. """
+        duration = time.perf_counter() - self.episode_start
+        phases = dict(self.phase_seconds)
+        phases["outros"] = max(0.0, duration - sum(phases.values()))
+        self.total_traci_calls.update(self.traci_calls)
+        record = {
+            "episodio": episode, "timestamp": time.time(), "recompensa": reward, "epsilon": epsilon,
+            "passos": steps, "estados_visitados": states_visited, "duracao_s": duration,
+            "passos_por_segundo": steps / duration if duration > 0 else 0.0,
+            "fases_s": phases, "chamadas_traci": dict(self.traci_calls),
+        }
+        with open(self.jsonl_file, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        if self.prometheus_file:
+            self._write_prometheus(record)
+        return record
+
+    def summary(self, record):
+        """ Linha curta com a fatia do episódio em cada fase, da maior para a menor. """
+        phases = sorted(record["fases_s"].items(), key=lambda item: -item[1])
+        shares = " | ".join(f"{phase} {seconds / record['duracao_s']:.0%}" for phase, seconds in phases)
+        return f"⏱️ {record['passos_por_segundo']:.0f} passos/s, {sum(record['chamadas_traci'].values())} chamadas ao TraCI — {shares}"
+
+    def _metric(self, name, value, **labels):
+        all_labels = ",".join(filter(None, [self.labels] + [f'{key}="{item}"' for key, item in labels.items()]))
+        return f"{name}{{{all_labels}}} {value}"
+
+    def _write_prometheus(self, record):
+        lines = []
+        for name, key in (("treino_episodio", "episodio"), ("treino_recompensa", "recompensa"),
+                          ("treino_epsilon", "epsilon"), ("treino_estados_visitados", "estados_visitados"),
+                          ("treino_passos_por_segundo", "passos_por_segundo"), ("treino_duracao_episodio_segundos", "duracao_s")):
+            lines += [f"# TYPE {name} gauge", self._metric(name, record[key])]
+        lines.append("# TYPE treino_fase_segundos gauge")
+        lines += [self._metric("treino_fase_segundos", seconds, fase=phase) for phase, seconds in record["fases_s"].items()]
+        lines.append("# TYPE treino_chamadas_traci_total counter")
+        lines += [self._metric("treino_chamadas_traci_total", count, metodo=method)
+                  for method, count in sorted(self.total_traci_calls.items())]
+        # Escrita atômica: o coletor nunca lê um arquivo pela metade
+        temporary = self.prometheus_file + ".tmp"
+        with open(temporary, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temporary, self.prometheus_file)
@@ -11,33 +11,45 @@ if 'SUMO_HOME' in os.environ:
 else:
     sys.exit("please declare environment variable 'SUMO_HOME'")
 
+from .rotas_cache import cached_route_args
+from .cenarios import SCENARIOS, scenario_being_loaded, scenario_cfg
+from .fases import phase_plan, transition_phases
+
+# --- Cenário: o script é carregado uma vez por cenário (cenarios.load_scenario_module), que define o que muda entre eles ---
+SCENARIO = scenario_being_loaded()
+
 # --- Configurações ---
-SUMO_CFG_FILE = "Prox_Samur.sumocfg"
-TRAFFIC_LIGHT_ID = "2322403950"
+SUMO_CFG_FILE = scenario_cfg(SCENARIO)
+TRAFFIC_LIGHT_ID = [SCENARIOS[SCENARIO]["semaforo"]]
 OUTPUT_FOLDER = "resultados_tempo_fixo"
+SUMO_BINARY = "sumo-gui"  # "sumo" roda sem interface (python -m semaforos tempo_fixo --sem-interface)
 
 # Tempos para o controle de tempo fixo
 GREEN_DURATION = 15
 YELLOW_DURATION = 4
-CYCLE = (GREEN_DURATION + YELLOW_DURATION) * 2
 
-# Sinais
-SIGNALS = {
-    "green_A": "rrrrGGggrrrrGGgg", 
-    "yellow_A": "rrrryyyyrrrryyyy", 
-    "green_B": "GGggrrrrGGggrrrr", 
-    "yellow_B": "yyyyrrrryyyyrrrr",
-}
+# Fases do semáforo, lidas do <tlLogic> da rede (semaforos/fases.py)
+PHASE_PLAN = phase_plan(SCENARIO)
+CONTROLLED_LANES = PHASE_PLAN["faixas_controladas"]
+
+def build_cycle():
+    """ Estado do semáforo em cada segundo do ciclo: cada verde da rede, seguido do seu amarelo (e vermelho geral). """
+    states = PHASE_PLAN["estados"]
+    transitions = transition_phases(PHASE_PLAN, YELLOW_DURATION)
+    cycle = []
+    for action, green in enumerate(PHASE_PLAN["verdes"]):
+        cycle += [states[green]] * GREEN_DURATION
+        for phase, duration in transitions[action]:
+            cycle += [states[phase]] * duration
+    return cycle
 
-def run_fixed_time_simulation():
-    # Cria a pasta de saída se ela não existir
-    if not os.path.exists(OUTPUT_FOLDER):
-        os.makedirs(OUTPUT_FOLDER)
-        print(f"📁 Pasta '{OUTPUT_FOLDER}' criada.")
+# Sinais
+SIGNALS = build_cycle()
+CYCLE = len(SIGNALS)
 
-    traci.start(["sumo-gui", "-c", SUMO_CFG_FILE, "--step-length", "1.0"])
-    print("🟢 Simulação com tempo fixo iniciada.")
-    
+def simulate(sumo_cmd, max_steps=None):
+    """ Roda o ciclo fixo numa simulação nova, até esvaziar ou até `max_steps`; retorna (listas de métricas, passos). """
+    traci.start(sumo_cmd)
     sim_time = 0
     
     # Listas para métricas
@@ -47,27 +59,15 @@ def run_fixed_time_simulation():
      total_paradas_prioritarios_por_tempo, tempo_espera_prioritarios_por_tempo, 
      velocidade_media_prioritarios_por_tempo) = ([] for _ in range(11))
 
-    while traci.simulation.getMinExpectedNumber() > 0:
-        phase_time = sim_time % CYCLE
+    while traci.simulation.getMinExpectedNumber() > 0 and (max_steps is None or sim_time < max_steps):
         for tl_id in TRAFFIC_LIGHT_ID:
-            if phase_time < GREEN_DURATION:
-                traci.trafficlight.setRedYellowGreenState(tl_id, SIGNALS["green_A"])
-            elif phase_time < GREEN_DURATION + YELLOW_DURATION:
-                traci.trafficlight.setRedYellowGreenState(tl_id, SIGNALS["yellow_A"])
-            elif phase_time < (GREEN_DURATION * 2) + YELLOW_DURATION:
-                traci.trafficlight.setRedYellowGreenState(tl_id, SIGNALS["green_B"])
-            else:
-                traci.trafficlight.setRedYellowGreenState(tl_id, SIGNALS["yellow_B"])
+            traci.trafficlight.setRedYellowGreenState(tl_id, SIGNALS[sim_time % CYCLE])
 
         traci.simulationStep()
         sim_time += 1
         
         # --- Lógica de Coleta de Dados ---
-        total_parados = sum(
-            traci.lane.getLastStepHaltingNumber(lane)
-            for tl in TRAFFIC_LIGHT_ID
-            for lane in traci.trafficlight.getControlledLanes(tl)
-        )
+        total_parados = sum(traci.lane.getLastStepHaltingNumber(lane) for lane in CONTROLLED_LANES)
         carros_parados_por_tempo.append({'tempo': sim_time, 'carros_parados': total_parados})
 
         vehicle_ids = traci.vehicle.getIDList()
@@ -77,12 +77,11 @@ def run_fixed_time_simulation():
         velocidade_media = sum(velocidades) / len(velocidades) if velocidades else 0
 
         densidades = []
-        for tl in TRAFFIC_LIGHT_ID:
-            for lane in traci.trafficlight.getControlledLanes(tl):
-                num_veiculos = traci.lane.getLastStepVehicleNumber(lane)
-                comprimento = traci.lane.getLength(lane)
-                if comprimento > 0:
-                    densidades.append((num_veiculos / comprimento) * 1000)
+        for lane in CONTROLLED_LANES:
+            num_veiculos = traci.lane.getLastStepVehicleNumber(lane)
+            comprimento = traci.lane.getLength(lane)
+            if comprimento > 0:
+                densidades.append((num_veiculos / comprimento) * 1000)
         densidade_media = sum(densidades) / len(densidades) if densidades else 0
 
         emergency_ids = [vid for vid in vehicle_ids if traci.vehicle.getVehicleClass(vid) == "emergency"]
@@ -119,7 +118,28 @@ def run_fixed_time_simulation():
         velocidade_media_prioritarios_por_tempo.append({'tempo': sim_time, 'velocidade_media_prioritarios': velocidade_media_prioritarios})
 
     traci.close()
+    lists = [carros_parados_por_tempo, total_paradas_por_tempo, tempo_espera_por_tempo,
+             velocidade_media_por_tempo, densidade_por_tempo, tempo_espera_emergency_por_tempo,
+             tempo_espera_authority_por_tempo, carros_parados_prioritarios_por_tempo,
+             total_paradas_prioritarios_por_tempo, tempo_espera_prioritarios_por_tempo,
+             velocidade_media_prioritarios_por_tempo]
+    return lists, sim_time
+
+def run_fixed_time_simulation():
+    # Cria a pasta de saída se ela não existir
+    if not os.path.exists(OUTPUT_FOLDER):
+        os.makedirs(OUTPUT_FOLDER)
+        print(f"📁 Pasta '{OUTPUT_FOLDER}' criada.")
+
+    sumo_cmd = [SUMO_BINARY, "-c", SUMO_CFG_FILE, "--step-length", "1.0"] + cached_route_args(SUMO_CFG_FILE)
+    print("🟢 Simulação com tempo fixo iniciada.")
+    lists, sim_time = simulate(sumo_cmd)
     print("✅ Simulação finalizada (tempo fixo).")
+    (carros_parados_por_tempo, total_paradas_por_tempo, tempo_espera_por_tempo, 
+     velocidade_media_por_tempo, densidade_por_tempo, tempo_espera_emergency_por_tempo, 
+     tempo_espera_authority_por_tempo, carros_parados_prioritarios_por_tempo, 
+     total_paradas_prioritarios_por_tempo, tempo_espera_prioritarios_por_tempo, 
+     velocidade_media_prioritarios_por_tempo) = lists
 
     # Mapeamento de nomes de arquivos para DataFrames
     resultados = {
@@ -141,6 +161,3 @@ def run_fixed_time_simulation():
         pd.DataFrame(dados).to_csv(caminho_arquivo, index=False)
 
     print(f"📁 Resultados salvos na pasta '{OUTPUT_FOLDER}'.")
-
-if __name__ == "__main__":
-    run_fixed_time_simulation()
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+Traços de elegibilidade esparsos para o Q(λ) de Watkins (Q_LAMBDA = True no treinamento_Qlearning.py).
+
+Só os pares estado-ação com traço acima de `threshold` ficam guardados, em dois arrays (índice achatado na tabela
+densa e valor do traço) preenchidos até `size`. A cada decisão, a variação do par atual é aplicada de uma vez a
+todos os pares do traço, ponderada pelo valor de cada um; depois os traços decaem por gamma * lambda, ou são
+zerados quando a ação escolhida foi exploratória.
+"""
+import numpy as np
+
+from .politica_compilada import encode_state
+
+class EligibilityTraces:
+    def __init__(self, num_actions, decay, threshold=0.01, capacity=64):
+        self.num_actions = num_actions
+        self.decay_factor = decay
+        self.threshold = threshold
+        self.indices = np.zeros(capacity, dtype=np.intp)
+        self.traces = np.zeros(capacity)
+        self.size = 0
+
+    def visit(self, state, action):
+        """ Traço de substituição: o par visitado volta a 1. """
+        index = encode_state(state) * self.num_actions + action
+        position = np.flatnonzero(self.indices[:self.size] == index)
+        if position.size:
+            self.traces[position[0]] = 1.0
+            return
+        if self.size == len(self.indices):
+            self.indices = np.resize(self.indices, 2 * self.size)
+            self.traces = np.resize(self.traces, 2 * self.size)
+        self.indices[self.size] = index
+        self.traces[self.size] = 1.0
+        self.size += 1
+
+    def apply(self, q_table, change):
+        """ Soma `change` ponderada pelo traço a todos os pares ativos da tabela densa. """
+        q_table.values.reshape(-1)[self.indices[:self.size]] += change * self.traces[:self.size]
+
+    def decay(self):
+        traces = self.traces[:self.size] * self.decay_factor
+        keep = traces >= self.threshold
+        kept = int(keep.sum())
+        self.indices[:kept] = self.indices[:self.size][keep]
+        self.traces[:kept] = traces[keep]
+        self.size = kept
+
+    def cut(self):
+        self.size = 0
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Inicializa a Q-table de um cruzamento a partir de Q-tables já treinadas de outros cenários.
+
+Os estados são tuplas com o nível de fila (0 a 5) de cada grupo de fases, e as ações escolhem um desses grupos,
+então cenários com números de grupos diferentes (Prox_Samur tem 2, BrumadoxRPacheco tem 3) se relacionam por
+um mapa de grupos: para cada grupo do cenário novo, o grupo equivalente na origem (ou nenhum).
+
+Para cada estado do cenário novo, a projeção junta os estados da origem com os mesmos níveis nos grupos
+mapeados (grupos da origem fora do mapa são marginalizados) e faz a média das linhas, ponderada pelas visitas
+do *_visitas.pkl quando ele existe. A ação de um grupo mapeado herda o valor do grupo de origem; um grupo sem
+equivalente recebe a média da linha. Com várias origens, as projeções são mescladas por mesclar_qtables.
+
+O resultado vai para o TRANSFER_Q_TABLE do cenário novo; treine com TRANSFER_LEARNING = True para partir dele
+com epsilon reduzido (TRANSFER_EPSILON).
+
+Uso:
+    python -m semaforos.transferir_qtable BrumadoxRPacheco --de Prox_Samur --de Prox_EstadioLomanto
+    python -m semaforos.transferir_qtable BrumadoxRPacheco --de Prox_Samur:0=1,1=0,2=-
+"""
+import argparse
+import itertools
+import os
+import pickle
+
+import numpy as np
+
+from .cenarios import SCENARIOS, load_scenario_module, scenario_file
+from .mesclar_qtables import load_run, merge_q_tables
+from .politica_compilada import STATE_LEVELS
+
+def parse_source(spec, target_groups):
+    """ 'Cenario' ou 'Cenario:alvo=origem,...' (origem '-' = sem equivalente) -> (cenário, mapa alvo -> origem). """
+    scenario, _, mapping_spec = spec.partition(":")
+    if scenario not in SCENARIOS:
+        raise SystemExit(f"ERRO: Cenário desconhecido '{scenario}'. Opções: {', '.join(SCENARIOS)}")
+    source_groups = load_scenario_module(scenario, "treinamento_Qlearning").NUM_ACTIONS
+    if not mapping_spec:
+        # Padrão: grupos na mesma ordem; os excedentes do cenário novo ficam sem equivalente
+        return scenario, {g: (g if g < source_groups else None) for g in range(target_groups)}
+    mapping = {g: None for g in range(target_groups)}
+    for pair in mapping_spec.split(","):
+        target, source = pair.split("=")
+        mapping[int(target)] = None if source == "-" else int(source)
+    if any(s is not None and not 0 <= s < source_groups for s in mapping.values()):
+        raise SystemExit(f"ERRO: Mapa '{mapping_spec}' usa grupos inexistentes em {scenario} ({source_groups} grupos).")
+    return scenario, mapping
+
+def project_q_table(q_table, visits, mapping, target_groups):
+    """ Projeta uma Q-table da origem no espaço de estados e ações do cenário novo; retorna (Q-table, pesos). """
+    projected_q, projected_weights = {}, {}
+    for target_state in itertools.product(range(STATE_LEVELS), repeat=target_groups):
+        rows, weights = [], []
+        for source_state, values in q_table.items():
+            if all(source_state[s] == target_state[t] for t, s in mapping.items() if s is not None):
+                row = np.asarray(values, dtype=np.float64)
+                rows.append(row)
+                weights.append(np.asarray(visits.get(source_state, np.zeros_like(row)), dtype=np.float64)
+                               if visits is not None else np.ones_like(row))
+        if not rows:
+            continue
+        rows, weights = np.array(rows), np.array(weights)
+        total = weights.sum(axis=0)
+        source_row = np.where(total > 0, (rows * weights).sum(axis=0) / np.where(total > 0, total, 1), rows.mean(axis=0))
+        projected_q[target_state] = np.array([source_row[s] if s is not None else source_row.mean()
+                                              for s in mapping.values()])
+        projected_weights[target_state] = np.array([total[s] if s is not None else total.mean()
+                                                    for s in mapping.values()])
+    return projected_q, projected_weights
+
+def transfer(target, sources):
+    module = load_scenario_module(target, "treinamento_Qlearning")
+    target_groups = module.NUM_ACTIONS
+    projections = []
+    for spec in sources:
+        scenario, mapping = parse_source(spec, target_groups)
+        source_module = load_scenario_module(scenario, "treinamento_Qlearning")
+        q_table_file = scenario_file(scenario, source_module.Q_TABLE_FILE)
+        if not os.path.exists(q_table_file):
+            print(f"⚠️ Q-table '{q_table_file}' não encontrada; {scenario} ignorado.")
+            continue
+        q_table, visits = load_run(q_table_file)
+        projected_q, projected_weights = project_q_table(q_table, visits, mapping, target_groups)
+        description = ", ".join(f"{t}<-{s}" if s is not None else f"{t} sem origem" for t, s in mapping.items())
+        print(f"📤 {scenario} ({len(q_table)} estados, grupos {description}): "
+              f"{len(projected_q)}/{STATE_LEVELS ** target_groups} estados de {target} cobertos.")
+        projections.append((projected_q, projected_weights))
+    if not projections:
+        raise SystemExit("ERRO: Nenhuma Q-table de origem disponível.")
+
+    initial_table, _ = merge_q_tables(projections)
+    output = scenario_file(target, module.TRANSFER_Q_TABLE)
+    with open(output, "wb") as f: pickle.dump(initial_table, f)
+    print(f"✅ Q-table inicial de {target} salva em '{output}' ({len(initial_table)} estados). "
+          f"Use TRANSFER_LEARNING = True no treinamento para partir dela.")
+    return output
+
+def main():
+    parser = argparse.ArgumentParser(description="Transfere Q-tables treinadas para um cruzamento novo.")
+    parser.add_argument("alvo", choices=list(SCENARIOS), help="Cenário que receberá a Q-table inicial")
+    parser.add_argument("--de", action="append", required=True, metavar="CENARIO[:MAPA]",
+                        help="Cenário de origem; MAPA no formato alvo=origem,... (origem '-' = sem equivalente)")
+    args = parser.parse_args()
+    transfer(args.alvo, args.de)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+import traci
+import pickle
+import os
+import math
+import random
+import shutil
+import sys
+from collections import defaultdict
+import numpy as np
+
+# Adiciona o caminho para as ferramentas do SUMO
+if 'SUMO_HOME' in os.environ:
+    tools = os.path.join(os.environ['SUMO_HOME'], 'tools')
+    sys.path.append(tools)
+else:
+    sys.exit("please declare environment variable 'SUMO_HOME'")
+
+from .rotas_cache import cached_route_args
+from .cenarios import SCENARIOS, scenario_being_loaded, scenario_cfg
+from .fases import phase_plan, transition_phases
+from .tabela_densa import DenseQTable
+from .dyna_q import DynaPlanner
+from .tracos_elegibilidade import EligibilityTraces
+from .ramificacao import SnapshotBrancher
+from .avaliacao_continua import BackgroundEvaluator
+from .telemetria import Telemetry
+
+# --- Cenário: o script é carregado uma vez por cenário (cenarios.load_scenario_module), que define o que muda entre eles ---
+SCENARIO = scenario_being_loaded()
+SUFFIX = SCENARIOS[SCENARIO]["sufixo"]
+
+# --- Configurações Otimizadas ---
+SUMO_CFG_FILE = scenario_cfg(SCENARIO)
+TRAFFIC_LIGHT_ID = SCENARIOS[SCENARIO]["semaforo"]
+
+# Duração das fases com ciclos mais curtos para mais decisões
+GREEN_DURATION = 15
+YELLOW_DURATION = 4
+
+# --- HIPERPARÂMETROS AJUSTADOS PARA APRENDIZADO RÁPIDO ---
+EPOCHS = 500           # etapas para treinamento
+MAX_STEPS = 5400
+ALPHA = 0.2            # Taxa de aprendizado
+GAMMA = 0.95           # Fator de desconto
+EPSILON = 1.0          # Exploração inicial
+EPSILON_DECAY = 0.999  # Decaimento
+MIN_EPSILON = 0.01
+
+# --- Exploração: "epsilon" (decaimento global acima), "contagem" (epsilon de cada estado = COUNT_EPSILON_SCALE / √n(s))
+# ou "ucb" (ação gulosa com bônus UCB_C * √(ln n(s) / n(s,a))); as contagens são as do VISITS_FILE ---
+EXPLORATION = "epsilon"
+COUNT_EPSILON_SCALE = 1.0
+UCB_C = 2.0
+
+# --- Currículo: episódios curtos e demanda leve enquanto a exploração é alta ---
+CURRICULUM = False  # Com o EPSILON_DECAY padrão, a demanda completa só começa perto do episódio 357
+# Cada estágio vale enquanto epsilon >= limiar: (limiar de epsilon, --scale da demanda, --end em segundos)
+CURRICULUM_SCHEDULE = [
+    (0.95, 0.25, 900),
+    (0.85, 0.50, 1800),
+    (0.70, 0.75, 3600),
+    (0.00, 1.00, MAX_STEPS),
+]
+CURRICULUM_LOG = f"curriculo_{SUFFIX}.csv"
+
+# --- Treino mesoscópico (--mesosim) com avaliação microscópica dos checkpoints ---
+MESO_TRAINING = False
+Q_TABLE_FILE = f"q_table_{SUFFIX}.pkl"
+# Número de atualizações de cada par estado-ação, usado por mesclar_qtables.py para ponderar a média entre treinos
+VISITS_FILE = f"q_table_{SUFFIX}_visitas.pkl"
+# Q-table de um treino 100% microscópico, usada como referência para medir a divergência do treino meso
+MICRO_REFERENCE_Q_TABLE = f"q_table_{SUFFIX}_micro.pkl"
+SAVE_MICRO_REFERENCE = False  # Um treino microscópico só grava (e substitui) a referência com True
+
+# --- Cenário enxuto gerado por extrair_subrede.py (só no treino; as avaliações usam a rede completa) ---
+LEAN_TRAINING = False
+
+# --- Transferência: começa da Q-table gerada por transferir_qtable.py a partir de cenários já treinados ---
+TRANSFER_LEARNING = False
+TRANSFER_Q_TABLE = f"q_table_{SUFFIX}_transferida.pkl"
+TRANSFER_EPSILON = 0.3  # A tabela inicial já é razoável, então a exploração começa mais baixa
+
+# --- Partida por imitação: episódios de um controlador de referência preenchem a Q-table antes do epsilon-greedy ---
+IMITATION_WARM_START = False
+DEMONSTRATOR = "tempo_fixo"   # "tempo_fixo" (ciclo GREEN_DURATION/YELLOW_DURATION do tempo_fixo.py) ou "atuado" (lógica atuada do SUMO)
+DEMONSTRATION_EPISODES = 3
+ACTUATED_MIN_GREEN = 5        # Limites do verde no programa atuado, em segundos
+ACTUATED_MAX_GREEN = 60
+IMITATION_EPSILON = 0.3
+
+# --- Dyna-Q: atualizações planejadas com o modelo aprendido das transições, entre as decisões reais ---
+DYNA_Q = False
+PLANNING_STEPS = 20         # Atualizações planejadas após cada decisão real
+PLANNING_BATCH = 5          # Pares estado-ação atualizados de uma vez em cada lote vetorizado
+PRIORITY_THRESHOLD = 1e-3   # Variação mínima para um par entrar na varredura priorizada
+
+# --- Q(λ) de Watkins: a recompensa também atualiza as decisões anteriores, pelos traços de elegibilidade ---
+Q_LAMBDA = False
+LAMBDA = 0.8
+TRACE_THRESHOLD = 0.01      # Traços abaixo disso são descartados
+
+# --- Ramificação contrafactual: na decisão, cada ação é simulada a partir do mesmo estado num SUMO próprio ---
+COUNTERFACTUAL = False
+COUNTERFACTUAL_HORIZON = 2  # Decisões simuladas em cada ramo: a da ação avaliada e as seguintes, gulosas
+
+# --- Avaliação em segundo plano: a cada EVAL_INTERVAL episódios, a política gulosa roda sem interface em sementes
+# fora do treino, e a Q-table com o menor tempo de espera passa a ser a final ---
+BACKGROUND_EVALUATION = False
+EVAL_INTERVAL = 10
+EVAL_SEEDS = [101, 202, 303]
+EVALUATED_Q_TABLE = f"q_table_{SUFFIX}_avaliada.pkl"
+EVALUATED_VISITS_FILE = f"q_table_{SUFFIX}_avaliada_visitas.pkl"
+
+# --- Telemetria (telemetria.py): tempo de cada fase do episódio e chamadas ao TraCI, uma linha JSON por episódio ---
+TELEMETRY = False
+TELEMETRY_FILE = f"telemetria_{SUFFIX}.jsonl"
+PROMETHEUS_FILE = None  # Ex.: "/var/lib/node_exporter/textfile_collector/treino_<sufixo>.prom"
+# Função do script -> fase em que o seu tempo é contado
+TELEMETRY_PHASES = {
+    "get_priority_action": "prioridade",
+    "get_state": "estado",
+    "choose_action": "decisao",
+    "update_q_table": "atualizacao_q",
+}
+
+# --- Fases do semáforo, lidas do <tlLogic> da rede (semaforos/fases.py): uma ação por fase verde ---
+PHASE_PLAN = phase_plan(SCENARIO)
+ACTION_TO_PHASE = dict(enumerate(PHASE_PLAN["verdes"]))
+NUM_ACTIONS = len(ACTION_TO_PHASE)
+# Ação -> [(fase, segundos)] ao sair do seu verde: amarelo e, se a rede tiver, vermelho geral
+TRANSITIONS = transition_phases(PHASE_PLAN, YELLOW_DURATION)
+PHASE_LANES = dict(enumerate(PHASE_PLAN["faixas"]))
+# No modelo mesoscópico as consultas por faixa retornam zero; as filas só existem por aresta
+PHASE_EDGES = dict(enumerate(PHASE_PLAN["arestas"]))
+REWARD_LANES = PHASE_PLAN["faixas_controladas"]
+REWARD_EDGES = sorted({edge for edges in PHASE_EDGES.values() for edge in edges})
+
+# --- Funções Auxiliares ---
+
+def get_state(phase_controlled_lanes, domain=traci.lane):
+    state = []
+    for action in sorted(phase_controlled_lanes.keys()):
+        lanes = phase_controlled_lanes[action]
+        stopped_vehicles = sum(domain.getLastStepHaltingNumber(lane) for lane in lanes)
+        state.append(min(stopped_vehicles // 3, 5))
+    return tuple(state)
+
+def get_priority_action(phase_controlled_lanes, domain=traci.lane):
+    priority_per_action = defaultdict(int)
+    for action, lanes in phase_controlled_lanes.items():
+        for lane in lanes:
+            if domain.getLastStepHaltingNumber(lane) > 0:
+                for vid in domain.getLastStepVehicleIDs(lane):
+                    try:
+                        v_class = traci.vehicle.getVehicleClass(vid)
+                        if v_class == "emergency":
+                            priority_per_action[action] = max(priority_per_action[action], 2)
+                        elif v_class == "authority":
+                            priority_per_action[action] = max(priority_per_action[action], 1)
+                    except traci.TraCIException:
+                        continue
+    if not priority_per_action:
+        return None
+    return max(priority_per_action, key=priority_per_action.get)
+
+def get_curriculum_stage(epsilon):
+    """ Retorna (escala da demanda, duração do episódio) do estágio do currículo para o epsilon atual. """
+    if not CURRICULUM:
+        return 1.0, MAX_STEPS
+    for min_epsilon, scale, end in CURRICULUM_SCHEDULE:
+        if epsilon >= min_epsilon:
+            return scale, min(end, MAX_STEPS)
+    return 1.0, MAX_STEPS
+
+def is_full_stage(scale, end):
+    """ Demanda completa e episódio de MAX_STEPS: só nesse estágio as recompensas valem para checkpoint e paciência. """
+    return scale >= 1.0 and end >= MAX_STEPS
+
+def log_curriculum(episode, epsilon, scale, end, total_steps):
+    # Veículo-segundos simulados das viagens concluídas (requer --duration-log.statistics)
+    trips = int(traci.simulation.getParameter("", "device.tripinfo.count"))
+    vehicle_seconds = trips * float(traci.simulation.getParameter("", "device.tripinfo.duration"))
+    new_file = not os.path.exists(CURRICULUM_LOG)
+    with open(CURRICULUM_LOG, "a") as f:
+        if new_file:
+            f.write("episodio,epsilon,escala,fim,passos,viagens,veiculo_segundos\n")
+        f.write(f"{episode},{epsilon:.4f},{scale:.2f},{end},{total_steps},{trips},{vehicle_seconds:.1f}\n")
+    return vehicle_seconds
+
+def choose_action(state, q_table, epsilon, visits=None):
+    if visits is not None and EXPLORATION != "epsilon":
+        counts = visits.get(state, np.zeros(NUM_ACTIONS))
+        if EXPLORATION == "ucb":
+            untried = np.flatnonzero(counts == 0)
+            if untried.size:
+                return int(random.choice(untried))
+            bonus = UCB_C * np.sqrt(math.log(counts.sum()) / counts)
+            return np.argmax(q_table.get(state, np.zeros(NUM_ACTIONS)) + bonus)
+        # Estados pouco visitados exploram muito; os já conhecidos quase nada, independente do episódio
+        epsilon = min(1.0, COUNT_EPSILON_SCALE / math.sqrt(counts.sum() + 1))
+    if random.random() < epsilon:
+        return random.randrange(NUM_ACTIONS)
+    else:
+        return np.argmax(q_table.get(state, np.zeros(NUM_ACTIONS)))
+
+def q_update(old_value, target):
+    """ Regra de atualização da Q-table; também aceita arrays (usada no planejamento do Dyna-Q). """
+    return (1 - ALPHA) * old_value + ALPHA * (target - old_value)
+
+def get_observation(meso=False):
+    """ Retorna (faixas por ação, faixas da recompensa, domínio do TraCI); no modo meso, arestas no lugar das faixas. """
+    if not meso:
+        return PHASE_LANES, REWARD_LANES, traci.lane
+    return PHASE_EDGES, REWARD_EDGES, traci.edge
+
+def rollout_branch(connection, action, current_action, phase_lanes, reward_lanes, meso, q_table, reward):
+    """ Simula `action` num ramo e retorna o alvo de COUNTERFACTUAL_HORIZON decisões, com o máximo Q do último estado. """
+    domain = connection.edge if meso else connection.lane
+    # Como no run_episode, cada recompensa é a dos parados no instante da decisão, antes de a ação ser aplicada; a da
+    # primeira decisão é a da simulação principal, a mesma para todos os ramos
+    target, discount = reward, GAMMA
+    for decision in range(COUNTERFACTUAL_HORIZON):
+        if decision > 0:
+            target -= discount * sum(domain.getLastStepHaltingNumber(l) for l in reward_lanes)
+            discount *= GAMMA
+        if action == current_action:
+            connection.simulationStep()
+        else:
+            for phase, duration in TRANSITIONS[current_action]:
+                connection.trafficlight.setPhase(TRAFFIC_LIGHT_ID, phase)
+                for _ in range(duration): connection.simulationStep()
+            current_action = action
+            connection.trafficlight.setPhase(TRAFFIC_LIGHT_ID, ACTION_TO_PHASE[current_action])
+        for _ in range(GREEN_DURATION): connection.simulationStep()
+        state = get_state(phase_lanes, domain)
+        action = int(np.argmax(q_table.get(state, np.zeros(NUM_ACTIONS))))
+    return target + discount * np.max(q_table.get(state, np.zeros(NUM_ACTIONS)))
+
+def update_q_table(q_table, state, previous_action, reward, next_state, visits=None, planner=None, traces=None):
+    """ Atualização de um passo do par (estado, ação anterior), com os traços, as contagens e o Dyna-Q, se ativos. """
+    old_value = q_table[state][previous_action] # Usa a ação ANTERIOR que levou a esta recompensa
+    next_max = np.max(q_table.get(next_state, np.zeros(NUM_ACTIONS))) # O máximo Q do próximo estado
+    # A atualização usa o 'reward' calculado antes da transição/passo
+    new_value = q_update(old_value, reward + GAMMA * next_max)
+    if traces is not None:
+        # Watkins: se a ação creditada não é a gulosa neste estado, o crédito não volta além deste par
+        if previous_action != np.argmax(q_table[state]):
+            traces.cut()
+        # A mesma variação, ponderada pelo traço, vale para os pares que levaram até aqui
+        traces.visit(state, previous_action)
+        traces.apply(q_table, new_value - old_value)
+        traces.decay()
+    else:
+        q_table[state][previous_action] = new_value
+    if visits is not None:
+        visits[state][previous_action] += 1
+    if planner is not None:
+        planner.observe(q_table, state, previous_action, reward, next_state)
+        planner.plan(q_table)
+
+def run_episode(q_table, epsilon, max_steps, meso=False, learn=True, visits=None, planner=None, traces=None, brancher=None):
+    """ Executa um episódio na simulação já iniciada e retorna (passos, recompensa total). """
+    phase_lanes, reward_lanes, domain = get_observation(meso)
+    total_steps, total_reward = 0, 0
+    if traces is not None:
+        traces.cut()
+
+    current_action = random.randrange(NUM_ACTIONS) if learn else 0
+    current_phase = ACTION_TO_PHASE[current_action]
+    traci.trafficlight.setPhase(TRAFFIC_LIGHT_ID, current_phase)
+    phase_timer = 0
+
+    while traci.simulation.getMinExpectedNumber() > 0 and total_steps < max_steps:
+        # Lógica de Interrupção Prioritária
+        priority_action = get_priority_action(phase_lanes, domain)
+        if priority_action is not None and priority_action != current_action:
+            if traces is not None:
+                # Watkins: a interrupção troca a ação fora da política gulosa, então o crédito não volta além dela
+                traces.cut()
+            for phase, duration in TRANSITIONS[current_action]:
+                traci.trafficlight.setPhase(TRAFFIC_LIGHT_ID, phase)
+                for _ in range(duration): traci.simulationStep(); total_steps += 1
+            current_action = priority_action
+            current_phase = ACTION_TO_PHASE[current_action]
+            traci.trafficlight.setPhase(TRAFFIC_LIGHT_ID, current_phase)
+            phase_timer = 0
+
+        if phase_timer >= GREEN_DURATION:
+            state = get_state(phase_lanes, domain)
+            previous_action = current_action # GUARDA A AÇÃO ATUAL
+            action = choose_action(state, q_table, epsilon, visits if learn else None)
+            # --- Recompensa Direta e Simplificada ---
+            total_stopped = sum(domain.getLastStepHaltingNumber(l) for l in reward_lanes)
+            reward = -total_stopped
+            total_reward += reward
+
+            # Ramificação: o alvo de cada ação sai do estado desta decisão, antes de a simulação principal seguir
+            branch_targets = None
+            if brancher is not None and learn:
+                branch_targets = brancher.branch(rollout_branch, [
+                    (a, current_action, phase_lanes, reward_lanes, meso, q_table, reward) for a in range(NUM_ACTIONS)])
+
+            if action == previous_action:
+                # A ação escolhida é a mesma que a atual, apenas reinicia o timer verde
+                phase_timer = 0
+                # Não há transição de fase, então precisamos avançar a simulação manualmente aqui
+                traci.simulationStep()
+                total_steps += 1
+            else:
+                # A ação mudou, executa a transição com amarelo (e vermelho geral, se a rede tiver)
+                for phase, duration in TRANSITIONS[current_action]:
+                    traci.trafficlight.setPhase(TRAFFIC_LIGHT_ID, phase)
+                    for _ in range(duration):
+                        traci.simulationStep()
+                        total_steps += 1
+
+                current_action = action # Atualiza para a nova ação
+                current_phase = ACTION_TO_PHASE[current_action]
+                traci.trafficlight.setPhase(TRAFFIC_LIGHT_ID, current_phase)
+                phase_timer = 0
+
+            if not learn:
+                continue
+
+            if branch_targets is not None:
+                # Todas as ações são atualizadas com o retorno do próprio ramo, no lugar da atualização de um passo
+                q_table[state][:] = q_update(q_table[state], np.array(branch_targets))
+                if visits is not None:
+                    visits[state] += 1
+                continue
+
+            # Atualização da Q-table (usando o estado anterior e a ação anterior)
+            next_state = get_state(phase_lanes, domain) # O estado é observado após a decisão/passo
+            update_q_table(q_table, state, previous_action, reward, next_state, visits, planner, traces)
+
+        else: # Se phase_timer < GREEN_DURATION (nenhuma decisão de Q-learning aqui)
+            traci.simulationStep()
+            total_steps += 1
+            phase_timer += 1
+
+    return total_steps, total_reward
+
+def install_demonstrator(demonstrator):
+    """ Troca o programa do semáforo pelo do demonstrador, com as mesmas fases verdes e amarelas da rede. """
+    green_phases = set(ACTION_TO_PHASE.values())
+    yellow_phases = {phase for phase in PHASE_PLAN["amarelas"] if phase is not None}
+    phases = []
+    for index, state in enumerate(PHASE_PLAN["estados"]):
+        if index in yellow_phases:
+            phases.append(traci.trafficlight.Phase(YELLOW_DURATION, state))
+        elif index not in green_phases:
+            # Vermelho geral e outras fases intermediárias mantêm a duração da rede
+            phases.append(traci.trafficlight.Phase(PHASE_PLAN["duracoes"][index], state))
+        elif demonstrator == "atuado":
+            phases.append(traci.trafficlight.Phase(GREEN_DURATION, state, ACTUATED_MIN_GREEN, ACTUATED_MAX_GREEN))
+        else:
+            phases.append(traci.trafficlight.Phase(GREEN_DURATION, state))
+    # Tipo 3 = atuado: o SUMO estende o verde pelos detectores que ele mesmo posiciona
+    logic_type = 3 if demonstrator == "atuado" else 0
+    traci.trafficlight.setProgramLogic(TRAFFIC_LIGHT_ID, traci.trafficlight.Logic(demonstrator, logic_type, 0, phases))
+    traci.trafficlight.setProgram(TRAFFIC_LIGHT_ID, demonstrator)
+
+def run_demonstration(q_table, max_steps, demonstrator, meso=False):
+    """ Episódio conduzido pelo demonstrador; cada decisão observada atualiza a Q-table. Retorna (passos, recompensa). """
+    phase_lanes, reward_lanes, domain = get_observation(meso)
+    phase_to_action = {phase: action for action, phase in ACTION_TO_PHASE.items()}
+    install_demonstrator(demonstrator)
+    total_steps, total_reward = 0, 0
+    current_action = phase_to_action.get(traci.trafficlight.getPhase(TRAFFIC_LIGHT_ID))
+    green_time = 0
+    pending = None  # (estado, ação anterior, recompensa) da decisão que aguarda o próximo estado
+
+    while traci.simulation.getMinExpectedNumber() > 0 and total_steps < max_steps:
+        traci.simulationStep()
+        total_steps += 1
+        action = phase_to_action.get(traci.trafficlight.getPhase(TRAFFIC_LIGHT_ID))
+        if pending is not None and action is not None:
+            # Como no run_episode, o próximo estado é observado depois do amarelo (ou de um passo, se manteve o verde)
+            state, previous_action, reward = pending
+            next_max = np.max(q_table.get(get_state(phase_lanes, domain), np.zeros(NUM_ACTIONS)))
+            q_table[state][previous_action] = q_update(q_table[state][previous_action], reward + GAMMA * next_max)
+            pending = None
+        if current_action is None:
+            # Amarelo: a próxima decisão conta a partir do verde seguinte
+            current_action, green_time = action, 0
+            continue
+        green_time += 1
+        if action != current_action or green_time >= GREEN_DURATION:
+            # O demonstrador encerrou o verde, ou o manteve por mais um intervalo de decisão do agente
+            reward = -sum(domain.getLastStepHaltingNumber(l) for l in reward_lanes)
+            total_reward += reward
+            pending = (get_state(phase_lanes, domain), current_action, reward)
+            current_action, green_time = action, 0
+
+    return total_steps, total_reward
+
+def warm_start(initial_table):
+    """ Preenche a Q-table com DEMONSTRATION_EPISODES episódios do DEMONSTRATOR, sem interface gráfica. """
+    q_table = defaultdict(lambda: np.zeros(NUM_ACTIONS))
+    for state, values in initial_table.items():
+        q_table[state][:] = values
+    sumo_cmd = build_sumo_cmd()
+    for episode in range(DEMONSTRATION_EPISODES):
+        # Sementes diferentes variam o comportamento dos motoristas entre as demonstrações
+        traci.start(sumo_cmd + ["--end", str(MAX_STEPS), "--seed", str(episode)])
+        total_steps, total_reward = run_demonstration(q_table, MAX_STEPS, DEMONSTRATOR, meso=MESO_TRAINING)
+        traci.close()
+        print(f"🎓 Demonstração {episode+1}/{DEMONSTRATION_EPISODES} ({DEMONSTRATOR}) — Passos: {total_steps}, Recompensa: {total_reward:.2f}")
+    print(f"🎓 Partida por imitação: {len(q_table)} estados preenchidos, epsilon inicial {IMITATION_EPSILON}.")
+    return dict(q_table)
+
+def evaluate_micro(q_table):
+    """ Avalia a política gulosa em um episódio microscópico completo; retorna (recompensa, espera média). """
+    traci.start(["sumo", "-c", SUMO_CFG_FILE, "--step-length", "1.0", "--waiting-time-memory", "1000",
+                 "--duration-log.statistics"] + cached_route_args(SUMO_CFG_FILE))
+    _, total_reward = run_episode(q_table, 0.0, MAX_STEPS, learn=False)
+    mean_waiting = float(traci.simulation.getParameter("", "device.tripinfo.waitingTime"))
+    traci.close()
+    return total_reward, mean_waiting
+
+def compare_with_micro_reference(q_table):
+    """ Mede quanto a política treinada no modo meso diverge de um treino totalmente microscópico. """
+    if not os.path.exists(MICRO_REFERENCE_Q_TABLE):
+        print(f"ℹ️ Referência microscópica '{MICRO_REFERENCE_Q_TABLE}' não encontrada; comparação ignorada.")
+        return
+    with open(MICRO_REFERENCE_Q_TABLE, "rb") as f: micro_table = pickle.load(f)
+
+    states = set(q_table) | set(micro_table)
+    disagreements = sum(
+        1 for s in states
+        if np.argmax(q_table.get(s, np.zeros(NUM_ACTIONS))) != np.argmax(micro_table.get(s, np.zeros(NUM_ACTIONS)))
+    )
+    meso_reward, meso_waiting = evaluate_micro(q_table)
+    micro_reward, micro_waiting = evaluate_micro(micro_table)
+    print(f"📐 Divergência meso x micro — Ações diferentes em {disagreements}/{len(states)} estados "
+          f"({disagreements / max(len(states), 1):.1%})")
+    print(f"   Avaliação microscópica — Meso: recompensa {meso_reward:.2f}, espera média {meso_waiting:.2f}s | "
+          f"Micro: recompensa {micro_reward:.2f}, espera média {micro_waiting:.2f}s")
+
+# ---------- TREINAMENTO ----------
+def build_sumo_cmd():
+    """ Comando do SUMO usado nos episódios de treino (sem --scale/--end, que variam com o currículo). """
+    cfg_file = SUMO_CFG_FILE
+    if LEAN_TRAINING:
+        cfg_file = SUMO_CFG_FILE.replace(".sumocfg", "_enxuto.sumocfg")
+        if not os.path.exists(cfg_file):
+            sys.exit(f"Cenário enxuto '{cfg_file}' não encontrado. Rode 'python -m semaforos.extrair_subrede' na raiz do projeto.")
+    sumo_cmd = ["sumo", "-c", cfg_file, "--step-length", "1.0", "--waiting-time-memory", "1000",
+                "--duration-log.statistics"] + cached_route_args(cfg_file)
+    if MESO_TRAINING:
+        # --meso-junction-control mantém o semáforo atuando nas filas do modelo mesoscópico
+        sumo_cmd += ["--mesosim", "--meso-junction-control"]
+    return sumo_cmd
+
+def load_initial_q_table():
+    """ Retorna (Q-table inicial, epsilon inicial): vazia com EPSILON, transferida e/ou preenchida por imitação. """
+    initial_table, epsilon = {}, EPSILON
+    if TRANSFER_LEARNING:
+        if not os.path.exists(TRANSFER_Q_TABLE):
+            sys.exit(f"Q-table transferida '{TRANSFER_Q_TABLE}' não encontrada. Rode 'python -m semaforos.transferir_qtable' na raiz do projeto.")
+        with open(TRANSFER_Q_TABLE, "rb") as f: initial_table = pickle.load(f)
+        epsilon = TRANSFER_EPSILON
+        print(f"🔁 Treino a partir de '{TRANSFER_Q_TABLE}' ({len(initial_table)} estados), epsilon inicial {TRANSFER_EPSILON}.")
+    if IMITATION_WARM_START:
+        initial_table, epsilon = warm_start(initial_table), min(epsilon, IMITATION_EPSILON)
+    return initial_table, epsilon
+
+def save_checkpoint(q_table, visits):
+    with open(Q_TABLE_FILE, "wb") as f: pickle.dump(dict(q_table), f)
+    with open(VISITS_FILE, "wb") as f: pickle.dump(dict(visits), f)
+
+def train():
+    if COUNTERFACTUAL and (DYNA_Q or Q_LAMBDA):
+        # Os alvos dos ramos substituem a atualização de um passo, que é a que alimenta os traços e o modelo do Dyna-Q
+        sys.exit("ERRO: COUNTERFACTUAL não combina com DYNA_Q nem com Q_LAMBDA; ative só um deles.")
+    q_table = defaultdict(lambda: np.zeros(NUM_ACTIONS))
+    visits = defaultdict(lambda: np.zeros(NUM_ACTIONS, dtype=np.int64))
+    planner, traces = None, None
+    if DYNA_Q or Q_LAMBDA:
+        # O planejamento e os traços trabalham sobre a tabela densa (uma linha por estado codificado)
+        q_table = DenseQTable(NUM_ACTIONS)
+        visits = DenseQTable(NUM_ACTIONS, dtype=np.int64)
+    if DYNA_Q:
+        planner = DynaPlanner(NUM_ACTIONS, q_update, GAMMA, PLANNING_STEPS, PLANNING_BATCH, PRIORITY_THRESHOLD)
+    if Q_LAMBDA:
+        traces = EligibilityTraces(NUM_ACTIONS, GAMMA * LAMBDA, TRACE_THRESHOLD)
+    brancher = SnapshotBrancher(NUM_ACTIONS) if COUNTERFACTUAL else None
+    evaluator = None
+    if BACKGROUND_EVALUATION:
+        # Mesmo laço e métricas do simulacao_Qlearning.py, com o sumo sem interface
+        eval_cmd = ["sumo", "-c", SUMO_CFG_FILE, "--step-length", "1.0"] + cached_route_args(SUMO_CFG_FILE)
+        evaluator = BackgroundEvaluator(SCENARIO, eval_cmd, EVAL_SEEDS, MAX_STEPS, EVALUATED_Q_TABLE, EVALUATED_VISITS_FILE)
+    telemetry = None
+    if TELEMETRY:
+        # Depois do avaliador: o processo dele não precisa das funções cronometradas
+        telemetry = Telemetry(TELEMETRY_FILE, PROMETHEUS_FILE, labels={"semaforo": TRAFFIC_LIGHT_ID})
+        telemetry.instrument(globals(), TELEMETRY_PHASES)
+    try:
+        initial_table, epsilon = load_initial_q_table()
+        for state, values in initial_table.items():
+            q_table[state][:] = values
+        sumo_cmd = build_sumo_cmd()
+        best_reward_avg = -float('inf')
+        best_micro_reward = -float('inf')
+        patience, patience_limit = 0, 150
+        rewards_history = []
+        # Recompensas de estágios diferentes do currículo não são comparáveis: a média recomeça a cada estágio
+        stage, stage_rewards = None, []
+        total_vehicle_seconds = 0.0
+        if CURRICULUM and os.path.exists(CURRICULUM_LOG):
+            os.remove(CURRICULUM_LOG)
+
+        for ep in range(EPOCHS):
+            # O SUMO ignora --end quando controlado via TraCI, por isso o limite também entra no laço
+            scale, episode_steps = get_curriculum_stage(epsilon)
+            episode_cmd = sumo_cmd + ["--scale", str(scale), "--end", str(episode_steps)]
+            if telemetry is not None:
+                telemetry.start_episode()
+            traci.start(episode_cmd)
+            if brancher is not None:
+                # Os ramos sobem uma vez por treino (de novo só se o currículo mudar a demanda); o --end não importa,
+                # já que cada ramo só simula o horizonte a partir do estado carregado
+                brancher.start(sumo_cmd + ["--scale", str(scale)])
+            total_steps, total_reward = run_episode(q_table, epsilon, episode_steps, meso=MESO_TRAINING, visits=visits,
+                                                    planner=planner, traces=traces, brancher=brancher)
+
+            if CURRICULUM:
+                total_vehicle_seconds += log_curriculum(ep + 1, epsilon, scale, episode_steps, total_steps)
+            traci.close()
+            if telemetry is not None:
+                telemetry_record = telemetry.end_episode(ep + 1, total_reward, epsilon, total_steps, len(q_table))
+            rewards_history.append(total_reward)
+            if stage != (scale, episode_steps):
+                stage, stage_rewards = (scale, episode_steps), []
+                best_reward_avg, patience = -float('inf'), 0
+            stage_rewards.append(total_reward)
+
+            # Usa a média das últimas 20 recompensas do estágio para uma avaliação mais estável
+            avg_reward = np.mean(stage_rewards[-20:])
+        
+            # Episódios curtos ou com demanda reduzida não salvam checkpoint nem gastam paciência
+            full_stage = is_full_stage(scale, episode_steps)
+            if full_stage and avg_reward > best_reward_avg:
+                best_reward_avg, patience = avg_reward, 0
+                if MESO_TRAINING:
+                    # O checkpoint só é salvo se também melhorar na avaliação microscópica
+                    micro_reward, micro_waiting = evaluate_micro(q_table)
+                    print(f"🔬 Avaliação microscópica — Recompensa: {micro_reward:.2f}, Espera média: {micro_waiting:.2f}s")
+                    if micro_reward > best_micro_reward:
+                        best_micro_reward = micro_reward
+                        save_checkpoint(q_table, visits)
+                        print(f"🌟 Nova melhor recompensa média: {best_reward_avg:.2f}. Q-table salva.")
+                else:
+                    save_checkpoint(q_table, visits)
+                    print(f"🌟 Nova melhor recompensa média: {best_reward_avg:.2f}. Q-table salva.")
+            elif full_stage:
+                patience += 1
+
+            epsilon = max(MIN_EPSILON, epsilon * EPSILON_DECAY)
+            if CURRICULUM:
+                print(f"📚 Currículo — Demanda: {scale:.0%}, Duração máxima: {episode_steps}s, Veículo-segundos acumulados: {total_vehicle_seconds:.0f}")
+            print(f"Episódio {ep+1}/{EPOCHS} — Passos: {total_steps}, Recompensa: {total_reward:.2f} (Média: {avg_reward:.2f}), Epsilon: {epsilon:.3f}, Paciência: {patience}/{patience_limit}")
+            if telemetry is not None:
+                print(telemetry.summary(telemetry_record))
+            if evaluator is not None:
+                if (ep + 1) % EVAL_INTERVAL == 0:
+                    evaluator.submit(ep + 1, q_table, visits)
+                evaluator.poll()
+        
+            if patience >= patience_limit:
+                print(f"\n🛑 Parada antecipada no episódio {ep+1}.")
+                break
+            
+        if best_reward_avg == -float('inf'):
+            # EPOCHS acabou antes do estágio de demanda completa: fica a tabela final, já que nenhuma foi comparável
+            save_checkpoint(q_table, visits)
+            print("⚠️ O treino não chegou à demanda completa do currículo; Q-table final salva sem comparação.")
+        print("✅ Treinamento concluído.")
+        if evaluator is not None:
+            best_episode = evaluator.close()
+            if best_episode is not None:
+                # As contagens vão junto: mesclar_qtables.py, a transferência e a exploração por contagem leem as duas
+                shutil.copyfile(EVALUATED_Q_TABLE, Q_TABLE_FILE)
+                shutil.copyfile(EVALUATED_VISITS_FILE, VISITS_FILE)
+                print(f"🏅 Q-table final: a do episódio {best_episode}, com o menor tempo de espera na avaliação gulosa.")
+        if planner is not None:
+            print(f"🧠 Dyna-Q — {planner.real_updates} atualizações reais e {planner.planning_updates} planejadas "
+                  f"({planner.planning_updates / max(planner.real_updates, 1):.1f} por decisão).")
+        if brancher is not None:
+            print(f"🌿 Ramificação contrafactual — {brancher.rollouts} ramos simulados com horizonte de {COUNTERFACTUAL_HORIZON} decisões.")
+
+        if os.path.exists(Q_TABLE_FILE) and (MESO_TRAINING or SAVE_MICRO_REFERENCE):
+            with open(Q_TABLE_FILE, "rb") as f: best_table = pickle.load(f)
+            if MESO_TRAINING:
+                compare_with_micro_reference(best_table)
+            elif SAVE_MICRO_REFERENCE:
+                # Guarda a política microscópica como referência para futuros treinos meso
+                with open(MICRO_REFERENCE_Q_TABLE, "wb") as f: pickle.dump(best_table, f)
+                print(f"📐 Referência microscópica salva em '{MICRO_REFERENCE_Q_TABLE}'.")
+        return rewards_history
+    finally:
+        if brancher is not None:
+            brancher.close()
+        if telemetry is not None:
+            # O processo pode seguir com outro treino ou avaliação: o TraCI e as funções voltam ao original
+            telemetry.restore()
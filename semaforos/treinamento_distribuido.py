@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Treinamento Q-learning distribuído: trabalhadores em qualquer máquina e um servidor de parâmetros via TCP.
+
+O servidor guarda a Q-table densa (tabela_densa.DenseQTable), distribui os números de episódio (o
+epsilon e o currículo seguem a contagem global, como no treino serial) e aplica as diferenças enviadas pelos
+trabalhadores. Cada trabalhador roda o SUMO localmente com o run_episode do cenário sobre uma cópia da tabela,
+envia ao fim de cada episódio só os pares estado-ação que mudou e puxa a tabela atualizada a cada
+PULL_EVERY episódios. Os checkpoints e a parada antecipada seguem as regras do treino serial (TrainingMonitor).
+
+Protocolo: cada mensagem é uma linha JSON, seguida de `bytes` bytes binários quando o cabeçalho traz esse campo.
+    -> {"tipo": "registrar"}                      <- {"cenario": ..., "num_acoes": 2, "trabalhador": 0, "epsilon_inicial": 1.0}
+    -> {"tipo": "episodio"}                       <- {"episodio": 17} ou {"episodio": null} ao terminar
+    -> {"tipo": "puxar"}                          <- {"versao": 42, "bytes": n} + Q-table (valores float64 + visitados)
+                                                     + contagens de visitas (int64 + visitados)
+    -> {"tipo": "enviar", "episodio": 17, "epsilon": ..., "escala": ..., "duracao": ..., "passos": ..., "recompensa": ...,
+        "alteracoes": k, "visitados": m, "bytes": n} + índices int32 (k), diferenças float64 (k),
+        contagens de visitas int64 (k), estados novos int32 (m)
+                                                  <- {"versao": 43}
+
+Uso:
+    python -m semaforos.treinamento_distribuido servidor Prox_Samur --host 0.0.0.0
+    python -m semaforos.treinamento_distribuido trabalhador --servidor 10.0.0.5:8766    # em cada nó, quantos quiser
+    python -m semaforos.treinamento_distribuido local Prox_Samur --trabalhadores 1 2 4 --episodios 40
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import random
+import socket
+import sys
+import time
+
+import numpy as np
+
+if 'SUMO_HOME' in os.environ:
+    tools = os.path.join(os.environ['SUMO_HOME'], 'tools')
+    sys.path.append(tools)
+else:
+    sys.exit("please declare environment variable 'SUMO_HOME'")
+
+import traci
+
+from .tabela_densa import DenseQTable
+from .treinamento_paralelo import DEFAULT_SEED, TrainingMonitor
+from .cenarios import PROJECT_DIR, SCENARIOS, load_scenario_module, scenario_file
+
+# --- Configurações ---
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+PULL_EVERY = 1
+CONNECT_TIMEOUT = 30
+
+def load_training_module(scenario):
+    """ Importa o treinamento do cenário a partir da sua pasta, onde ficam os arquivos relativos dos scripts. """
+    os.chdir(os.path.join(PROJECT_DIR, scenario))
+    module = load_scenario_module(scenario, "treinamento_Qlearning")
+    module.SUMO_CFG_FILE = scenario_file(scenario, module.SUMO_CFG_FILE)
+    return module
+
+# --- Servidor de parâmetros ---
+class ParameterServer:
+    def __init__(self, scenario, episodes=None):
+        self.scenario = scenario
+        self.module = load_training_module(scenario)
+        if episodes:
+            self.module.EPOCHS = episodes
+        self.q_table = DenseQTable(self.module.NUM_ACTIONS)
+        self.visits = DenseQTable(self.module.NUM_ACTIONS, dtype=np.int64)
+        initial_table, self.start_epsilon = self.module.load_initial_q_table()
+        for state, values in initial_table.items():
+            self.q_table[state][:] = values
+        self.monitor = TrainingMonitor(self.module, scenario_file(scenario, self.module.Q_TABLE_FILE),
+                                       scenario_file(scenario, self.module.VISITS_FILE))
+        self.version = 0
+        self.next_episode = 0
+        self.stopped = False
+        self.registered = 0
+        self.active_clients = 0
+        self.bytes_received = 0
+        self.finished = None
+
+    @property
+    def exhausted(self):
+        return self.stopped or self.next_episode >= self.module.EPOCHS
+
+    def handle_message(self, header, payload):
+        kind = header.get("tipo")
+        if kind == "registrar":
+            self.registered += 1
+            return {"cenario": self.scenario, "num_acoes": self.module.NUM_ACTIONS, "trabalhador": self.registered - 1,
+                    "epsilon_inicial": self.start_epsilon}, b""
+        if kind == "episodio":
+            if self.exhausted:
+                return {"episodio": None}, b""
+            self.next_episode += 1
+            return {"episodio": self.next_episode - 1}, b""
+        if kind == "puxar":
+            # As contagens vão junto: a exploração por contagem (EXPLORATION) depende do total global
+            data = self.q_table.to_bytes() + self.visits.to_bytes()
+            return {"versao": self.version, "bytes": len(data)}, data
+        if kind == "enviar":
+            self.apply_update(header, payload)
+            return {"versao": self.version}, b""
+        return {"erro": f"tipo de mensagem desconhecido: {kind!r}"}, b""
+
+    def apply_update(self, header, payload):
+        changes, visits = header["alteracoes"], header["visitados"]
+        indices = np.frombuffer(payload, dtype=np.int32, count=changes)
+        deltas = np.frombuffer(payload, dtype=np.float64, count=changes, offset=4 * changes)
+        counts = np.frombuffer(payload, dtype=np.int64, count=changes, offset=12 * changes)
+        new_states = np.frombuffer(payload, dtype=np.int32, count=visits, offset=20 * changes)
+        # O servidor roda numa única thread: cada diferença é aplicada inteira, sem corrida entre trabalhadores
+        np.add.at(self.q_table.values.reshape(-1), indices, deltas)
+        np.add.at(self.visits.values.reshape(-1), indices, counts)
+        self.q_table.visited[new_states] = True
+        self.visits.visited[new_states] = True
+        self.version += 1
+        self.bytes_received += len(payload)
+        # Escala e duração do estágio do currículo: só episódios de demanda completa contam para checkpoint e paciência
+        if self.monitor.record(header["trabalhador"], header["episodio"], header["epsilon"], header["escala"],
+                               header["duracao"], header["passos"], header["recompensa"], self.q_table, self.visits) and not self.stopped:
+            print(f"\n🛑 Parada antecipada após {len(self.monitor.rewards_history)} episódios; aguardando os episódios em andamento.")
+            self.stopped = True
+
+    async def handle_client(self, reader, writer):
+        self.active_clients += 1
+        try:
+            while line := await reader.readline():
+                header = json.loads(line)
+                payload = await reader.readexactly(header["bytes"]) if header.get("bytes") else b""
+                response, data = self.handle_message(header, payload)
+                writer.write(json.dumps(response).encode() + b"\n" + data)
+                await writer.drain()
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.active_clients -= 1
+            writer.close()
+            await writer.wait_closed()
+            if self.active_clients == 0 and self.exhausted:
+                self.finished.set()
+
+    async def serve(self, host, port):
+        self.finished = asyncio.Event()
+        server = await asyncio.start_server(self.handle_client, host, port)
+        print(f"🛰️ Servidor de parâmetros de {self.scenario} em {host}:{port} "
+              f"({self.q_table.values.shape[0]} estados x {self.module.NUM_ACTIONS} ações, {self.module.EPOCHS} episódios).")
+        async with server:
+            await self.finished.wait()
+        self.monitor.finish(self.q_table, self.visits)
+        throughput = self.monitor.report(max(self.registered, 1))
+        throughput["versoes"] = self.version
+        throughput["kb_recebidos"] = self.bytes_received / 1024
+        print(f"📡 {self.version} atualizações aplicadas, {throughput['kb_recebidos']:.1f} KB recebidos dos trabalhadores.")
+        return throughput
+
+def run_server(scenario, host, port, episodes=None, results=None):
+    throughput = asyncio.run(ParameterServer(scenario, episodes).serve(host, port))
+    if results is not None:
+        results.put(throughput)
+    return throughput
+
+# --- Trabalhador ---
+def connect(host, port):
+    # O trabalhador pode subir antes do servidor; tenta de novo até CONNECT_TIMEOUT
+    deadline = time.monotonic() + CONNECT_TIMEOUT
+    while True:
+        try:
+            return socket.create_connection((host, port))
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+def request(stream, header, payload=b""):
+    if payload:
+        header = dict(header, bytes=len(payload))
+    stream.write(json.dumps(header).encode() + b"\n" + payload)
+    stream.flush()
+    response = json.loads(stream.readline())
+    data = stream.read(response["bytes"]) if response.get("bytes") else b""
+    return response, data
+
+def run_worker(host, port, seed=DEFAULT_SEED, pull_every=PULL_EVERY):
+    with connect(host, port) as sock, sock.makefile("rwb") as stream:
+        info, _ = request(stream, {"tipo": "registrar"})
+        worker_id = info["trabalhador"]
+        module = load_training_module(info["cenario"])
+        sumo_cmd = module.build_sumo_cmd()
+        random.seed(seed + worker_id)
+        q_table = DenseQTable(module.NUM_ACTIONS)
+        visits = DenseQTable(module.NUM_ACTIONS, dtype=np.int64)
+        table_size = DenseQTable.buffer_size(module.NUM_ACTIONS)
+        episodes_since_pull = pull_every
+
+        while True:
+            episode = request(stream, {"tipo": "episodio"})[0]["episodio"]
+            if episode is None:
+                break
+            if episodes_since_pull >= pull_every:
+                _, data = request(stream, {"tipo": "puxar"})
+                q_table.load_bytes(data[:table_size])
+                visits.load_bytes(data[table_size:])
+                episodes_since_pull = 0
+            base_values, base_visited = q_table.values.copy(), q_table.visited.copy()
+            base_counts = visits.values.copy()
+
+            epsilon = max(module.MIN_EPSILON, info["epsilon_inicial"] * module.EPSILON_DECAY ** episode)
+            scale, episode_steps = module.get_curriculum_stage(epsilon)
+            traci.start(sumo_cmd + ["--scale", str(scale), "--end", str(episode_steps)])
+            total_steps, total_reward = module.run_episode(q_table, epsilon, episode_steps, meso=module.MESO_TRAINING, visits=visits)
+            traci.close()
+
+            # Envia só o que mudou neste episódio; o servidor soma as diferenças à tabela global
+            indices = np.flatnonzero((q_table.values != base_values) | (visits.values != base_counts))
+            deltas = (q_table.values - base_values).reshape(-1)[indices]
+            counts = (visits.values - base_counts).reshape(-1)[indices]
+            new_states = np.flatnonzero(q_table.visited & ~base_visited)
+            payload = (indices.astype(np.int32).tobytes() + deltas.tobytes() + counts.tobytes()
+                       + new_states.astype(np.int32).tobytes())
+            request(stream, {
+                "tipo": "enviar", "trabalhador": worker_id, "episodio": episode, "epsilon": epsilon,
+                "escala": scale, "duracao": episode_steps, "passos": int(total_steps), "recompensa": float(total_reward),
+                "alteracoes": len(indices), "visitados": len(new_states),
+            }, payload)
+            episodes_since_pull += 1
+
+# --- Execução local (servidor e trabalhadores na mesma máquina) ---
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((DEFAULT_HOST, 0))
+        return sock.getsockname()[1]
+
+def run_local(scenario, worker_counts, episodes, seed, pull_every):
+    # Gera o cache de rotas antes de subir os processos, para que não rodem o duarouter ao mesmo tempo
+    load_training_module(scenario).build_sumo_cmd()
+    summary = []
+    for num_workers in worker_counts:
+        print(f"\n===== {num_workers} trabalhador(es) em localhost =====")
+        port, results = free_port(), mp.Queue()
+        server = mp.Process(target=run_server, args=(scenario, DEFAULT_HOST, port, episodes, results))
+        server.start()
+        workers = [mp.Process(target=run_worker, args=(DEFAULT_HOST, port, seed, pull_every)) for _ in range(num_workers)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+        summary.append(results.get())
+        server.join()
+
+    print("\n📊 Vazão por número de trabalhadores:")
+    print(f"{'trabalhadores':>13} | {'episódios/min':>13} | {'passos/s':>9} | {'por trabalhador':>15} | {'aceleração':>10}")
+    for row in summary:
+        speedup = row["passos_s"] / summary[0]["passos_s"]
+        print(f"{row['trabalhadores']:>13} | {row['episodios_min']:>13.1f} | {row['passos_s']:>9.0f} | "
+              f"{row['passos_s'] / row['trabalhadores']:>15.0f} | {speedup:>9.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Treinamento Q-learning distribuído com servidor de parâmetros.")
+    sub = parser.add_subparsers(dest="modo", required=True)
+
+    servidor = sub.add_parser("servidor", help="Guarda a Q-table global e aplica as atualizações")
+    servidor.add_argument("cenario", choices=list(SCENARIOS))
+    servidor.add_argument("--host", default=DEFAULT_HOST)
+    servidor.add_argument("--porta", type=int, default=DEFAULT_PORT)
+    servidor.add_argument("--episodios", type=int, help="Total de episódios (padrão: EPOCHS do cenário)")
+
+    trabalhador = sub.add_parser("trabalhador", help="Roda episódios no SUMO local e envia as diferenças")
+    trabalhador.add_argument("--servidor", default=f"{DEFAULT_HOST}:{DEFAULT_PORT}", help="host:porta do servidor")
+    trabalhador.add_argument("--semente", type=int, default=DEFAULT_SEED)
+    trabalhador.add_argument("--puxar-a-cada", type=int, default=PULL_EVERY, help="Episódios entre cópias da tabela global")
+
+    local = sub.add_parser("local", help="Servidor e trabalhadores em localhost, medindo a vazão")
+    local.add_argument("cenario", choices=list(SCENARIOS))
+    local.add_argument("--trabalhadores", type=int, nargs="+", default=[1, 2, 4])
+    local.add_argument("--episodios", type=int, help="Total de episódios por rodada (padrão: EPOCHS do cenário)")
+    local.add_argument("--semente", type=int, default=DEFAULT_SEED)
+    local.add_argument("--puxar-a-cada", type=int, default=PULL_EVERY)
+    args = parser.parse_args()
+
+    if args.modo == "servidor":
+        run_server(args.cenario, args.host, args.porta, args.episodios)
+    elif args.modo == "trabalhador":
+        host, port = args.servidor.rsplit(":", 1)
+        run_worker(host, int(port), args.semente, args.puxar_a_cada)
+    else:
+        run_local(args.cenario, args.trabalhadores, args.episodios, args.semente, args.puxar_a_cada)
+
+if __name__ == "__main__":
+    main()
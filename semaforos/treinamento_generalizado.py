@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Uma única Q-table generalizada, treinada com episódios de todos os cenários ao mesmo tempo.
+
+O estado normalizado é o nível de fila (0 a 5) de cada grupo de fases, completado com zeros até o maior número
+de grupos entre os cenários (3, em BrumadoxRPacheco). Cada cenário enxerga a tabela por uma máscara
+(PaddedQTable): só as colunas das suas ações existem para ele, então o argmax e o máximo do próximo estado
+nunca escolhem um grupo inexistente. Os trabalhadores (um por núcleo) alternam os cenários a cada episódio e
+atualizam a mesma tabela em memória compartilhada, como em treinamento_paralelo.py, usando o run_episode de
+cada cenário.
+
+Para usar a política num cruzamento, inclusive num quinto cenário que não participou do treino, o modo
+`exportar` recorta a tabela para os grupos dele: no TRANSFER_Q_TABLE (para um ajuste curto com
+TRANSFER_LEARNING = True) ou, com --direto, no Q_TABLE_FILE, sem treino algum.
+
+Uso:
+    python -m semaforos.treinamento_generalizado treinar --trabalhadores 8
+    python -m semaforos.treinamento_generalizado exportar Prox_Samur --direto
+"""
+import argparse
+import os
+import pickle
+import queue
+import random
+import sys
+import multiprocessing as mp
+from types import SimpleNamespace
+
+import numpy as np
+
+if 'SUMO_HOME' in os.environ:
+    tools = os.path.join(os.environ['SUMO_HOME'], 'tools')
+    sys.path.append(tools)
+else:
+    sys.exit("please declare environment variable 'SUMO_HOME'")
+
+import traci
+
+from .cenarios import PROJECT_DIR, SCENARIOS, load_scenario_module, scenario_file
+from .mesclar_qtables import visits_file_for
+from .tabela_densa import SharedQTable
+from .treinamento_paralelo import DEFAULT_SEED, TrainingMonitor
+
+# --- Configurações ---
+GENERALIZED_Q_TABLE = os.path.join(PROJECT_DIR, "q_table_generalizada.pkl")
+EPOCHS = 2000  # Somando os episódios de todos os cenários
+EPSILON = 1.0
+EPSILON_DECAY = 0.999
+MIN_EPSILON = 0.01
+
+class PaddedQTable:
+    """ Visão de um cenário com `num_actions` grupos sobre a tabela generalizada de `max_groups` grupos. """
+
+    def __init__(self, table, num_actions):
+        self.table = table
+        self.num_actions = num_actions
+        self.padding = (0,) * (table.num_actions - num_actions)
+
+    def __getitem__(self, state):
+        # O recorte da linha é uma visão: as escritas de run_episode vão direto para a tabela compartilhada
+        return self.table[state + self.padding][:self.num_actions]
+
+    def get(self, state, default=None):
+        row = self.table.get(state + self.padding)
+        return row[:self.num_actions] if row is not None else default
+
+def load_training_modules(scenarios):
+    modules = {}
+    for scenario in scenarios:
+        module = load_scenario_module(scenario, "treinamento_Qlearning")
+        # Caminho absoluto: o trabalhador alterna entre cenários sem mudar de diretório
+        module.SUMO_CFG_FILE = scenario_file(scenario, module.SUMO_CFG_FILE)
+        modules[scenario] = module
+    return modules
+
+def worker(worker_id, scenarios, shm_names, max_groups, episode_counter, stop_event, results, seed):
+    """ Pega o próximo episódio global, roda no cenário da vez e publica o resultado. """
+    modules = load_training_modules(scenarios)
+    sumo_cmds = {scenario: module.build_sumo_cmd() for scenario, module in modules.items()}
+    random.seed(seed + worker_id)
+    q_table = SharedQTable(max_groups, name=shm_names[0])
+    visits = SharedQTable(max_groups, name=shm_names[1], dtype=np.int64)
+    try:
+        while not stop_event.is_set():
+            with episode_counter.get_lock():
+                episode = episode_counter.value
+                if episode >= EPOCHS:
+                    break
+                episode_counter.value += 1
+            # Rodízio entre os cenários para que todos contribuam igualmente com a tabela
+            scenario = scenarios[episode % len(scenarios)]
+            module = modules[scenario]
+            epsilon = max(MIN_EPSILON, EPSILON * EPSILON_DECAY ** episode)
+            scale, episode_steps = module.get_curriculum_stage(epsilon)
+            traci.start(sumo_cmds[scenario] + ["--scale", str(scale), "--end", str(episode_steps)])
+            total_steps, total_reward = module.run_episode(
+                PaddedQTable(q_table, module.NUM_ACTIONS), epsilon, episode_steps, meso=module.MESO_TRAINING,
+                visits=PaddedQTable(visits, module.NUM_ACTIONS))
+            traci.close()
+            results.put((f"{worker_id}/{scenario}", episode, epsilon, scale, episode_steps, total_steps, total_reward))
+    finally:
+        q_table.close()
+        visits.close()
+
+def train_generalized(scenarios, num_workers, seed=DEFAULT_SEED):
+    modules = load_training_modules(scenarios)
+    max_groups = max(module.NUM_ACTIONS for module in modules.values())
+    # Gera o cache de rotas de todos os cenários antes de os trabalhadores subirem
+    for module in modules.values():
+        module.build_sumo_cmd()
+
+    q_table = SharedQTable(max_groups)
+    visits = SharedQTable(max_groups, dtype=np.int64)
+    episode_counter, stop_event, results = mp.Value("i", 0), mp.Event(), mp.Queue()
+    workers = [
+        mp.Process(target=worker, args=(i, scenarios, (q_table.name, visits.name), max_groups,
+                                        episode_counter, stop_event, results, seed))
+        for i in range(num_workers)
+    ]
+    groups = ", ".join(f"{scenario} ({module.NUM_ACTIONS})" for scenario, module in modules.items())
+    print(f"🌐 Q-table generalizada de {max_groups} grupos com {num_workers} trabalhadores. Cenários (grupos): {groups}.")
+
+    # O checkpoint micro do modo meso é por cenário; aqui vale só a média das recompensas de todos eles. O currículo
+    # (e o MAX_STEPS) vem do mesmo script em todos os cenários, então qualquer um decide o que é demanda completa
+    monitor = TrainingMonitor(SimpleNamespace(EPOCHS=EPOCHS, MESO_TRAINING=False,
+                                              is_full_stage=next(iter(modules.values())).is_full_stage),
+                              GENERALIZED_Q_TABLE, visits_file_for(GENERALIZED_Q_TABLE))
+    try:
+        for process in workers:
+            process.start()
+        while any(process.is_alive() for process in workers) or not results.empty():
+            try:
+                result = results.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if monitor.record(*result, q_table, visits) and not stop_event.is_set():
+                print(f"\n🛑 Parada antecipada após {len(monitor.rewards_history)} episódios; aguardando os episódios em andamento.")
+                stop_event.set()
+    except KeyboardInterrupt:
+        stop_event.set()
+    finally:
+        for process in workers:
+            process.join()
+        monitor.finish(q_table, visits)
+        for table in (q_table, visits):
+            table.close()
+            table.shm.unlink()
+    return monitor.report(num_workers)
+
+def export_scenario(scenario, direct=False):
+    """ Recorta a tabela generalizada para os grupos do cenário e grava no formato dos .pkl do cenário. """
+    if not os.path.exists(GENERALIZED_Q_TABLE):
+        sys.exit(f"Q-table generalizada '{GENERALIZED_Q_TABLE}' não encontrada. Rode 'python -m semaforos.treinamento_generalizado treinar'.")
+    with open(GENERALIZED_Q_TABLE, "rb") as f: generalized = pickle.load(f)
+    module = load_scenario_module(scenario, "treinamento_Qlearning")
+    num_actions = module.NUM_ACTIONS
+    max_groups = len(next(iter(generalized)))
+    if num_actions > max_groups:
+        sys.exit(f"ERRO: {scenario} tem {num_actions} grupos de fases, mas a tabela generalizada só cobre {max_groups}.")
+
+    q_table = {state[:num_actions]: np.array(values[:num_actions]) for state, values in generalized.items()
+               if not any(state[num_actions:])}
+    output = scenario_file(scenario, module.Q_TABLE_FILE if direct else module.TRANSFER_Q_TABLE)
+    with open(output, "wb") as f: pickle.dump(q_table, f)
+    usage = "pronta para simulacao_Qlearning.py" if direct else "use TRANSFER_LEARNING = True para um ajuste curto"
+    print(f"📤 {scenario}: {len(q_table)} estados exportados para '{output}' ({usage}).")
+
+def main():
+    parser = argparse.ArgumentParser(description="Q-table única para todos os cruzamentos.")
+    sub = parser.add_subparsers(dest="modo", required=True)
+    treinar = sub.add_parser("treinar", help="Treina a tabela generalizada com episódios de vários cenários")
+    treinar.add_argument("--cenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    treinar.add_argument("--trabalhadores", type=int, default=os.cpu_count(), help="Processos com SUMO próprio (padrão: um por núcleo)")
+    treinar.add_argument("--semente", type=int, default=DEFAULT_SEED)
+    exportar = sub.add_parser("exportar", help="Recorta a tabela generalizada para um cenário")
+    exportar.add_argument("cenario", choices=list(SCENARIOS))
+    exportar.add_argument("--direto", action="store_true", help="Grava no Q_TABLE_FILE em vez do TRANSFER_Q_TABLE")
+    args = parser.parse_args()
+
+    if args.modo == "treinar":
+        train_generalized(args.cenarios, args.trabalhadores, args.semente)
+    else:
+        export_scenario(args.cenario, args.direto)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Treinamento Q-learning assíncrono em vários processos (estilo Hogwild) sobre uma única Q-table compartilhada.
+
+Cada trabalhador controla a sua própria instância do SUMO e executa os episódios com o run_episode do
+treinamento_Qlearning.py do cenário, atualizando sem travas a mesma Q-table densa guardada em
+multiprocessing.shared_memory: uma linha por estado codificado (6 ** NUM_ACTIONS linhas, como em
+politica_compilada.py) e uma coluna por ação. Cada decisão altera um único par estado-ação, então as colisões
+entre processos são raras e toleradas. O processo principal acompanha as recompensas e salva os checkpoints
+copiando a tabela compartilhada, sem pausar os trabalhadores.
+
+Uso:
+    python -m semaforos.treinamento_paralelo Prox_Samur                     # um trabalhador por núcleo
+    python -m semaforos.treinamento_paralelo Prox_Samur --trabalhadores 4
+"""
+import argparse
+import os
+import pickle
+import queue
+import random
+import sys
+import time
+import multiprocessing as mp
+
+import numpy as np
+
+if 'SUMO_HOME' in os.environ:
+    tools = os.path.join(os.environ['SUMO_HOME'], 'tools')
+    sys.path.append(tools)
+else:
+    sys.exit("please declare environment variable 'SUMO_HOME'")
+
+import traci
+
+from .cenarios import PROJECT_DIR, SCENARIOS, load_scenario_module, scenario_file
+from .tabela_densa import SharedQTable
+
+# --- Configurações ---
+PATIENCE_LIMIT = 150
+REWARD_WINDOW = 20
+DEFAULT_SEED = 42
+
+class TrainingMonitor:
+    """ Regras do treino serial para episódios que chegam fora de ordem: melhor média, checkpoint e paciência. """
+
+    def __init__(self, module, q_table_file, visits_file):
+        self.module = module
+        self.q_table_file = q_table_file
+        self.visits_file = visits_file
+        self.rewards_history = []
+        # Recompensas dos episódios com demanda completa, as únicas comparáveis entre si (veja is_full_stage)
+        self.full_rewards = []
+        self.best_reward_avg, self.best_micro_reward = -float('inf'), -float('inf')
+        self.patience, self.total_steps = 0, 0
+        self.saved = False
+        self.start = time.perf_counter()
+
+    def save(self, snapshot, visits):
+        with open(self.q_table_file, "wb") as f: pickle.dump(snapshot, f)
+        with open(self.visits_file, "wb") as f: pickle.dump(visits.snapshot(), f)
+        self.saved = True
+
+    def record(self, worker_id, episode, epsilon, scale, episode_steps, total_steps, total_reward, q_table, visits):
+        """ Registra um episódio concluído e salva o checkpoint se a média melhorar; retorna True ao esgotar a paciência. """
+        self.total_steps += total_steps
+        self.rewards_history.append(total_reward)
+        # Os episódios chegam fora de ordem e podem ser de estágios diferentes do currículo; só os de demanda
+        # completa entram na média que decide o checkpoint e a paciência
+        full_stage = self.module.is_full_stage(scale, episode_steps)
+        if full_stage:
+            self.full_rewards.append(total_reward)
+        avg_reward = np.mean((self.full_rewards if full_stage else self.rewards_history)[-REWARD_WINDOW:])
+
+        if full_stage and avg_reward > self.best_reward_avg:
+            self.best_reward_avg, self.patience = avg_reward, 0
+            snapshot = q_table.snapshot()
+            save = True
+            if self.module.MESO_TRAINING:
+                # Mesma regra do treino serial: o checkpoint meso só vale se melhorar na avaliação microscópica
+                micro_reward, micro_waiting = self.module.evaluate_micro(snapshot)
+                print(f"🔬 Avaliação microscópica — Recompensa: {micro_reward:.2f}, Espera média: {micro_waiting:.2f}s")
+                save = micro_reward > self.best_micro_reward
+                self.best_micro_reward = max(self.best_micro_reward, micro_reward)
+            if save:
+                self.save(snapshot, visits)
+                print(f"🌟 Nova melhor recompensa média: {self.best_reward_avg:.2f}. Q-table salva ({len(snapshot)} estados).")
+        elif full_stage:
+            self.patience += 1
+
+        print(f"Episódio {episode+1}/{self.module.EPOCHS} [trabalhador {worker_id}] — Passos: {total_steps}, "
+              f"Recompensa: {total_reward:.2f} (Média: {avg_reward:.2f}), Epsilon: {epsilon:.3f}, "
+              f"Paciência: {self.patience}/{PATIENCE_LIMIT}")
+        return self.patience >= PATIENCE_LIMIT
+
+    def finish(self, q_table, visits):
+        """ Fim do treino: se nenhum episódio comparável salvou checkpoint, grava a tabela final, como no treino serial. """
+        if self.saved or not self.rewards_history:
+            return
+        self.save(q_table.snapshot(), visits)
+        print("⚠️ O treino não chegou a um episódio de demanda completa; Q-table final salva sem comparação.")
+
+    def report(self, num_workers):
+        """ Imprime e devolve a vazão do treino (episódios/min e passos simulados/s). """
+        elapsed = time.perf_counter() - self.start
+        episodes = len(self.rewards_history)
+        throughput = {
+            "trabalhadores": num_workers,
+            "episodios": episodes,
+            "segundos": elapsed,
+            "episodios_min": episodes / elapsed * 60,
+            "passos_s": self.total_steps / elapsed,
+        }
+        print(f"✅ Treinamento concluído: {episodes} episódios em {elapsed:.1f}s.")
+        print(f"⚡ Vazão — {throughput['episodios_min']:.1f} episódios/min, {throughput['passos_s']:.0f} passos simulados/s "
+              f"({throughput['passos_s'] / num_workers:.0f} por trabalhador).")
+        return throughput
+
+def worker(worker_id, scenario, shm_names, sumo_cmd, start_epsilon, episode_counter, stop_event, results, seed):
+    """ Laço de um trabalhador: pega o próximo episódio global, roda no seu SUMO e publica o resultado. """
+    module = load_scenario_module(scenario, "treinamento_Qlearning")
+    random.seed(seed + worker_id)
+    q_table = SharedQTable(module.NUM_ACTIONS, name=shm_names[0])
+    visits = SharedQTable(module.NUM_ACTIONS, name=shm_names[1], dtype=np.int64)
+    try:
+        while not stop_event.is_set():
+            with episode_counter.get_lock():
+                episode = episode_counter.value
+                if episode >= module.EPOCHS:
+                    break
+                episode_counter.value += 1
+            # O epsilon segue o número global de episódios, como no decaimento do treino serial
+            epsilon = max(module.MIN_EPSILON, start_epsilon * module.EPSILON_DECAY ** episode)
+            scale, episode_steps = module.get_curriculum_stage(epsilon)
+            traci.start(sumo_cmd + ["--scale", str(scale), "--end", str(episode_steps)])
+            total_steps, total_reward = module.run_episode(q_table, epsilon, episode_steps, meso=module.MESO_TRAINING, visits=visits)
+            traci.close()
+            results.put((worker_id, episode, epsilon, scale, episode_steps, total_steps, total_reward))
+    finally:
+        q_table.close()
+        visits.close()
+
+def train_parallel(scenario, num_workers, seed=DEFAULT_SEED):
+    # Os scripts do pacote gravam com caminhos relativos à pasta do cenário; os trabalhadores herdam o diretório
+    os.chdir(os.path.join(PROJECT_DIR, scenario))
+    module = load_scenario_module(scenario, "treinamento_Qlearning")
+    module.SUMO_CFG_FILE = scenario_file(scenario, module.SUMO_CFG_FILE)
+    q_table_file = scenario_file(scenario, module.Q_TABLE_FILE)
+    # Monta o comando uma vez só: o cache de rotas é gerado antes de os trabalhadores subirem
+    sumo_cmd = module.build_sumo_cmd()
+
+    q_table = SharedQTable(module.NUM_ACTIONS)
+    visits = SharedQTable(module.NUM_ACTIONS, dtype=np.int64)
+    initial_table, start_epsilon = module.load_initial_q_table()
+    for state, values in initial_table.items():
+        q_table[state][:] = values
+    episode_counter = mp.Value("i", 0)
+    stop_event = mp.Event()
+    results = mp.Queue()
+    workers = [
+        mp.Process(target=worker, args=(i, scenario, (q_table.name, visits.name), sumo_cmd, start_epsilon, episode_counter, stop_event, results, seed))
+        for i in range(num_workers)
+    ]
+    print(f"🚀 {scenario}: {num_workers} trabalhadores sobre uma Q-table compartilhada de "
+          f"{q_table.values.shape[0]} estados x {module.NUM_ACTIONS} ações.")
+
+    monitor = TrainingMonitor(module, q_table_file, scenario_file(scenario, module.VISITS_FILE))
+    try:
+        for process in workers:
+            process.start()
+        while any(process.is_alive() for process in workers) or not results.empty():
+            try:
+                result = results.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if monitor.record(*result, q_table, visits) and not stop_event.is_set():
+                print(f"\n🛑 Parada antecipada após {len(monitor.rewards_history)} episódios; aguardando os episódios em andamento.")
+                stop_event.set()
+    except KeyboardInterrupt:
+        stop_event.set()
+    finally:
+        for process in workers:
+            process.join()
+        monitor.finish(q_table, visits)
+        for table in (q_table, visits):
+            table.close()
+            table.shm.unlink()
+    return monitor.report(num_workers)
+
+def main():
+    parser = argparse.ArgumentParser(description="Treinamento Q-learning assíncrono com Q-table em memória compartilhada.")
+    parser.add_argument("cenario", choices=list(SCENARIOS), help="Pasta do cenário")
+    parser.add_argument("--trabalhadores", type=int, default=os.cpu_count(), help="Processos com SUMO próprio (padrão: um por núcleo)")
+    parser.add_argument("--semente", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+    train_parallel(args.cenario, args.trabalhadores, args.semente)
+
+if __name__ == "__main__":
+    main()